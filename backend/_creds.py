@@ -0,0 +1,26 @@
+"""
+Service-account credentials parsed once from the environment.
+
+Both the Firebase Admin init in auth.py and the Firestore client factory need
+the GOOGLE_APPLICATION_CREDENTIALS_JSON payload; parsing it here avoids decoding
+the multi-KB document twice during cold start.
+"""
+
+import json
+import logging
+import os
+from typing import Optional
+
+
+def _load_creds_dict() -> Optional[dict]:
+    raw = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        logging.error(f"[CREDS] Invalid JSON in GOOGLE_APPLICATION_CREDENTIALS_JSON: {e}")
+        return None
+
+
+CREDS_DICT = _load_creds_dict()
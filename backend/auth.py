@@ -3,40 +3,43 @@ from firebase_admin import auth, credentials
 from fastapi import Depends, HTTPException, status, Request
 from firebase_admin import exceptions as firebase_exceptions
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict
 import os
 import json
 from google.cloud import firestore
+from google.api_core.exceptions import AlreadyExists
 from datetime import datetime, timezone
 import logging
-import asyncio
-from functools import wraps, lru_cache
 import time
-from collections import defaultdict
+import hashlib
+import random
+import re
+import threading
+from collections import OrderedDict
 
 from .middleware.observability import set_user_id_for_request
+from ._creds import CREDS_DICT
 
 # Initialize Firebase Admin SDK robustly for test/dev environments
 try:
     if not firebase_admin._apps:
         # Debug: Log available environment variables
-        creds_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
         creds_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
         
-        logging.info(f"[AUTH] GOOGLE_APPLICATION_CREDENTIALS_JSON exists: {bool(creds_json)}")
+        logging.info(f"[AUTH] GOOGLE_APPLICATION_CREDENTIALS_JSON parsed: {CREDS_DICT is not None}")
         logging.info(f"[AUTH] GOOGLE_APPLICATION_CREDENTIALS exists: {bool(creds_path)}")
         if creds_path:
             logging.info(f"[AUTH] GOOGLE_APPLICATION_CREDENTIALS value starts with: {creds_path[:50]}...")
 
         cred = None
         # Try JSON content first (from environment variable)
-        if creds_json:
+        if CREDS_DICT is not None:
             try:
-                cred_dict = json.loads(creds_json)
-                cred = credentials.Certificate(cred_dict)
+                cred = credentials.Certificate(CREDS_DICT)
                 logging.info("[AUTH] Using JSON credentials from environment")
             except Exception as e:
-                logging.warning(f"[AUTH] Failed to parse JSON credentials: {e}")
+                logging.warning(f"[AUTH] Failed to load JSON credentials: {e}")
                 cred = None
         # Try file path (for Render secret files)
         if cred is None and creds_path:
@@ -68,7 +71,9 @@ try:
 except Exception as e:
     logging.warning(f"[AUTH] Firebase admin init block failed: {e}")
 
-from .firestore_client import get_firestore_client
+from .firestore_client import get_async_firestore_client
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer(auto_error=False)
 
@@ -76,25 +81,185 @@ security = HTTPBearer(auto_error=False)
 AUTH_CHECK_REVOKED = os.getenv("AUTH_CHECK_REVOKED", "true").lower() in ("1", "true", "yes", "on")
 AUTH_FALLBACK_NO_REVOKE = os.getenv("AUTH_FALLBACK_NO_REVOKE", "true").lower() in ("1", "true", "yes", "on")
 
-_auth_failure_tracker: defaultdict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "first": 0.0})
+_AUTH_FAILURE_WINDOW_SECS = 300
+_AUTH_FAILURE_TRIGGER_COUNTS = frozenset({5, 10, 20})
+
+
+class _FailureWindow:
+    __slots__ = ("count", "first")
+
+    def __init__(self, first: float):
+        self.count = 0
+        self.first = first
+
+
+_auth_failure_tracker: Dict[str, _FailureWindow] = {}
+_auth_failure_lock = threading.Lock()
 
 
 def _track_auth_failure(reason: str) -> None:
     now = time.time()
-    info = _auth_failure_tracker[reason]
-    if now - info["first"] > 300:
-        info["count"] = 0
-        info["first"] = now
-    info["count"] += 1
-    if info["first"] == 0:
-        info["first"] = now
-    if info["count"] in (5, 10, 20):
-        logging.warning("[AUTH] Repeated auth failures for %s (%s in last 5m)", reason, info["count"])
+    # Window reset and increment happen under one lock so concurrent
+    # failures cannot interleave between the check and the mutation
+    with _auth_failure_lock:
+        info = _auth_failure_tracker.get(reason)
+        if info is None or now - info.first > _AUTH_FAILURE_WINDOW_SECS:
+            info = _auth_failure_tracker[reason] = _FailureWindow(now)
+        info.count += 1
+        count = info.count
+    if count in _AUTH_FAILURE_TRIGGER_COUNTS:
+        logging.warning("[AUTH] Repeated auth failures for %s (%s in last 5m)", reason, count)
+
+
+class TokenCache:
+    """Bounded LRU of verified ID tokens keyed by a hash of the raw token.
+
+    Entries expire at the earlier of the token's own ``exp`` claim and
+    ``now + ttl`` so a cached token is never honored past its lifetime.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, token: str) -> Optional[dict]:
+        if self.ttl <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, decoded = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return decoded
+
+    def put(self, token: str, decoded: dict) -> None:
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        try:
+            exp = float(decoded.get("exp") or 0)
+            if exp:
+                expires_at = min(expires_at, exp)
+            nbf = float(decoded.get("nbf") or decoded.get("iat") or 0)
+            if nbf > now:
+                # Not yet valid; let the verifier decide on the next call
+                return
+        except (TypeError, ValueError):
+            return
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, decoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Verified-token cache: skips the RSA signature check (and revocation lookup)
+# for tokens seen recently. TTL bounds how long a revoked token stays usable.
+_token_cache = TokenCache(
+    maxsize=int(os.getenv("TOKEN_VERIFY_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("TOKEN_VERIFY_CACHE_TTL", "60")),
+)
+
+
+FIREBASE_CERT_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class _PublicKeyCache:
+    """In-process copy of Google's securetoken x509 certs, refreshed per Cache-Control max-age."""
+
+    def __init__(self, url: str = FIREBASE_CERT_URL):
+        self.url = url
+        self._certs: Optional[Dict[str, str]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict[str, str]:
+        certs = self._certs
+        if certs is not None and time.time() < self._expires_at:
+            return certs
+        with self._lock:
+            if self._certs is None or time.time() >= self._expires_at:
+                self._refresh()
+            return self._certs
+
+    def _refresh(self) -> None:
+        from google.auth.transport import requests as google_requests
+
+        response = google_requests.Request()(url=self.url, method="GET")
+        if response.status != 200:
+            raise ValueError(f"Failed to fetch Firebase public keys (HTTP {response.status})")
+        data = response.data.decode("utf-8") if isinstance(response.data, bytes) else response.data
+        match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+        self._certs = json.loads(data)
+        self._expires_at = time.time() + (int(match.group(1)) if match else 3600)
+
+
+_public_keys = _PublicKeyCache()
+_firebase_project_id: Optional[str] = None
+
+
+def _get_firebase_project_id() -> Optional[str]:
+    global _firebase_project_id
+    if _firebase_project_id is None:
+        try:
+            _firebase_project_id = firebase_admin.get_app().project_id or ""
+        except Exception:
+            _firebase_project_id = os.getenv("FIREBASE_PROJECT_ID") or os.getenv("GOOGLE_CLOUD_PROJECT") or ""
+    return _firebase_project_id or None
+
+
+def _verify_id_token_offline(token: str, project_id: str) -> dict:
+    """Verify signature and standard claims locally against cached public keys.
+
+    Equivalent to the Admin SDK's verify_id_token(check_revoked=False) but without
+    its per-call client/verifier overhead. Revocation is not checked.
+    """
+    from google.auth import jwt as google_jwt
+
+    claims = google_jwt.decode(token, certs=_public_keys.get(), audience=project_id)
+    if claims.get("iss") != f"https://securetoken.google.com/{project_id}":
+        raise ValueError("ID token has incorrect issuer")
+    sub = claims.get("sub")
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+        raise ValueError("ID token has invalid subject")
+    claims["uid"] = sub
+    return claims
+
 
 def _verify_id_token(token: str, check_revoked: bool = True):
     """Verify an ID token with optional revocation checking.
+    Without revocation checks, verify offline against cached public keys when the
+    project id is known; otherwise defer to the Admin SDK.
     Gracefully handle environments where the verify function signature differs (tests).
     """
+    if not check_revoked:
+        project_id = _get_firebase_project_id()
+        if project_id:
+            return _verify_id_token_offline(token, project_id)
     try:
         return auth.verify_id_token(token, check_revoked=check_revoked)
     except TypeError:
@@ -102,19 +267,53 @@ def _verify_id_token(token: str, check_revoked: bool = True):
         return auth.verify_id_token(token)
 
 
+def _warm_public_keys() -> None:
+    """Prime the Admin SDK's certificate cache so the first real verify skips the key fetch.
+
+    The first verify_id_token on a fresh instance otherwise stalls while Google's
+    securetoken x509 certs are downloaded. Fetching them through the verifier's own
+    cache-control session stores them exactly where verification looks them up.
+    """
+    start = time.perf_counter()
+    try:
+        verifier = auth._get_client(None)._token_verifier
+        verifier.request(verifier.id_token_verifier.cert_url)
+    except Exception as e:
+        logging.warning(f"[AUTH] Admin SDK public-key warmup skipped: {e}")
+    try:
+        _public_keys.get()
+    except Exception as e:
+        logging.warning(f"[AUTH] Offline public-key warmup skipped: {e}")
+    logging.info(f"[AUTH] Public-key warmup finished in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+if os.getenv("WARMUP_AUTH", "true").lower() in ("1", "true", "yes", "on"):
+    threading.Thread(target=_warm_public_keys, name="auth-key-warmup", daemon=True).start()
+
+
 def _verify_id_token_strict(token: str):
     """Dedicated helper for dependencies that always require revocation checks."""
     return _verify_id_token(token, check_revoked=True)
 
+def _parse_max_session_age() -> int:
+    try:
+        return int(os.getenv("MAX_SESSION_AGE_SECS", str(24 * 3600)))
+    except ValueError:
+        logging.warning("[AUTH] Invalid MAX_SESSION_AGE_SECS; falling back to 24h")
+        return 24 * 3600
+
+
+MAX_SESSION_AGE_SECS = _parse_max_session_age()
+
+
 def _enforce_session_max_age(decoded_token: dict):
     """Reject sessions older than configured max age (default 24h)."""
+    if MAX_SESSION_AGE_SECS <= 0:
+        return
     try:
-        max_age_secs = int(os.getenv("MAX_SESSION_AGE_SECS", str(24 * 3600)))
-        if max_age_secs <= 0:
-            return
         now = int(time.time())
         auth_time = int(decoded_token.get("auth_time") or decoded_token.get("iat") or 0)
-        if auth_time and now - auth_time > max_age_secs:
+        if auth_time and now - auth_time > MAX_SESSION_AGE_SECS:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session too old")
     except HTTPException:
         raise
@@ -129,26 +328,124 @@ def _ensure_verified(decoded_token: dict):
     if REQUIRE_VERIFIED_LOGIN and not decoded_token.get("email_verified", False):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not verified")
 
-# Cache disabled-user check briefly to avoid Admin API calls on every request
-@lru_cache(maxsize=2048)
-def _is_user_disabled_cached(uid: str, bucket: int) -> bool:
-    try:
-        user_record = auth.get_user(uid)
-        return bool(getattr(user_record, "disabled", False))
-    except Exception as e:
-        # Treat failures as not disabled; downstream logic is best-effort only
-        logging.debug(f"[AUTH] Disabled check skipped (cached) for {uid}: {e}")
-        return False
+# Cache disabled-user check briefly to avoid Admin API calls on every request.
+# Expiries are jittered so entries for active users do not all lapse together,
+# and concurrent misses for the same uid share a single Admin API call.
+_DISABLED_CACHE_TTL = 300.0
+_DISABLED_CACHE_JITTER = 60.0
+_DISABLED_ERROR_TTL = 30.0
+_DISABLED_CACHE_MAXSIZE = 2048
+_disabled_cache: Dict[str, tuple] = {}
+_disabled_cache_lock = threading.Lock()
+_disabled_inflight: Dict[str, threading.Lock] = {}
+# Cap concurrent Admin API lookups so a cold cache cannot flood the upstream
+_admin_api_slots = threading.BoundedSemaphore(int(os.getenv("AUTH_ADMIN_API_CONCURRENCY", "8")))
 
-def get_current_user(
-    request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+
+def _cached_disabled_state(uid: str) -> Optional[bool]:
+    """Return the cached disabled flag for uid, or None on miss/expiry."""
+    entry = _disabled_cache.get(uid)
+    if entry is not None and time.time() < entry[0]:
+        return entry[1]
+    return None
+
+
+def _is_user_disabled(uid: str) -> bool:
+    cached = _cached_disabled_state(uid)
+    if cached is not None:
+        return cached
+    with _disabled_cache_lock:
+        flight = _disabled_inflight.setdefault(uid, threading.Lock())
+    with flight:
+        # Another thread may have filled the entry while we waited
+        cached = _cached_disabled_state(uid)
+        if cached is not None:
+            return cached
+        ttl = _DISABLED_CACHE_TTL + random.uniform(-_DISABLED_CACHE_JITTER, _DISABLED_CACHE_JITTER)
+        try:
+            with _admin_api_slots:
+                user_record = auth.get_user(uid)
+            disabled = bool(getattr(user_record, "disabled", False))
+        except Exception as e:
+            # Treat failures as not disabled; downstream logic is best-effort only
+            logging.debug(f"[AUTH] Disabled check skipped (cached) for {uid}: {e}")
+            disabled = False
+            ttl = _DISABLED_ERROR_TTL
+        with _disabled_cache_lock:
+            _disabled_cache[uid] = (time.time() + ttl, disabled)
+            while len(_disabled_cache) > _DISABLED_CACHE_MAXSIZE:
+                _disabled_cache.pop(next(iter(_disabled_cache)))
+            _disabled_inflight.pop(uid, None)
+        return disabled
+
+# Short-lived cache of users/{uid} documents for the auth hot path. Kept well
+# under a minute so role changes made elsewhere are picked up quickly; role
+# writes in this service call invalidate_user_profile() for immediate effect.
+USER_DOC_CACHE_TTL = min(float(os.getenv("USER_DOC_CACHE_TTL", "30")), 60.0)
+_USER_DOC_CACHE_MAXSIZE = 10000
+_user_doc_cache: Dict[str, tuple] = {}
+_user_doc_cache_lock = threading.Lock()
+
+
+def _store_user_profile(uid: str, user_data: dict) -> None:
+    if USER_DOC_CACHE_TTL <= 0:
+        return
+    with _user_doc_cache_lock:
+        _user_doc_cache.pop(uid, None)
+        _user_doc_cache[uid] = (time.time() + USER_DOC_CACHE_TTL, user_data)
+        while len(_user_doc_cache) > _USER_DOC_CACHE_MAXSIZE:
+            _user_doc_cache.pop(next(iter(_user_doc_cache)))
+
+
+def invalidate_user_profile(uid: str) -> None:
+    """Drop the cached users/{uid} document (call after writing role/email)."""
+    with _user_doc_cache_lock:
+        _user_doc_cache.pop(uid, None)
+
+
+async def _get_user_profile(uid: str) -> Optional[dict]:
+    """Return the users/{uid} document data, or None if it does not exist."""
+    with _user_doc_cache_lock:
+        entry = _user_doc_cache.get(uid)
+    if entry is not None and time.time() < entry[0]:
+        return entry[1]
+
+    logger.debug("[AUTH] Starting Firestore lookup for UID: %s", uid)
+    db = get_async_firestore_client()
+    user_doc = await db.collection("users").document(uid).get()
+    logger.debug("[AUTH] Firestore lookup completed. User exists: %s", user_doc.exists)
+    if not user_doc.exists:
+        invalidate_user_profile(uid)
+        return None
+    user_data = user_doc.to_dict() or {}
+    _store_user_profile(uid, user_data)
+    return user_data
+
+
+def _new_user_doc(uid: str, email: str) -> dict:
+    """Minimal users/{uid} document written on first sign-in (no role yet).
+
+    ``created_at`` stays an ISO-8601 string: UserSchema and /users/me expose it
+    as ``str``, matching the docs written by routes/users.py.
+    """
+    return {
+        "id": uid,
+        "email": email,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def _authenticate(
+    credentials: Optional[HTTPAuthorizationCredentials],
+    *,
+    role_setting_mode: bool = False,
 ) -> dict:
-    # Skip authentication for OPTIONS requests (CORS preflight)
-    if request.method == "OPTIONS":
-        logging.info("[AUTH] Skipping authentication for OPTIONS request")
-        return {"uid": "options", "email": "options@system", "role": "system"}
-    
+    """Shared body of the auth dependencies.
+
+    In ``role_setting_mode`` the token is always checked for revocation (no
+    cache, no fallback), unverified emails are tolerated for 5 minutes after
+    issue, and the user profile is read fresh rather than from the cache.
+    """
     # Check if credentials are provided
     if not credentials:
         logging.error("[AUTH] No credentials provided")
@@ -159,13 +456,19 @@ def get_current_user(
         
     token = credentials.credentials
     try:
-        logging.info("[AUTH] Starting token verification")
+        logger.debug("[AUTH] Starting token verification (role_setting_mode=%s)", role_setting_mode)
         
         # Verification with configurable revocation enforcement and optional fallback
+        decoded_token = None if role_setting_mode else _token_cache.get(token)
         try:
-            decoded_token = _verify_id_token(token, check_revoked=AUTH_CHECK_REVOKED)
-            logging.info(f"[AUTH] Token verification successful for uid: {decoded_token.get('uid')}")
+            if role_setting_mode:
+                decoded_token = await run_in_threadpool(_verify_id_token_strict, token)
+            elif decoded_token is None:
+                decoded_token = await run_in_threadpool(_verify_id_token, token, AUTH_CHECK_REVOKED)
+                _token_cache.put(token, decoded_token)
+            logger.debug("[AUTH] Token verification successful for uid: %s", decoded_token.get("uid"))
         except getattr(auth, "RevokedIdTokenError", Exception) as revoked_err:
+            _token_cache.invalidate(token)
             logging.warning(f"[AUTH] Token has been revoked: {type(revoked_err).__name__}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -176,10 +479,10 @@ def get_current_user(
             err_type = type(e).__name__
             logging.error(f"[AUTH] Firebase token verification failed ({err_type}): {e}")
             _track_auth_failure("token_verification")
-            if AUTH_CHECK_REVOKED and AUTH_FALLBACK_NO_REVOKE:
+            if not role_setting_mode and AUTH_CHECK_REVOKED and AUTH_FALLBACK_NO_REVOKE:
                 try:
                     logging.warning("[AUTH] Retrying token verification without revocation check due to error above")
-                    decoded_token = _verify_id_token(token, check_revoked=False)
+                    decoded_token = await run_in_threadpool(_verify_id_token, token, False)
                     logging.info("[AUTH] Token verification succeeded without revocation check")
                 except Exception as e2:
                     err_type2 = type(e2).__name__
@@ -189,7 +492,6 @@ def get_current_user(
                         detail="Invalid authentication token"
                     )
             else:
-                logging.error(f"[AUTH] Token verification error: {e}")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid authentication token"
@@ -197,9 +499,6 @@ def get_current_user(
         
         # Enforce max session age
         _enforce_session_max_age(decoded_token)
-        # Optionally require verified email globally
-        _ensure_verified(decoded_token)
-        logging.info(f"[AUTH] Decoded Firebase token for UID: {decoded_token.get('uid')}, email: {decoded_token.get('email')}")
         
         # Note: Do not block unverified emails here. Verification is enforced on role-gated routes.
         email_verified = decoded_token.get("email_verified", False)
@@ -208,68 +507,84 @@ def get_current_user(
         set_user_id_for_request(uid)
         email = decoded_token.get("email", "")
         
-        # Optional: deny disabled users using short-lived cached check (5-minute buckets)
-        try:
-            bucket = int(time.time() // 300)
-            if _is_user_disabled_cached(uid, bucket):
+        if role_setting_mode:
+            # The token may predate a just-completed email verification; allow recent tokens through
+            if not email_verified:
+                if time.time() - decoded_token.get("iat", 0) < 300:  # 5 minutes
+                    logging.info("[AUTH] Allowing role setting for recent token (might be verification delay)")
+                else:
+                    logging.warning(f"[AUTH] User {uid} has not verified their email (for role setting)")
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail="Email verification required. Please check your email and verify your account."
+                    )
+        else:
+            # Optionally require verified email globally
+            _ensure_verified(decoded_token)
+            
+            # Optional: deny disabled users using short-lived cached check (~5 minutes).
+            # The strict role-setting verification already rejects disabled users.
+            disabled = _cached_disabled_state(uid)
+            if disabled is None:
+                try:
+                    disabled = await run_in_threadpool(_is_user_disabled, uid)
+                except Exception as e:
+                    logging.debug(f"[AUTH] Disabled check (cached) non-fatal error: {e}")
+                    disabled = False
+            if disabled:
                 logging.warning(f"[AUTH] Disabled user attempted access: {uid}")
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User disabled")
-        except Exception as e:
-            logging.debug(f"[AUTH] Disabled check (cached) non-fatal error: {e}")
         
-        # Simple direct Firestore lookup (ThreadPoolExecutor was causing delays)
-        logging.info(f"[AUTH] Starting Firestore lookup for UID: {uid}")
+        # Firestore user lookup, served from the short-TTL profile cache when warm
         try:
-            db = get_firestore_client()
-            logging.info(f"[AUTH] Firestore client obtained successfully")
-            
-            # Direct Firestore call - much faster than ThreadPoolExecutor
-            user_doc = db.collection("users").document(uid).get()
-            logging.info(f"[AUTH] Firestore lookup completed successfully. User exists: {user_doc.exists}")
-            
+            if role_setting_mode:
+                # Role changes must act on the stored doc, not a cached copy
+                invalidate_user_profile(uid)
+            user_data = await _get_user_profile(uid)
         except HTTPException:
             raise
         except Exception as e:
-            logging.error(f"[AUTH] Firestore lookup failed: {e}")
+            logging.error(f"[AUTH] Firestore lookup failed ({type(e).__name__}): {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database lookup failed"
             )
         
-        if not user_doc.exists:
+        if user_data is None:
             # GUIDED SETUP FIX: Auto-create user document for new users to enable onboarding
             logging.info(f"[AUTH] Creating new user document for UID {uid} to enable guided setup")
             try:
-                # Create minimal user document to allow access
-                user_data = {
-                    "id": uid,
-                    "email": email,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    # Don't set role yet - this will be done in SelectRole
-                }
+                # Create minimal user document to allow access; role is set later in SelectRole
+                user_data = _new_user_doc(uid, email)
                 
-                # Create the user document directly (ThreadPoolExecutor was causing delays)
-                db.collection("users").document(uid).set(user_data)
+                db = get_async_firestore_client()
+                try:
+                    # create() fails if the doc exists, so concurrent first requests can't clobber each other
+                    await db.collection("users").document(uid).create(user_data)
+                except AlreadyExists:
+                    # Another request won the race; use what it wrote
+                    user_data = await _get_user_profile(uid) or user_data
+                    return {"uid": uid, "email": email, "role": user_data.get("role"), "email_verified": email_verified}
+                _store_user_profile(uid, user_data)
                 logging.info(f"[AUTH] Successfully created user document for UID {uid}")
                 
                 # Return with no role so user goes to SelectRole
                 return {"uid": uid, "email": email, "role": None, "email_verified": email_verified}
                         
             except Exception as create_error:
-                logging.error(f"[AUTH] Failed to create user document: {create_error}")
+                logging.error(f"[AUTH] Failed to create user document ({type(create_error).__name__}): {create_error}")
                 # Still allow access without role for SelectRole flow
                 return {"uid": uid, "email": email, "role": None}
         
-        user_data = user_doc.to_dict()
         role = user_data.get("role")
         stored_email = user_data.get("email", email)
         
         # GUIDED SETUP FIX: Allow access without role for SelectRole flow
         if not role:
-            logging.info(f"[AUTH] User with UID {uid} found but no role set - allowing SelectRole access")
+            logger.debug("[AUTH] User with UID %s found but no role set - allowing SelectRole access", uid)
             return {"uid": uid, "email": stored_email, "role": None, "email_verified": email_verified}
             
-        logging.info(f"[AUTH] Authentication successful for UID {uid} with role {role}")
+        logger.debug("[AUTH] Authentication successful for UID %s with role %s", uid, role)
         return {"uid": uid, "email": stored_email, "role": role, "email_verified": email_verified}
         
     except firebase_exceptions.FirebaseError as e:
@@ -282,14 +597,22 @@ def get_current_user(
         # Re-raise HTTP exceptions (like timeouts) without wrapping
         raise
     except Exception as e:
-        logging.error(f"[AUTH] Unexpected error in get_current_user: {e}")
+        logging.error(f"[AUTH] Unexpected error during authentication: {e}")
         _track_auth_failure("unexpected")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Unexpected error in get_current_user: {e}",
+            detail=f"Authentication failed: {e}",
         )
 
-def get_current_user_for_role_setting(
+
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> dict:
+    return await _authenticate(credentials)
+
+
+async def get_current_user_for_role_setting(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
 ) -> dict:
@@ -297,125 +620,7 @@ def get_current_user_for_role_setting(
     Special auth dependency for role setting that allows unverified users
     who have just completed email verification but the token hasn't refreshed yet
     """
-    # Skip authentication for OPTIONS requests (CORS preflight)
-    if request.method == "OPTIONS":
-        logging.info("[AUTH] Skipping authentication for OPTIONS request")
-        return {"uid": "options", "email": "options@system", "role": "system"}
-    
-    # Check if credentials are provided
-    if not credentials:
-        logging.error("[AUTH] No credentials provided")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication credentials required"
-        )
-        
-    token = credentials.credentials
-    try:
-        logging.info(f"[AUTH] Starting token verification for role setting")
-        
-        # Strict verification with revocation enforcement
-        try:
-            decoded_token = _verify_id_token_strict(token)
-            logging.info(f"[AUTH] Token verification completed successfully")
-        except getattr(auth, "RevokedIdTokenError", Exception):
-            logging.warning("[AUTH] Token has been revoked (role setting)")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token revoked. Please sign in again."
-            )
-        except Exception as e:
-            logging.error(f"[AUTH] Firebase token verification failed: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
-        # Enforce max session age
-        _enforce_session_max_age(decoded_token)
-        
-        uid = decoded_token["uid"]
-        email = decoded_token.get("email", "")
-        
-        # FOR ROLE SETTING: Check email verification but allow recent verifications
-        email_verified = decoded_token.get("email_verified", False)
-        
-        if not email_verified:
-            # Check if user has very recently verified (token might be stale)
-            # Allow role setting if user exists and token is recent
-            import time
-            token_issued_at = decoded_token.get("iat", 0)
-            current_time = time.time()
-            
-            # If token is less than 5 minutes old, be more lenient
-            if current_time - token_issued_at < 300:  # 5 minutes
-                logging.info(f"[AUTH] Allowing role setting for recent token (might be verification delay)")
-            else:
-                logging.warning(f"[AUTH] User {uid} has not verified their email (for role setting)")
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Email verification required. Please check your email and verify your account."
-                )
-        
-        # Get user from Firestore
-        logging.info(f"[AUTH] Starting Firestore lookup for role setting: {uid}")
-        try:
-            db = get_firestore_client()
-            if not db:
-                logging.error(f"[AUTH] Failed to get Firestore client")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Database connection failed"
-                )
-            
-            user_doc = db.collection("users").document(uid).get()
-            logging.info(f"[AUTH] Firestore lookup completed. User exists: {user_doc.exists}")
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logging.error(f"[AUTH] Firestore lookup failed for role setting: {e}")
-            logging.error(f"[AUTH] Exception type: {type(e).__name__}")
-            logging.error(f"[AUTH] Exception args: {e.args}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database lookup failed"
-            )
-        
-        if not user_doc.exists:
-            # Auto-create user document for role setting
-            logging.info(f"[AUTH] Creating new user document for role setting: {uid}")
-            try:
-                user_data = {
-                    "id": uid,
-                    "email": email,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    # Don't set role yet - this will be done by the role endpoint
-                }
-                db.collection("users").document(uid).set(user_data)
-                logging.info(f"[AUTH] Successfully created user document for role setting: {uid}")
-                return {"uid": uid, "email": email, "role": None}
-                        
-            except Exception as create_error:
-                logging.error(f"[AUTH] Failed to create user document for role setting: {create_error}")
-                logging.error(f"[AUTH] Create error type: {type(create_error).__name__}")
-                # Still allow the role setting to proceed
-                return {"uid": uid, "email": email, "role": None}
-        
-        user_data = user_doc.to_dict()
-        role = user_data.get("role")
-        stored_email = user_data.get("email", email)
-        
-        logging.info(f"[AUTH] Role setting auth successful for UID {uid}")
-        return {"uid": uid, "email": stored_email, "role": role}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logging.error(f"[AUTH] Unexpected error in role setting auth: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Authentication failed: {e}",
-        )
+    return await _authenticate(credentials, role_setting_mode=True)
 
 def require_role(*allowed_roles):
     def wrapper(user=Depends(get_current_user)):
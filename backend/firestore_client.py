@@ -1,72 +1,102 @@
 from google.cloud import firestore
 from google.oauth2 import service_account
-import os
-import json
+from ._creds import CREDS_DICT
+import asyncio
 import logging
+import os
+import threading
 import time
+import weakref
 
-# Singleton Firestore client to prevent multiple connections
+# Singleton Firestore clients to prevent multiple connections
 _firestore_client = None
+_async_firestore_client = None
+# Guards first-time construction so concurrent cold requests build one client
+_firestore_client_lock = threading.Lock()
+
+
+def _create_client(client_cls, label: str = "client"):
+    """Build a Firestore client (sync or async) using the shared credential logic."""
+    start_time = time.time()
+    logging.info(f"[FIRESTORE] Starting {label} initialization...")
+
+    # Credentials JSON is parsed once in _creds and shared with auth.py
+    if CREDS_DICT is not None:
+        try:
+            credentials = service_account.Credentials.from_service_account_info(CREDS_DICT)
+
+            # Initialize Firestore client with credentials
+            client = client_cls(
+                credentials=credentials,
+                project=CREDS_DICT.get("project_id")
+            )
+            init_time = time.time() - start_time
+            logging.info(f"[FIRESTORE] Initialized {label} with JSON credentials in {init_time:.2f}s")
+            return client
+        except Exception as e:
+            logging.error(f"[FIRESTORE] Failed to initialize {label} with JSON credentials: {e}")
+        # Fallback to default credentials
+        try:
+            client = client_cls()
+            init_time = time.time() - start_time
+            logging.info(f"[FIRESTORE] Initialized {label} with default credentials in {init_time:.2f}s")
+            return client
+        except Exception as default_e:
+            logging.error(f"[FIRESTORE] Failed to initialize with default credentials: {default_e}")
+            raise RuntimeError(f"Unable to initialize Firestore client: {default_e}")
+
+    # Use default application credentials
+    try:
+        client = client_cls()
+        init_time = time.time() - start_time
+        logging.info(f"[FIRESTORE] Initialized {label} with default credentials in {init_time:.2f}s")
+        return client
+    except Exception as e:
+        logging.error(f"[FIRESTORE] Failed to initialize with default credentials: {e}")
+        logging.error("[FIRESTORE] Make sure GOOGLE_APPLICATION_CREDENTIALS_JSON is set in environment")
+        raise RuntimeError(f"Unable to initialize Firestore client: {e}")
+
 
 def get_firestore_client():
     global _firestore_client
     if _firestore_client is None:
-        start_time = time.time()
-        logging.info("[FIRESTORE] Starting client initialization...")
-        
-        # Use the same credential handling logic as auth.py
-        creds_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
-        
-        if creds_json:
-            try:
-                # Parse JSON credentials from environment variable
-                cred_dict = json.loads(creds_json)
-                credentials = service_account.Credentials.from_service_account_info(cred_dict)
-                
-                # Initialize Firestore client with credentials
-                _firestore_client = firestore.Client(
-                    credentials=credentials, 
-                    project=cred_dict.get("project_id")
-                )
-                init_time = time.time() - start_time
-                logging.info(f"[FIRESTORE] Initialized with JSON credentials in {init_time:.2f}s")
-            except json.JSONDecodeError as e:
-                logging.error(f"[FIRESTORE] Invalid JSON in GOOGLE_APPLICATION_CREDENTIALS_JSON: {e}")
-                # Fallback to default credentials
-                try:
-                    _firestore_client = firestore.Client()
-                    init_time = time.time() - start_time
-                    logging.info(f"[FIRESTORE] Initialized with default credentials in {init_time:.2f}s")
-                except Exception as default_e:
-                    logging.error(f"[FIRESTORE] Failed to initialize with default credentials: {default_e}")
-                    raise RuntimeError(f"Unable to initialize Firestore client: {default_e}")
-            except Exception as e:
-                logging.error(f"[FIRESTORE] Failed to initialize with JSON credentials: {e}")
-                # Fallback to default credentials
-                try:
-                    _firestore_client = firestore.Client()
-                    init_time = time.time() - start_time
-                    logging.info(f"[FIRESTORE] Initialized with default credentials in {init_time:.2f}s")
-                except Exception as default_e:
-                    logging.error(f"[FIRESTORE] Failed to initialize with default credentials: {default_e}")
-                    raise RuntimeError(f"Unable to initialize Firestore client: {default_e}")
-        else:
-            # Use default application credentials
-            try:
-                _firestore_client = firestore.Client()
-                init_time = time.time() - start_time
-                logging.info(f"[FIRESTORE] Initialized with default credentials in {init_time:.2f}s")
-            except Exception as e:
-                logging.error(f"[FIRESTORE] Failed to initialize with default credentials: {e}")
-                logging.error("[FIRESTORE] Make sure GOOGLE_APPLICATION_CREDENTIALS_JSON is set in environment")
-                raise RuntimeError(f"Unable to initialize Firestore client: {e}")
-    
+        with _firestore_client_lock:
+            if _firestore_client is None:
+                _firestore_client = _create_client(firestore.Client)
     return _firestore_client
 
+
+def get_async_firestore_client():
+    """Return the shared AsyncClient for code paths running on the event loop.
+
+    The sync client remains the default for routes that have not been ported.
+    """
+    global _async_firestore_client
+    if _async_firestore_client is None:
+        with _firestore_client_lock:
+            if _async_firestore_client is None:
+                _async_firestore_client = _create_client(firestore.AsyncClient, label="async client")
+    return _async_firestore_client
+
+# Process-wide cap on in-flight AsyncClient calls. Batch routes bound their own
+# fan-out per request; this bounds all requests together so concurrent batches
+# cannot queue hundreds of streams on the shared gRPC channel (100 max streams).
+FIRESTORE_ASYNC_MAX_CONCURRENCY = int(os.getenv("FIRESTORE_ASYNC_MAX_CONCURRENCY", "64"))
+_async_call_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def async_firestore_slots() -> asyncio.Semaphore:
+    """Semaphore gating AsyncClient calls on the running event loop."""
+    loop = asyncio.get_running_loop()
+    slots = _async_call_slots.get(loop)
+    if slots is None:
+        slots = _async_call_slots[loop] = asyncio.Semaphore(FIRESTORE_ASYNC_MAX_CONCURRENCY)
+    return slots
+
 # Lazy property that only creates client when first accessed
 class _FirestoreDB:
     def __getattr__(self, name):
         client = get_firestore_client()
         return getattr(client, name)
 
-db = _FirestoreDB() 
\ No newline at end of file
+db = _FirestoreDB()
@@ -13,12 +13,13 @@ from .routes.schemas import router as schemas_router
 from .routes.migrations import router as migrations_router
 from .routes.drafts import router as drafts_router
 from .auth import get_current_user
-from .middleware.rate_limiting import add_rate_limiting, health_rate_limit, read_rate_limit
+from .firestore_client import get_firestore_client
+from .utils.responses import APIJSONResponse
+from .middleware.rate_limiting import add_rate_limiting, HEALTH_RATE_LIMIT
 from .middleware.abuse_protection import add_abuse_protection_middleware
-from .middleware.security import (
-    add_security_headers_middleware,
-    add_request_validation_middleware,
-)
+from .middleware.health_probe import add_health_probe_middleware
+from .middleware.response_cache import add_response_cache_middleware
+from .middleware.security import add_security_middleware
 from .middleware.observability import (
     ObservabilityMiddleware,
     init_sentry_if_configured,
@@ -27,12 +28,12 @@ import logging
 from pathlib import Path
 from fastapi.staticfiles import StaticFiles
 import os
-from starlette.middleware.base import BaseHTTPMiddleware
+import time
+import threading
 from starlette.responses import Response, JSONResponse
-from fastapi.responses import PlainTextResponse
-from google.cloud import firestore
 from datetime import datetime, timezone
 import asyncio
+import concurrent.futures
 from .utils.error_handling import StandardError, handle_standard_error
  
 # Enable or disable debug/test endpoints via environment
@@ -53,13 +54,13 @@ def _get_log_level_from_env() -> int:
 
 logging.basicConfig(level=_get_log_level_from_env())
 
-app = FastAPI(title="WooCombine API", version="1.0.2")
+app = FastAPI(title="WooCombine API", version="1.0.2", default_response_class=APIJSONResponse)
 init_sentry_if_configured()
+# Innermost: cached read responses are replayed right next to the routes
+add_response_cache_middleware(app)
 app.add_middleware(ObservabilityMiddleware)
 
-# Middleware order (outermost last-added): security headers → abuse protection → rate limiting → request validation → CORS → routing
-# 1) Security headers
-add_security_headers_middleware(app)
+# Middleware order (outermost last-added): abuse protection → rate limiting → request validation + security headers → CORS → routing
 
 # Global handler for application-standard errors
 @app.exception_handler(StandardError)
@@ -93,8 +94,9 @@ add_abuse_protection_middleware(app)
 # 4) Rate limiting (must come before request validation so 413s do not bypass limits)
 add_rate_limiting(app)
 
-# 5) Request validation (after rate limiting)
-add_request_validation_middleware(app, config={"max_request_size": 5 * 1024 * 1024})
+# 5) Request validation + security headers, fused into one frame (after rate limiting).
+# Headers now also cover the abuse-protection and rate-limit 429s produced further in.
+add_security_middleware(app, config={"max_request_size": 5 * 1024 * 1024})
 
 # 6) CORS (must be outermost so it can short-circuit OPTIONS and attach headers)
 app.add_middleware(
@@ -116,170 +118,158 @@ app.add_middleware(
     ],
 )
 
+# 7) Liveness probes (/health) are answered before every other layer
+add_health_probe_middleware(app)
+
 # Lazy Firestore initialization to speed up startup
 _firestore_client = None
+# Health/warmup bursts can arrive concurrently on a cold instance; initialize once
+_firestore_lock = threading.Lock()
 
 def get_firestore_lazy():
     global _firestore_client
     if _firestore_client is None:
-        try:
-            from .firestore_client import get_firestore_client
-            _firestore_client = get_firestore_client()
-            logging.info("[STARTUP] Firestore client initialized lazily")
-        except Exception as e:
-            logging.warning(f"[STARTUP] Firestore lazy initialization issue: {e}")
-            if "DefaultCredentialsError" in str(e) or "credentials" in str(e).lower():
-                logging.error("[STARTUP] ❗ Missing Firebase credentials! Set GOOGLE_APPLICATION_CREDENTIALS_JSON in environment")
-            _firestore_client = None
+        with _firestore_lock:
+            if _firestore_client is None:
+                try:
+                    _firestore_client = get_firestore_client()
+                    logging.info("[STARTUP] Firestore client initialized lazily")
+                except Exception as e:
+                    logging.warning(f"[STARTUP] Firestore lazy initialization issue: {e}")
+                    if "DefaultCredentialsError" in str(e) or "credentials" in str(e).lower():
+                        logging.error("[STARTUP] ❗ Missing Firebase credentials! Set GOOGLE_APPLICATION_CREDENTIALS_JSON in environment")
+                    _firestore_client = None
     return _firestore_client
 
 # Include API routes with /api prefix to avoid conflicts with static frontend
-app.include_router(players_router, prefix="/api", tags=["Players"])
-app.include_router(leagues_router, prefix="/api", tags=["Leagues"])
-app.include_router(drills_router, prefix="/api", tags=["Drills"])
-app.include_router(events_router, prefix="/api", tags=["Events"])
-app.include_router(users_router, prefix="/api", tags=["Users"])
-app.include_router(evaluators_router, prefix="/api", tags=["Evaluators"])
-app.include_router(batch_router, prefix="/api", tags=["Batch Operations"])
-app.include_router(imports_router, prefix="/api", tags=["Imports"])
-app.include_router(stats_router, prefix="/api", tags=["Stats"])
-app.include_router(drafts_router, prefix="/api", tags=["Drafts"])
-app.include_router(schemas_router, prefix="/api", tags=["Schemas"])
-app.include_router(migrations_router, prefix="/api", tags=["Migrations"])
+_API_ROUTERS = (
+    (players_router, "Players"),
+    (leagues_router, "Leagues"),
+    (drills_router, "Drills"),
+    (events_router, "Events"),
+    (users_router, "Users"),
+    (evaluators_router, "Evaluators"),
+    (batch_router, "Batch Operations"),
+    (imports_router, "Imports"),
+    (stats_router, "Stats"),
+    (drafts_router, "Drafts"),
+    (schemas_router, "Schemas"),
+    (migrations_router, "Migrations"),
+)
+for _router, _tag in _API_ROUTERS:
+    app.include_router(_router, prefix="/api", tags=[_tag])
+
+# Env-derived values served by /api/meta and security.txt; env is fixed after startup
+META_ALLOWED_ORIGINS = _allowed_origins_env
+META_ROLE_SIMPLE_ENABLED = os.getenv("ENABLE_ROLE_SIMPLE", "false").lower() in ("1", "true", "yes")
+SECURITY_CONTACT = os.getenv("SECURITY_CONTACT_EMAIL", "security@woo-combine.com")
+SECURITY_POLICY_URL = os.getenv("SECURITY_POLICY_URL", "https://www.woo-combine.com/security")
+SECURITY_ACK_URL = os.getenv("SECURITY_ACK_URL", "https://www.woo-combine.com/hall-of-fame")
+SECURITY_TXT_BYTES = f"""Contact: mailto:{SECURITY_CONTACT}
+Policy: {SECURITY_POLICY_URL}
+Acknowledgments: {SECURITY_ACK_URL}
+Preferred-Languages: en
+Canonical: https://www.woo-combine.com/.well-known/security.txt
+""".encode("utf-8")
 
 # Simple config/meta endpoint to help frontend adapt and for debugging
 @app.get("/api/meta")
 def meta():
     return {
         "version": "1.0.2",
-        "allowed_origins": os.getenv("ALLOWED_ORIGINS", ""),
-        "role_simple_enabled": os.getenv("ENABLE_ROLE_SIMPLE", "false").lower() in ("1", "true", "yes")
+        "allowed_origins": META_ALLOWED_ORIGINS,
+        "role_simple_enabled": META_ROLE_SIMPLE_ENABLED
     }
 
 # Security contact endpoints
 @app.get("/security.txt", include_in_schema=False)
 @app.get("/.well-known/security.txt", include_in_schema=False)
 def security_txt():
-    contact = os.getenv("SECURITY_CONTACT_EMAIL", "security@woo-combine.com")
-    policy_url = os.getenv("SECURITY_POLICY_URL", "https://www.woo-combine.com/security")
-    acknowledgments = os.getenv("SECURITY_ACK_URL", "https://www.woo-combine.com/hall-of-fame")
-    content = f"""Contact: mailto:{contact}
-Policy: {policy_url}
-Acknowledgments: {acknowledgments}
-Preferred-Languages: en
-Canonical: https://www.woo-combine.com/.well-known/security.txt
-"""
-    return PlainTextResponse(content, media_type="text/plain; charset=utf-8")
+    return Response(content=SECURITY_TXT_BYTES, media_type="text/plain; charset=utf-8")
 
-# Health check endpoint for debugging
-@app.get("/api/health")
-@health_rate_limit()
-def health_check(request: Request):
-    """Public minimal health check (no sensitive details)."""
-    firestore_status = "uninitialized"
-    try:
-        client = get_firestore_lazy()
-        firestore_status = "connected" if client else "unavailable"
-    except Exception:
-        firestore_status = "error"
+# Load-balancer probes hit the health endpoints many times per second;
+# re-probe the Firestore client at most once per window
+_HEALTH_CACHE_TTL = 5.0
+_HEALTH_CACHE = {"status": None, "ts": 0.0}
+
+def _health_payload() -> dict:
+    now = time.time()
+    firestore_status = _HEALTH_CACHE["status"]
+    if firestore_status is None or now - _HEALTH_CACHE["ts"] > _HEALTH_CACHE_TTL:
+        try:
+            client = get_firestore_lazy()
+            firestore_status = "connected" if client else "unavailable"
+        except Exception:
+            firestore_status = "error"
+        _HEALTH_CACHE["status"] = firestore_status
+        _HEALTH_CACHE["ts"] = now
     return {
         "status": "ok",
         "firestore": firestore_status,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
     }
 
+# Health check endpoints for debugging and deployment monitoring (one handler, both paths).
+# GET/HEAD /health is answered by HealthProbeMiddleware; the route stays for the OpenAPI schema.
+@app.get("/api/health")
 @app.get("/health")
 @app.head("/health")
-@health_rate_limit()
-def simple_health(request: Request):
-    """Minimal health check endpoint for deployment monitoring"""
-    firestore_status = "uninitialized"
+@HEALTH_RATE_LIMIT
+def health_check(request: Request):
+    """Public minimal health check (no sensitive details)."""
+    return _health_payload()
+
+# Shared pool for the warmup collection probes; created once instead of per request
+_WARMUP_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=3, thread_name_prefix="warmup")
+
+def _warmup_firestore():
     try:
-        client = get_firestore_lazy()
-        firestore_status = "connected" if client else "unavailable"
-    except Exception:
-        firestore_status = "error"
-    return {
-        "status": "ok",
-        "firestore": firestore_status,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
+        db = get_firestore_client()
+
+        # Execute collection warmups truly in parallel with bounded waits
+        def fetch_one(col_name: str):
+            try:
+                return db.collection(col_name).limit(1).get()
+            except Exception as exc:
+                logging.warning(f"[WARMUP] Warmup fetch failed for {col_name}: {exc}")
+                return None
+
+        futures = [
+            _WARMUP_EXECUTOR.submit(fetch_one, col_name)
+            for col_name in ("users", "leagues", "user_memberships")
+        ]
+        # Bound the warmup subtasks to avoid stalling the endpoint
+        _, not_done = concurrent.futures.wait(futures, timeout=4)
+        if not_done:
+            logging.warning(f"[WARMUP] {len(not_done)} subtask(s) timed out")
+
+        return "warmed"
+    except Exception as e:
+        logging.error(f"[WARMUP] Firestore warmup failed: {e}")
+        return f"failed: {str(e)[:50]}"
+
+# auth (and firebase_admin) and the route modules are imported with the routers at
+# module load, so these report readiness without re-running import statements
+def _warmup_auth():
+    logging.info("[WARMUP] Auth module pre-initialized")
+    return "warmed"
+
+def _warmup_routes():
+    logging.info("[WARMUP] Critical routes pre-initialized")
+    return "warmed"
 
 @app.get("/api/warmup")
-@health_rate_limit()
-def warmup_endpoint(request: Request):
+@HEALTH_RATE_LIMIT
+async def warmup_endpoint(request: Request):
     """Enhanced warmup endpoint with parallel operations for faster cold start recovery"""
-    start_time = datetime.now(timezone.utc)
-    
-    # PERFORMANCE OPTIMIZATION: Parallel warmup operations for maximum efficiency
-    import concurrent.futures
-    import threading
-    
-    def warmup_firestore():
-        try:
-            from .firestore_client import get_firestore_client
-            db = get_firestore_client()
-
-            # Execute collection warmups truly in parallel with bounded waits
-            def fetch_one(col_name: str):
-                try:
-                    return db.collection(col_name).limit(1).get()
-                except Exception as exc:
-                    logging.warning(f"[WARMUP] Warmup fetch failed for {col_name}: {exc}")
-                    return None
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-                futures = [
-                    executor.submit(fetch_one, "users"),
-                    executor.submit(fetch_one, "leagues"),
-                    executor.submit(fetch_one, "user_memberships"),
-                ]
-                for f in futures:
-                    try:
-                        # Bound each warmup subtask to avoid stalling the endpoint
-                        f.result(timeout=4)
-                    except Exception as sub_exc:
-                        logging.warning(f"[WARMUP] Subtask timed out or failed: {sub_exc}")
-
-            return "warmed"
-        except Exception as e:
-            logging.error(f"[WARMUP] Firestore warmup failed: {e}")
-            return f"failed: {str(e)[:50]}"
-    
-    def warmup_auth():
-        try:
-            from . import auth
-            from firebase_admin import auth as admin_auth
-            
-            # Test that auth module is importable and Firebase Admin is initialized
-            logging.info("[WARMUP] Auth module pre-initialized")
-            return "warmed"
-        except Exception as e:
-            logging.error(f"[WARMUP] Auth warmup failed: {e}")
-            return f"failed: {str(e)[:50]}"
-    
-    def warmup_routes():
-        try:
-            from .routes import leagues, users
-            logging.info("[WARMUP] Critical routes pre-initialized")
-            return "warmed"
-        except Exception as e:
-            logging.error(f"[WARMUP] Routes warmup failed: {e}")
-            return f"failed: {str(e)[:50]}"
+    start_ns = time.perf_counter_ns()
     
-    # Execute all warmup tasks in parallel for maximum speed
-    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-        future_firestore = executor.submit(warmup_firestore)
-        future_auth = executor.submit(warmup_auth)
-        future_routes = executor.submit(warmup_routes)
-        
-        # Collect results
-        firestore_status = future_firestore.result()
-        auth_status = future_auth.result()
-        routes_status = future_routes.result()
+    # Only the Firestore probes block; run them on the default thread pool
+    firestore_status = await asyncio.to_thread(_warmup_firestore)
+    auth_status = _warmup_auth()
+    routes_status = _warmup_routes()
     
-    end_time = datetime.now(timezone.utc)
-    duration_ms = (end_time - start_time).total_seconds() * 1000
+    duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
     
     return {
         "status": "warmed",
@@ -287,7 +277,7 @@ def warmup_endpoint(request: Request):
         "firestore": firestore_status,
         "auth": auth_status,
         "routes": routes_status,
-        "timestamp": end_time.isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": "1.0.2"
     }
 
@@ -11,9 +11,10 @@ Environment variables:
 - ABUSE_MAX_REQUESTS: max allowed requests per window (default: 10)
 - ABUSE_CHALLENGE_DIFFICULTY: number of leading hex zeros required (default: 4)
 - ABUSE_SENSITIVE_PATH_PREFIXES: comma-separated list of prefixes (default: /api/users,/api/test-auth)
+- ABUSE_MAX_TRACKED_CLIENTS: max clients remembered before LRU eviction (default: 100000)
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 from fastapi import Request
 from fastapi.responses import JSONResponse
 import time
@@ -21,7 +22,8 @@ import os
 import hashlib
 import secrets
 import logging
-from collections import deque, defaultdict
+from collections import OrderedDict, deque
+from functools import lru_cache
 
 
 def _parse_bool(value: str, default: bool = False) -> bool:
@@ -30,24 +32,30 @@ def _parse_bool(value: str, default: bool = False) -> bool:
     return value.strip().lower() in ("1", "true", "yes", "on")
 
 
+@lru_cache(maxsize=4096)
+def _ua_hash(ua: str) -> str:
+    # Distinct User-Agents are few, so most lookups skip hashing entirely.
+    # Header values are latin-1 decoded, so UTF-8 encoding cannot fail.
+    return hashlib.sha256(ua.encode("utf-8")).hexdigest()[:8]
+
+
 def _get_client_identifier(request: Request) -> str:
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
-        client_ip = forwarded_for.split(",")[0].strip()
+        comma = forwarded_for.find(",")
+        client_ip = (forwarded_for[:comma] if comma != -1 else forwarded_for).strip()
     else:
         # starlette's client host
         client_ip = request.client.host if request.client else "unknown"
     ua = request.headers.get("User-Agent", "unknown")
-    try:
-        ua_hash = hashlib.sha256(ua.encode("utf-8")).hexdigest()[:8]
-    except Exception:
-        ua_hash = "noua"
-    return f"{client_ip}:{ua_hash}"
+    return f"{client_ip}:{_ua_hash(ua)}"
+
 
+class AbuseProtectionMiddleware:
+    """Plain ASGI middleware: non-sensitive paths are handed straight to the app."""
 
-class AbuseProtectionMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
         env = os.getenv("ENVIRONMENT", "").lower()
         default_enabled = env in ("prod", "production")
@@ -56,30 +64,52 @@ class AbuseProtectionMiddleware(BaseHTTPMiddleware):
         self.window_seconds = int(os.getenv("ABUSE_WINDOW_SECONDS", "30"))
         self.max_requests = int(os.getenv("ABUSE_MAX_REQUESTS", "10"))
         self.difficulty = int(os.getenv("ABUSE_CHALLENGE_DIFFICULTY", "4"))
+        # Static parts of the challenge, built once rather than on every 429/verify
+        # N leading hex zeros == N//2 zero bytes plus, for odd N, a zero high nibble
+        zero_nibbles = max(0, self.difficulty)
+        self._pow_zero_bytes = b"\x00" * (zero_nibbles // 2)
+        self._pow_odd = zero_nibbles % 2 == 1
+        self._challenge_template = {
+            "type": "pow",
+            "difficulty": self.difficulty,
+            "instruction": "Find any ASCII string 'answer' such that sha256(nonce + ':' + answer) starts with N hex zeros, where N=difficulty. Send headers X-Abuse-Nonce and X-Abuse-Answer to proceed.",
+        }
 
         prefixes_env = os.getenv("ABUSE_SENSITIVE_PATH_PREFIXES", "/api/users,/api/test-auth")
         self.sensitive_prefixes = [p.strip() for p in prefixes_env.split(",") if p.strip()]
+        # str.startswith accepts a tuple and checks every prefix in one C call
+        self._sensitive_prefixes_tuple = tuple(p.lower() for p in self.sensitive_prefixes)
 
-        # per-client request timestamps
-        self.client_requests = defaultdict(deque)
-        # per-client allowlist expiry after successful challenge
-        self.client_allow_until = {}
+        self.max_clients = int(os.getenv("ABUSE_MAX_TRACKED_CLIENTS", "100000"))
+        # per-client request timestamps (monotonic), least recently seen first
+        self.client_requests: "OrderedDict[str, deque]" = OrderedDict()
+        # per-client allowlist expiry (monotonic) after successful challenge
+        self.client_allow_until: "OrderedDict[str, float]" = OrderedDict()
 
         logging.info(
             f"[ABUSE] enabled={self.enabled}, window={self.window_seconds}s, max={self.max_requests}, diff={self.difficulty}, prefixes={self.sensitive_prefixes}"
         )
 
-    async def dispatch(self, request: Request, call_next):
-        if not self.enabled or not self._is_sensitive_path(request.url.path):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled or not self._is_sensitive_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-        now = time.time()
+        response = self._check(Request(scope))
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def _check(self, request: Request):
+        """Return a 429 challenge response, or None to let the request through."""
+        now = time.monotonic()
         client_id = _get_client_identifier(request)
 
         # If client solved a recent challenge, allow until expiry
         allow_until = self.client_allow_until.get(client_id, 0)
         if allow_until and now < allow_until:
-            return await call_next(request)
+            return None
 
         # Verify proof-of-work answer if provided
         client_answer = request.headers.get("X-Abuse-Answer")
@@ -88,11 +118,15 @@ class AbuseProtectionMiddleware(BaseHTTPMiddleware):
             if self._verify_pow(client_nonce, client_answer):
                 # allow for 2 minutes after successful solve
                 self.client_allow_until[client_id] = now + 120
-                return await call_next(request)
+                self._touch(self.client_allow_until, client_id)
+                return None
             # fall through (invalid answer -> treat as no answer)
 
         # Sliding window accounting
-        timestamps = self.client_requests[client_id]
+        timestamps = self.client_requests.get(client_id)
+        if timestamps is None:
+            timestamps = self.client_requests[client_id] = deque()
+        self._touch(self.client_requests, client_id)
         timestamps.append(now)
         # prune old entries
         cutoff = now - self.window_seconds
@@ -102,12 +136,7 @@ class AbuseProtectionMiddleware(BaseHTTPMiddleware):
         if len(timestamps) > self.max_requests:
             # Issue challenge
             nonce = secrets.token_hex(16)
-            challenge = {
-                "type": "pow",
-                "nonce": nonce,
-                "difficulty": self.difficulty,
-                "instruction": "Find any ASCII string 'answer' such that sha256(nonce + ':' + answer) starts with N hex zeros, where N=difficulty. Send headers X-Abuse-Nonce and X-Abuse-Answer to proceed.",
-            }
+            challenge = {**self._challenge_template, "nonce": nonce}
             headers = {
                 "X-Abuse-Mode": "pow",
                 "X-Abuse-Nonce": nonce,
@@ -115,16 +144,26 @@ class AbuseProtectionMiddleware(BaseHTTPMiddleware):
             }
             return JSONResponse(status_code=429, content={"detail": "Challenge required", "challenge": challenge}, headers=headers)
 
-        return await call_next(request)
+        return None
+
+    def _touch(self, entries: OrderedDict, client_id: str) -> None:
+        """Mark client_id most recently used and evict the oldest clients past the cap."""
+        entries.move_to_end(client_id)
+        while len(entries) > self.max_clients:
+            entries.popitem(last=False)
 
     def _is_sensitive_path(self, path: str) -> bool:
-        path_lower = path.lower()
-        return any(path_lower.startswith(p) for p in self.sensitive_prefixes)
+        # Routes are matched case-sensitively, so a mixed-case path never reaches
+        # a sensitive handler and needs no lower() here
+        return path.startswith(self._sensitive_prefixes_tuple)
 
     def _verify_pow(self, nonce: str, answer: str) -> bool:
         try:
-            digest = hashlib.sha256(f"{nonce}:{answer}".encode("utf-8")).hexdigest()
-            return digest.startswith("0" * max(0, self.difficulty))
+            # Compare raw digest bytes; avoids building the 64-char hex string
+            digest = hashlib.sha256(f"{nonce}:{answer}".encode("utf-8")).digest()
+            if not digest.startswith(self._pow_zero_bytes):
+                return False
+            return not self._pow_odd or (digest[len(self._pow_zero_bytes)] >> 4) == 0
         except Exception:
             return False
 
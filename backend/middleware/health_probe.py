@@ -0,0 +1,45 @@
+"""
+Liveness probe short-circuit for WooCombine API
+Answers platform health checks before any other middleware runs
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+import logging
+
+# Polled by Render (healthCheckPath) and the Docker HEALTHCHECK. /api/health is
+# deliberately not here: it reports Firestore status and stays rate limited.
+_LIVENESS_PATHS = frozenset({"/health"})
+_LIVENESS_BODY = b'{"status":"ok"}'
+_LIVENESS_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_LIVENESS_BODY)).encode("latin-1")),
+    (b"cache-control", b"no-store"),
+]
+
+
+class HealthProbeMiddleware:
+    """
+    Reply to GET/HEAD liveness probes directly so they never pay for the
+    security, abuse, rate-limit, validation and observability layers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] not in _LIVENESS_PATHS
+            or scope["method"] not in ("GET", "HEAD")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": _LIVENESS_HEADERS})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else _LIVENESS_BODY})
+
+
+def add_health_probe_middleware(app):
+    """Add the liveness short-circuit; call last so it is the outermost middleware."""
+    app.add_middleware(HealthProbeMiddleware)
+    logging.info(f"Health probe short-circuit configured for {sorted(_LIVENESS_PATHS)}")
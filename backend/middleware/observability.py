@@ -3,130 +3,166 @@ import json
 import logging
 import os
 import time
-import uuid
+from os import urandom
+from dataclasses import dataclass
 from typing import Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 import contextvars
-import importlib
 
-def _import_sentry():
-    try:
-        sdk = importlib.import_module("sentry_sdk")
-        return sdk
-    except Exception:
-        return None
+# Resolved once at import; every call site checks for None instead of re-importing
+try:
+    import sentry_sdk as _SENTRY
+except Exception:
+    _SENTRY = None
+
+# orjson is optional; it serializes the per-request log line several times faster
+try:
+    import orjson as _orjson
+
+    def _dumps(payload: dict) -> str:
+        return _orjson.dumps(payload).decode("utf-8")
+except Exception:
+    _dumps = json.dumps
+
+_logger = logging.getLogger(__name__)
+
 
+@dataclass
+class RequestMetrics:
+    """Per-request metrics, mutated in place by helpers during the request."""
 
-# Context variables to aggregate per-request metrics
-request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
-user_id_hash_var: contextvars.ContextVar[str] = contextvars.ContextVar("user_id_hash", default="")
-firestore_calls_var: contextvars.ContextVar[int] = contextvars.ContextVar("firestore_calls", default=0)
-firestore_total_ms_var: contextvars.ContextVar[float] = contextvars.ContextVar("firestore_total_ms", default=0.0)
-cache_hits_delta_var: contextvars.ContextVar[int] = contextvars.ContextVar("cache_hits_delta", default=0)
-cache_misses_delta_var: contextvars.ContextVar[int] = contextvars.ContextVar("cache_misses_delta", default=0)
+    request_id: str = ""
+    user_id_hash: str = ""
+    firestore_calls: int = 0
+    firestore_total_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+# One mutable record per request. Because helpers mutate it rather than set
+# new values, updates made in threadpool-run (copied-context) code are still
+# visible to the middleware when it logs.
+metrics_var: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar("request_metrics", default=None)
 
 
 def set_user_id_for_request(user_id: Optional[str]) -> None:
     """Set hashed user id in the request context for structured logs and Sentry."""
     try:
+        metrics = metrics_var.get()
         if not user_id:
-            user_id_hash_var.set("")
+            if metrics is not None:
+                metrics.user_id_hash = ""
             return
         digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
-        user_id_hash_var.set(digest)
-        _s = _import_sentry()
-        if _s:
-            with _s.configure_scope() as scope:  # type: ignore[attr-defined]
-                scope.set_user({"id": digest})
+        if metrics is not None:
+            metrics.user_id_hash = digest
+        # Skip the scope write entirely when Sentry is installed but not configured
+        if _SENTRY is not None and _SENTRY.is_initialized():
+            _SENTRY.set_user({"id": digest})
     except Exception:
         # Never break request on hashing/logging
         pass
 
 
 def record_firestore_call(duration_ms: float) -> None:
+    metrics = metrics_var.get()
+    if metrics is None:
+        return
     try:
-        firestore_calls = firestore_calls_var.get()
-        firestore_total = firestore_total_ms_var.get()
-        firestore_calls_var.set(firestore_calls + 1)
-        firestore_total_ms_var.set(firestore_total + float(duration_ms))
+        metrics.firestore_calls += 1
+        metrics.firestore_total_ms += float(duration_ms)
     except Exception:
         pass
 
 
 def add_cache_deltas(hits_delta: int = 0, misses_delta: int = 0) -> None:
+    metrics = metrics_var.get()
+    if metrics is None:
+        return
     try:
-        cache_hits_delta_var.set(cache_hits_delta_var.get() + int(hits_delta))
-        cache_misses_delta_var.set(cache_misses_delta_var.get() + int(misses_delta))
+        metrics.cache_hits += int(hits_delta)
+        metrics.cache_misses += int(misses_delta)
     except Exception:
         pass
 
 
-class ObservabilityMiddleware(BaseHTTPMiddleware):
-    """Middleware to add request id, structured logging, and basic timings."""
+class ObservabilityMiddleware:
+    """Middleware to add request id, structured logging, and basic timings.
+
+    Plain ASGI rather than BaseHTTPMiddleware so the request is not routed
+    through an extra task group and body stream.
+    """
 
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
-        req_id = str(uuid.uuid4())
-        request_id_var.set(req_id)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Opaque correlation id; no need to build and format a UUID object
+        req_id = urandom(16).hex()
+        metrics = RequestMetrics(request_id=req_id)
+        metrics_var.set(metrics)
+        path = scope.get("path", "")
+        method = scope.get("method", "")
 
         # Attach to Sentry scope and set common tags
-        _s = _import_sentry()
-        if _s:
+        if _SENTRY is not None:
             try:
                 release = os.getenv("RELEASE") or f"backend@{os.getenv('GIT_COMMIT','unknown')}"
-                with _s.configure_scope() as scope:  # type: ignore[attr-defined]
-                    scope.set_tag("request_id", req_id)
-                    scope.set_tag("endpoint", request.url.path)
-                    scope.set_tag("method", request.method)
+                with _SENTRY.configure_scope() as sentry_scope:
+                    sentry_scope.set_tag("request_id", req_id)
+                    sentry_scope.set_tag("endpoint", path)
+                    sentry_scope.set_tag("method", method)
                     if release:
-                        scope.set_tag("release", release)
+                        sentry_scope.set_tag("release", release)
             except Exception:
                 pass
 
         start_time = time.perf_counter()
-        status_code = 500
+        # Set from http.response.start; stays None if the app never started a response
+        status_code: Optional[int] = None
         error_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", req_id.encode("latin-1"))]
+            await send(message)
+
         try:
-            response: Response = await call_next(request)
-            status_code = response.status_code
-            try:
-                response.headers["X-Request-ID"] = req_id
-            except Exception:
-                pass
-            return response
-        except Exception as exc:  # Ensure we still log on exceptions
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:  # Ensure we still log on exceptions and cancellation
             error_code = type(exc).__name__
             raise
         finally:
-            duration_ms = (time.perf_counter() - start_time) * 1000.0
-            firestore_calls = firestore_calls_var.get()
-            firestore_total_ms = firestore_total_ms_var.get()
-            user_hash = user_id_hash_var.get() or ""
-            cache_hits = cache_hits_delta_var.get()
-            cache_misses = cache_misses_delta_var.get()
-
-            log_payload = {
-                "request_id": req_id,
-                "endpoint": request.url.path,
-                "method": request.method,
-                "status": status_code,
-                "latency_ms": round(duration_ms, 2),
-                "user_id_hash": user_hash,
-                "firestore_calls": firestore_calls,
-                "firestore_total_ms": round(firestore_total_ms, 2),
-                "cache_hits": cache_hits,
-                "cache_misses": cache_misses,
-                "error_code": error_code,
-            }
-
-            # Log as a single line JSON for easy ingestion by log processors
-            try:
-                logging.info(json.dumps(log_payload))
-            except Exception:
-                logging.info(f"[REQUEST] {log_payload}")
+            # Skip building and serializing the payload when INFO is filtered out
+            if _logger.isEnabledFor(logging.INFO):
+                duration_ms = (time.perf_counter() - start_time) * 1000.0
+                log_payload = {
+                    "request_id": req_id,
+                    "endpoint": path,
+                    "method": method,
+                    "status": status_code if status_code is not None else 500,
+                    "latency_ms": round(duration_ms, 2),
+                    "user_id_hash": metrics.user_id_hash,
+                    "firestore_calls": metrics.firestore_calls,
+                    "firestore_total_ms": round(metrics.firestore_total_ms, 2),
+                    "cache_hits": metrics.cache_hits,
+                    "cache_misses": metrics.cache_misses,
+                    "error_code": error_code,
+                }
+
+                # Log as a single line JSON for easy ingestion by log processors
+                try:
+                    _logger.info(_dumps(log_payload))
+                except Exception:
+                    _logger.info(f"[REQUEST] {log_payload}")
 
 
 def init_sentry_if_configured() -> None:
@@ -135,8 +171,7 @@ def init_sentry_if_configured() -> None:
     if not dsn:
         return
     try:
-        _s = _import_sentry()
-        if _s:
+        if _SENTRY is not None:
             # Lazy import integrations only if SDK present
             from sentry_sdk.integrations.fastapi import FastApiIntegration  # type: ignore
             from sentry_sdk.integrations.starlette import StarletteIntegration  # type: ignore
@@ -148,7 +183,7 @@ def init_sentry_if_configured() -> None:
             environment = os.getenv("SENTRY_ENVIRONMENT", "development")
             traces_rate = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.2"))
             profiles_rate = float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.0"))
-            _s.init(  # type: ignore[attr-defined]
+            _SENTRY.init(
                 dsn=dsn,
                 environment=environment,
                 release=release,
@@ -166,8 +201,8 @@ def init_sentry_if_configured() -> None:
 __all__ = [
     "ObservabilityMiddleware",
     "init_sentry_if_configured",
-    "request_id_var",
-    "user_id_hash_var",
+    "RequestMetrics",
+    "metrics_var",
     "set_user_id_for_request",
     "record_firestore_call",
     "add_cache_deltas",
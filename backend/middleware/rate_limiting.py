@@ -8,7 +8,12 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from fastapi import Request, Response
-import hashlib
+import zlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
 import logging
 import os
 
@@ -35,8 +40,9 @@ _DEFAULTS = {
     "health": "600/minute",
 }
 
-# Rate limiting configurations for different endpoint types (env-overridable)
-RATE_LIMITS = {
+# Rate limiting configurations for different endpoint types (env-overridable).
+# Normalized once at import and read-only afterwards; the decorators below are built from it.
+RATE_LIMITS = MappingProxyType({
     # Authentication endpoints
     "auth": _normalize_rate_string(os.getenv("RATE_LIMITS_AUTH", ""), _DEFAULTS["auth"]),
     
@@ -54,7 +60,15 @@ RATE_LIMITS = {
     
     # Health checks
     "health": _normalize_rate_string(os.getenv("RATE_LIMITS_HEALTH", ""), _DEFAULTS["health"]),
-}
+})
+
+@lru_cache(maxsize=4096)
+def _ua_fingerprint(ua: str) -> str:
+    """Short non-cryptographic User-Agent fingerprint; only used to split rate-limit keys."""
+    # Header values are latin-1 decoded, so UTF-8 encoding cannot fail
+    return f"{zlib.crc32(ua.encode('utf-8')):08x}"
+
+_NO_UA_FINGERPRINT = _ua_fingerprint("unknown")
 
 def get_client_identifier(request: Request) -> str:
     """
@@ -64,21 +78,101 @@ def get_client_identifier(request: Request) -> str:
     # Try to get real IP from headers (for reverse proxy setups)
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
-        # Take the first IP in the chain
-        client_ip = forwarded_for.split(',')[0].strip()
+        # Take the first IP in the chain without splitting every hop
+        comma = forwarded_for.find(",")
+        client_ip = (forwarded_for[:comma] if comma != -1 else forwarded_for).strip()
     else:
         client_ip = get_remote_address(request)
     
-    # Add user agent to make identifier more unique
-    ua = request.headers.get("User-Agent", "unknown")
-    try:
-        ua_hash = hashlib.sha256(ua.encode("utf-8")).hexdigest()[:8]
-    except Exception:
-        ua_hash = "noua"
-    return f"{client_ip}:{ua_hash}"
+    # Add user agent to make identifier more unique; clients without one share a key
+    ua = request.headers.get("User-Agent")
+    return f"{client_ip}:{_ua_fingerprint(ua) if ua is not None else _NO_UA_FINGERPRINT}"
+
+class _LocalLeaseLimiter:
+    """Front a shared-storage limits strategy with small per-process leases.
+
+    A key that is hit again within ``lease_secs`` of its last Redis round trip is
+    "hot": instead of one remote hit per request, the store is asked (without
+    consuming) whether ``batch`` more units fit, and if so up to ``batch`` requests
+    are admitted locally until the lease expires. The units actually spent are
+    flushed to the store as one hit when the lease ends, so unused credit is
+    never charged. Cold keys, and hot keys the store has no room for (near the
+    limit), fall back to exact per-request hits, so limits are never loosened by
+    more than ``batch`` requests per key per process.
+    """
+
+    def __init__(self, inner, batch: int, lease_secs: float, max_keys: int = 10000):
+        self._inner = inner
+        self._batch = batch
+        self._lease_secs = lease_secs
+        self._max_keys = max_keys
+        # key -> [remaining credit, lease expiry, last remote hit, spent unflushed units]
+        # (monotonic times)
+        self._leases: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, item, *identifiers, cost: int = 1) -> bool:
+        key = item.key_for(*identifiers)
+        now = time.monotonic()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease[1] > now and lease[0] >= cost:
+                lease[0] -= cost
+                lease[3] += cost
+                return True
+            # The lease is over: take what it admitted so exactly that is charged
+            spent = 0
+            if lease is not None:
+                spent, lease[0], lease[3] = lease[3], 0, 0
+            hot = lease is not None and now - lease[2] < self._lease_secs
+
+        if spent:
+            # Already admitted locally; record the real consumption in the shared window
+            self._inner.hit(item, *identifiers, cost=spent)
+
+        if hot and self._batch > cost and self._inner.test(item, *identifiers, cost=self._batch):
+            self._store(key, [self._batch - cost, now + self._lease_secs, now, cost])
+            return True
+
+        allowed = self._inner.hit(item, *identifiers, cost=cost)
+        self._store(key, [0, now + self._lease_secs, now, 0])
+        return allowed
+
+    def _store(self, key: str, lease: list) -> None:
+        with self._lock:
+            self._leases[key] = lease
+            self._leases.move_to_end(key)
+            while len(self._leases) > self._max_keys:
+                self._leases.popitem(last=False)
+
+    def __getattr__(self, name):
+        # test/get_window_stats/clear go straight to the shared store
+        return getattr(self._inner, name)
+
+
+# Counter storage. The default in-process store is per worker, so with N workers
+# each limit is effectively N times higher; point RATELIMIT_STORAGE_URI at Redis
+# (e.g. redis://host:6379/0) to share one sorted-set moving window across workers.
+RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://").strip() or "memory://"
+_SHARED_STORAGE = not RATELIMIT_STORAGE_URI.startswith("memory://")
+RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "moving-window" if _SHARED_STORAGE else "fixed-window")
 
 # Create limiter with custom key function
-limiter = Limiter(key_func=get_client_identifier)
+limiter = Limiter(
+    key_func=get_client_identifier,
+    storage_uri=RATELIMIT_STORAGE_URI,
+    strategy=RATELIMIT_STRATEGY,
+    # If the shared store is unreachable, keep limiting per process instead of failing requests
+    in_memory_fallback_enabled=_SHARED_STORAGE,
+    swallow_errors=_SHARED_STORAGE,
+)
+
+# With a shared store, hot clients spend locally leased batches instead of paying
+# a Redis round trip per request. RATELIMIT_LOCAL_BATCH=1 disables leasing.
+RATELIMIT_LOCAL_BATCH = int(os.getenv("RATELIMIT_LOCAL_BATCH", "10"))
+RATELIMIT_LOCAL_LEASE_SECS = float(os.getenv("RATELIMIT_LOCAL_LEASE_SECS", "1.0"))
+if _SHARED_STORAGE and RATELIMIT_LOCAL_BATCH > 1:
+    limiter._limiter = _LocalLeaseLimiter(limiter._limiter, RATELIMIT_LOCAL_BATCH, RATELIMIT_LOCAL_LEASE_SECS)
 
 def create_rate_limit_handler():
     """Create custom rate limit exceeded handler"""
@@ -116,30 +210,40 @@ def create_rate_limit_handler():
     
     return rate_limit_handler
 
-# Decorators for different rate limiting levels
+# Decorators for different rate limiting levels, built once at import.
+# Apply directly: @READ_RATE_LIMIT
+AUTH_RATE_LIMIT = limiter.limit(RATE_LIMITS["auth"])
+USER_RATE_LIMIT = limiter.limit(RATE_LIMITS["users"])
+READ_RATE_LIMIT = limiter.limit(RATE_LIMITS["read"])
+WRITE_RATE_LIMIT = limiter.limit(RATE_LIMITS["write"])
+BULK_RATE_LIMIT = limiter.limit(RATE_LIMITS["bulk"])
+HEALTH_RATE_LIMIT = limiter.limit(RATE_LIMITS["health"])
+
+# Accessors kept for routes that pass them to Depends(), which calls them on every
+# request; they now return the prebuilt decorator instead of re-parsing the limit.
 def auth_rate_limit():
     """Rate limit for authentication endpoints"""
-    return limiter.limit(RATE_LIMITS["auth"])
+    return AUTH_RATE_LIMIT
 
 def user_rate_limit():
     """Rate limit for user management endpoints"""
-    return limiter.limit(RATE_LIMITS["users"])
+    return USER_RATE_LIMIT
 
 def read_rate_limit():
     """Rate limit for read operations"""
-    return limiter.limit(RATE_LIMITS["read"])
+    return READ_RATE_LIMIT
 
 def write_rate_limit():
     """Rate limit for write operations"""
-    return limiter.limit(RATE_LIMITS["write"])
+    return WRITE_RATE_LIMIT
 
 def bulk_rate_limit():
     """Rate limit for bulk operations"""
-    return limiter.limit(RATE_LIMITS["bulk"])
+    return BULK_RATE_LIMIT
 
 def health_rate_limit():
     """Rate limit for health check endpoints"""
-    return limiter.limit(RATE_LIMITS["health"])
+    return HEALTH_RATE_LIMIT
 
 # Function to add rate limiting to FastAPI app
 def add_rate_limiting(app):
@@ -152,4 +256,9 @@ def add_rate_limiting(app):
     # Ensure middleware is added so limits actually apply
     app.add_middleware(SlowAPIMiddleware)
     
-    logging.info("Rate limiting middleware configured with limits: %s", RATE_LIMITS)
\ No newline at end of file
+    logging.info(
+        "Rate limiting middleware configured with limits: %s (storage=%s, strategy=%s)",
+        dict(RATE_LIMITS),
+        RATELIMIT_STORAGE_URI.split("://", 1)[0],
+        RATELIMIT_STRATEGY,
+    )
\ No newline at end of file
@@ -0,0 +1,372 @@
+"""
+Response cache for WooCombine read endpoints
+Serves repeat GETs of list/detail reads from a shared store instead of re-running
+Firestore reads, model construction and JSON encoding.
+"""
+
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Awaitable, Callable, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Off unless configured: "memory://" (per process) or "redis://host:6379/1" (shared;
+# run Redis with maxmemory-policy allkeys-lfu so hot reads survive eviction)
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "").strip()
+RESPONSE_CACHE_STALE_SECS = float(os.getenv("RESPONSE_CACHE_STALE_SECS", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+_TTL_SHORT = float(os.getenv("RESPONSE_CACHE_TTL_SHORT", "5"))
+_TTL_NORMAL = float(os.getenv("RESPONSE_CACHE_TTL_NORMAL", "15"))
+_TTL_LONG = float(os.getenv("RESPONSE_CACHE_TTL_LONG", "60"))
+
+# Cacheable GET routes and their freshness. Anything not listed (users/me,
+# evaluators, drafts, exports, ...) always goes to the handler.
+_CACHEABLE_ROUTES = tuple(
+    (re.compile(pattern), ttl)
+    for pattern, ttl in (
+        # Live scoring data: short
+        (r"/api/players", _TTL_SHORT),
+        (r"/api/rankings", _TTL_SHORT),
+        (r"/api/leagues/[^/]+/players", _TTL_SHORT),
+        (r"/api/leagues/[^/]+/events/[^/]+/stats", _TTL_SHORT),
+        (r"/api/events/[^/]+/stats", _TTL_SHORT),
+        (r"/api/batch/dashboard-data/[^/]+", _TTL_SHORT),
+        # Leagues/events: normal
+        (r"/api/leagues(/me)?", _TTL_NORMAL),
+        (r"/api/leagues/[^/]+", _TTL_NORMAL),
+        (r"/api/leagues/[^/]+/events(/[^/]+)?", _TTL_NORMAL),
+        (r"/api/leagues/[^/]+/events/[^/]+/(schema|custom-drills)", _TTL_NORMAL),
+        (r"/api/events/[^/]+/schema", _TTL_NORMAL),
+        # Static drill/sport definitions: long
+        (r"/api/drills(/[^/]+)?", _TTL_LONG),
+        (r"/api/schemas", _TTL_LONG),
+        (r"/api/sports/[^/]+/schema", _TTL_LONG),
+    )
+)
+
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# POST routes that only read; they must not invalidate every cached entry
+_READ_ONLY_WRITES = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"/api/batch/[^/]+",
+        r"/api/evaluators/verify",
+        r"/api/leagues/[^/]+/events/[^/]+/import/preview",
+        r"/api/leagues/[^/]+/events/[^/]+/delete-intent-token",
+    )
+)
+
+# Handler headers that are per-response and never replayed from an entry
+_UNCACHED_HEADERS = (b"content-length", b"set-cookie", b"x-cache")
+
+
+def _ttl_for(path: str) -> Optional[float]:
+    for pattern, ttl in _CACHEABLE_ROUTES:
+        if pattern.fullmatch(path):
+            return ttl
+    return None
+
+
+def _encode_headers(headers: List[Tuple[bytes, bytes]]) -> bytes:
+    return json.dumps([
+        [name.decode("latin-1"), value.decode("latin-1")]
+        for name, value in headers
+        if name.lower() not in _UNCACHED_HEADERS
+    ]).encode("latin-1")
+
+
+def _decode_headers(raw: bytes) -> List[Tuple[bytes, bytes]]:
+    return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(raw)]
+
+
+def _etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    candidates = {tag.strip().removeprefix(b"W/") for tag in if_none_match.split(b",")}
+    return etag.removeprefix(b"W/") in candidates or b"*" in candidates
+
+
+async def _authenticate_bearer(authorization: bytes) -> None:
+    """Run the same checks as get_current_user; raises HTTPException on failure."""
+    from fastapi.security import HTTPAuthorizationCredentials
+    from ..auth import get_current_user
+
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    await get_current_user(None, HTTPAuthorizationCredentials(scheme=scheme, credentials=token.strip()))
+
+
+class _MemoryStore:
+    """Per-process LRU of entries; each entry is dropped once its stale window ends."""
+
+    def __init__(self, max_entries: int):
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._max_entries = max_entries
+        self._generation = 0
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def bump(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def get(self, key: str) -> Optional[dict]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        entry, expires = item
+        if expires <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: dict, retain_secs: float) -> None:
+        self._entries[key] = (entry, time.time() + retain_secs)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class _RedisStore:
+    """Entries as Redis hashes (body, status, headers, generated_at, stale_at)."""
+
+    _GENERATION_KEY = "resp:gen"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis_asyncio  # optional dependency
+
+        self._redis = redis_asyncio.from_url(url)
+
+    async def generation(self) -> int:
+        return int(await self._redis.get(self._GENERATION_KEY) or 0)
+
+    async def bump(self) -> None:
+        await self._redis.incr(self._GENERATION_KEY)
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.hgetall(key)
+        if not raw or b"headers" not in raw:
+            return None
+        return {
+            "body": raw[b"body"],
+            "status": int(raw[b"status"]),
+            "headers": raw[b"headers"],
+            "generated_at": float(raw[b"generated_at"]),
+            "stale_at": float(raw[b"stale_at"]),
+        }
+
+    async def set(self, key: str, entry: dict, retain_secs: float) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=entry)
+            pipe.expire(key, max(1, int(retain_secs)))
+            await pipe.execute()
+
+
+def _create_store(url: str):
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        # Invalidation only reaches the worker that handled the write, so other
+        # workers would keep replaying old bodies; refuse rather than serve them
+        workers = int(os.getenv("WEB_CONCURRENCY", "1") or 1)
+        if workers > 1:
+            logging.warning(
+                f"[CACHE] RESPONSE_CACHE_URL=memory:// is per process but WEB_CONCURRENCY={workers}; "
+                "response cache disabled (use redis:// with multiple workers)"
+            )
+            return None
+        return _MemoryStore(RESPONSE_CACHE_MAX_ENTRIES)
+    try:
+        return _RedisStore(url)
+    except ImportError:
+        logging.warning("[CACHE] RESPONSE_CACHE_URL is set but the redis package is not installed; response cache disabled")
+        return None
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache successful GET responses of read endpoints per caller.
+
+    Entries are keyed by path, query and a hash of the Authorization header, so a
+    cached body is only ever replayed to the credential that produced it, and
+    that credential is re-authenticated before every replay so revoked, expired
+    or disabled callers fall through to the handler. Any successful write bumps
+    a store-wide generation that is part of every key. With a Redis store that
+    keeps read-your-writes across workers; ``memory://`` only clears its own
+    process, so it is refused when WEB_CONCURRENCY is above 1. Known read-only POSTs (batch reads, code
+    verification, import previews) do not bump it. If the handler fails (5xx or an exception)
+    and an entry for the key is within its stale window, the stale body is
+    served instead. Responses marked ``Cache-Control: no-store`` are never
+    stored. Handler headers (ETag, Cache-Control, ...) are replayed with
+    the body, and a matching If-None-Match on a hit gets a 304.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store=None,
+        authenticate: Optional[Callable[[bytes], Awaitable[None]]] = None,
+    ) -> None:
+        self.app = app
+        self.store = store if store is not None else _create_store(RESPONSE_CACHE_URL)
+        self.authenticate = authenticate or _authenticate_bearer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.store is None:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method not in _READ_METHODS:
+            if any(pattern.fullmatch(scope["path"]) for pattern in _READ_ONLY_WRITES):
+                await self.app(scope, receive, send)
+            else:
+                await self._call_write(scope, receive, send)
+            return
+
+        ttl = _ttl_for(scope["path"]) if method == "GET" else None
+        if ttl is None:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = b""
+        if_none_match = b""
+        bypass = False
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+            elif name == b"if-none-match":
+                if_none_match = value
+            elif name == b"cache-control" and b"no-cache" in value:
+                bypass = True
+
+        entry = None
+        key = None
+        try:
+            generation = await self.store.generation()
+            principal = sha256(authorization).hexdigest()[:32] if authorization else "anon"
+            key = f"resp:{generation}:{scope['path']}?{scope.get('query_string', b'').decode('latin-1')}:{principal}"
+            entry = await self.store.get(key)
+        except Exception as e:
+            logging.warning(f"[CACHE] Lookup failed, serving uncached: {e}")
+
+        now = time.time()
+        if entry is not None and not bypass and now - entry["generated_at"] < ttl:
+            if await self._may_replay(authorization):
+                await self._send_entry(send, entry, b"HIT", if_none_match)
+                return
+            # The credential no longer authenticates: let the handler answer
+            entry = None
+
+        start_message: Optional[Message] = None
+        chunks = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, capture)
+        except Exception:
+            if entry is not None and now < entry["stale_at"] and await self._may_replay(authorization):
+                logging.warning(f"[CACHE] Handler failed for {scope['path']}; serving stale response")
+                await self._send_entry(send, entry, b"STALE")
+                return
+            raise
+
+        status = start_message["status"] if start_message else 500
+        if status >= 500 and entry is not None and now < entry["stale_at"] and await self._may_replay(authorization):
+            logging.warning(f"[CACHE] Handler returned {status} for {scope['path']}; serving stale response")
+            await self._send_entry(send, entry, b"STALE")
+            return
+
+        body = b"".join(chunks)
+        headers = list(start_message.get("headers", [])) if start_message else []
+        # Handlers mark partial or failed results no-store; those are never
+        # cached, so they can't come back as a hit or a stale fallback either
+        no_store = any(n.lower() == b"cache-control" and b"no-store" in v.lower() for n, v in headers)
+        if status == 200 and key is not None and not no_store:
+            new_entry = {
+                "body": body,
+                "status": status,
+                "headers": _encode_headers(headers),
+                "generated_at": now,
+                "stale_at": now + ttl + RESPONSE_CACHE_STALE_SECS,
+            }
+            try:
+                await self.store.set(key, new_entry, ttl + RESPONSE_CACHE_STALE_SECS)
+            except Exception as e:
+                logging.warning(f"[CACHE] Store failed: {e}")
+            headers.append((b"x-cache", b"MISS"))
+
+        if start_message is None:
+            return
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _call_write(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        if status_code is not None and status_code < 400:
+            try:
+                await self.store.bump()
+            except Exception as e:
+                logging.warning(f"[CACHE] Invalidation failed: {e}")
+
+    async def _may_replay(self, authorization: bytes) -> bool:
+        """Entries for anonymous callers replay freely; others must still authenticate."""
+        if not authorization:
+            return True
+        try:
+            await self.authenticate(authorization)
+            return True
+        except Exception as e:
+            logging.info(f"[CACHE] Not replaying cached response: {getattr(e, 'detail', e)}")
+            return False
+
+    @staticmethod
+    async def _send_entry(send: Send, entry: dict, state: bytes, if_none_match: bytes = b"") -> None:
+        headers = _decode_headers(entry["headers"])
+        etag = next((v for n, v in headers if n.lower() == b"etag"), None)
+        if etag is not None and if_none_match and _etag_matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(n, v) for n, v in headers if n.lower() != b"content-type"] + [(b"x-cache", state)],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = entry["body"]
+        await send({
+            "type": "http.response.start",
+            "status": entry["status"],
+            "headers": headers + [
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"x-cache", state),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def add_response_cache_middleware(app):
+    """Add the response cache; call before other middlewares so it sits next to the routes."""
+    app.add_middleware(ResponseCacheMiddleware)
+    if RESPONSE_CACHE_URL:
+        logging.info(f"Response cache configured (store={RESPONSE_CACHE_URL.split('://', 1)[0]})")
@@ -4,131 +4,188 @@ Implements security headers and policies to protect against common attacks
 """
 
 from fastapi import Request, Response
-from starlette.responses import Response as StarletteResponse, RedirectResponse
+from urllib.parse import quote
+from starlette.types import Message, Receive, Scope, Send
+from typing import Optional
+from functools import lru_cache
 import os
-from starlette.middleware.base import BaseHTTPMiddleware
+import re
 import logging
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+_SUSPICIOUS_PATH_PATTERNS = [
+    '../',  # Path traversal
+    '..\\',  # Windows path traversal
+    '/etc/',  # Linux system files
+    '/proc/',  # Linux process files
+    'wp-admin',  # WordPress admin
+    'phpMyAdmin',  # phpMyAdmin
+    '.php',  # PHP files
+    '.asp',  # ASP files
+    '.jsp',  # JSP files
+    'sql-injection',  # SQL injection attempts
+    '<script',  # XSS attempts
+    'javascript:',  # JavaScript injection
+]
+
+_SUSPICIOUS_AGENTS = [
+    'bot',
+    'crawler',
+    'spider',
+    'scraper',
+    'scanner',
+    'curl',
+    'wget',
+    'python-requests',
+    'postman'
+]
+
+# Allow legitimate browsers and our test tools
+_ALLOWED_AGENTS = [
+    'mozilla',
+    'chrome',
+    'safari',
+    'firefox',
+    'edge',
+    'jest',
+    'testing'
+]
+
+
+def _literal_alternation(literals):
+    # One case-insensitive scan in C instead of lower() plus a Python loop of `in` checks
+    return re.compile("|".join(re.escape(p) for p in literals), re.IGNORECASE)
+
+
+_SUSPICIOUS_PATH_RE = _literal_alternation(_SUSPICIOUS_PATH_PATTERNS)
+_SUSPICIOUS_UA_RE = _literal_alternation(_SUSPICIOUS_AGENTS)
+_ALLOWED_UA_RE = _literal_alternation(_ALLOWED_AGENTS)
+
+
+def _scan_headers(scope: Scope):
+    """Single pass over raw ASGI headers for the values these middlewares need.
+
+    Returns (host, x-forwarded-proto, user-agent, content-length) as str or None;
+    the first occurrence wins, as with Request.headers.get.
+    """
+    host = forwarded_proto = user_agent = content_length = None
+    for key, value in scope["headers"]:
+        if key == b"host":
+            if host is None:
+                host = value.decode("latin-1")
+        elif key == b"x-forwarded-proto":
+            if forwarded_proto is None:
+                forwarded_proto = value.decode("latin-1")
+        elif key == b"user-agent":
+            if user_agent is None:
+                user_agent = value.decode("latin-1")
+        elif key == b"content-length":
+            if content_length is None:
+                content_length = value.decode("latin-1")
+    return host, forwarded_proto, user_agent, content_length
+
+
+# Characters RedirectResponse leaves unquoted in a Location URL
+_REDIRECT_SAFE_CHARS = ":/%#?=@[]!$&'()*+,;"
+
+
+def _header_names(headers):
+    """Lower-case names an _merge_headers call replaces (the given headers plus Server)"""
+    return frozenset(name for name, _ in headers) | {b"server"}
+
+
+def _merge_headers(message, new_headers, replaced=None):
+    """Replace/append raw (bytes, bytes) headers on an http.response.start message.
+
+    Any existing Server header is dropped as well. Pass ``replaced`` (from
+    _header_names) when new_headers is a precomputed list.
+    """
+    if replaced is None:
+        replaced = _header_names(new_headers)
+    headers = [
+        (name, value) for name, value in message.get("headers", []) if name.lower() not in replaced
+    ]
+    headers.extend(new_headers)
+    message["headers"] = headers
+
+
+# Hot, latency-sensitive endpoints (onboarding and health probes) that both
+# middlewares fast-path: minimal headers and no request validation
+_AUTH_FAST_PATHS = frozenset({'/api/users/me', '/api/warmup', '/api/health', '/health'})
+_AUTH_FAST_PREFIX = '/api/leagues/me'
+
+
+# Public GETs whose body is the same for every caller; a CDN may serve repeats
+# without the request reaching the app at all. Health checks are left out: they
+# must reflect live dependency state, not an edge copy.
+_CACHEABLE_GETS = frozenset({'/api', '/api/meta', '/security.txt', '/.well-known/security.txt'})
+
+
+def _is_auth_fast_path(path: str) -> bool:
+    return path in _AUTH_FAST_PATHS or path.startswith(_AUTH_FAST_PREFIX)
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all responses
     """
     
+    # PERFORMANCE OPTIMIZATION: Skip heavy header processing for auth endpoints
+    # that are called frequently during onboarding
+    AUTH_ENDPOINT_PATHS = _AUTH_FAST_PATHS
+    
     def __init__(self, app, config=None):
-        super().__init__(app)
+        self.app = app
         self.config = config or {}
         
-    async def dispatch(self, request: Request, call_next):
-        # Let CORSMiddleware own all CORS behavior (avoid duplicate/conflicting headers)
-        # Still handle OPTIONS by passing through; CORSMiddleware will reply appropriately
-
-        # Enforce HTTPS in production-like environments (skip localhost and health checks)
-        try:
-            force_https_env = os.getenv("FORCE_HTTPS", "true").lower() in ("1", "true", "yes")
-            forwarded_proto = request.headers.get("x-forwarded-proto", request.url.scheme)
-            hostname = (request.url.hostname or request.headers.get("host", "").split(":")[0]).lower()
-            is_localhost = hostname in ("localhost", "127.0.0.1")
-            is_health = request.url.path in ("/health", "/api/health")
-            if force_https_env and not is_localhost and not is_health and forwarded_proto == "http" and request.url.scheme == "http":
-                https_url = str(request.url).replace("http://", "https://", 1)
-                return RedirectResponse(url=https_url, status_code=308)
-        except Exception:
-            # Never block requests if redirect computation fails
-            pass
-
-        # PERFORMANCE OPTIMIZATION: Skip heavy header processing for auth endpoints
-        # that are called frequently during onboarding
-        is_auth_endpoint = (
-            request.url.path in ['/api/users/me', '/api/warmup', '/api/health'] or
-            request.url.path.startswith('/api/leagues/me')
-        )
-        
-        response = await call_next(request)
-        
-        if is_auth_endpoint:
-            # Minimal headers for auth endpoints (faster processing)
-            response.headers["X-API-Version"] = "1.0.2"
-            response.headers["X-Content-Type-Options"] = "nosniff"
-            if "Server" in response.headers:
-                del response.headers["Server"]
-        else:
-            # Full security headers for other endpoints
-            self.add_security_headers(response, request)
+        # Minimal headers for auth endpoints (faster processing)
+        self._minimal_headers = [
+            (b"x-api-version", b"1.0.2"),
+            (b"x-content-type-options", b"nosniff"),
+        ]
+        self._minimal_header_names = _header_names(self._minimal_headers)
         
-        return response
-    
-    def add_security_headers(self, response: Response, request: Request):
-        """Add comprehensive security headers"""
+        # Env-derived settings are fixed for the process lifetime; read them once
+        self._force_https = os.getenv("FORCE_HTTPS", "true").lower() in ("1", "true", "yes")
+        self._public_cache_header = (
+            b"cache-control",
+            os.getenv("PUBLIC_CACHE_CONTROL", "public, max-age=30, stale-while-revalidate=60, stale-if-error=300").encode("latin-1"),
+        )
         
         # Content Security Policy - Protect against XSS (report-only in staging)
         env = os.getenv("ENVIRONMENT", "").lower()
         report_only = os.getenv("CSP_REPORT_ONLY", "false").lower() in ("1", "true", "yes") or env == "staging"
-
-        # Derive backend origin for connect-src if not provided
-        request_origin = f"{request.url.scheme}://{request.url.netloc}" if getattr(request, "url", None) else ""
-
+        self._csp_header_name = b"content-security-policy-report-only" if report_only else b"content-security-policy"
+        
         # Determine whether to allow inline scripts (only if absolutely required, e.g., Vite in dev)
         allow_unsafe_inline_scripts = os.getenv("CSP_ALLOW_UNSAFE_INLINE_SCRIPTS", "false").lower() in ("1", "true", "yes")
-
         script_src_values = ["'self'"] + (["'unsafe-inline'"] if allow_unsafe_inline_scripts else [])
         style_src_values = ["'self'", "'unsafe-inline'"]
         img_src_values = ["'self'", "data:"]
-
-        # Build connect-src: always include 'self' and backend origin; allow Firebase endpoints by default
-        connect_src_values = ["'self'"]
-        if request_origin:
-            connect_src_values.append(request_origin)
-        # Additional connect-src from env (comma-separated)
-        extra_connect = [v.strip() for v in os.getenv("CSP_CONNECT_SRC", "").split(",") if v.strip()]
-        connect_src_values.extend(extra_connect)
-        # Common Firebase endpoints (frontend may call them)
-        connect_src_values.extend([
-            "https://*.googleapis.com",
-            "https://*.firebaseio.com",
-            "wss://*.firebaseio.com",
-        ])
-
-        csp_directives = [
+        self._csp_head = [
             "default-src 'self'",
             f"script-src {' '.join(script_src_values)}",
             f"style-src {' '.join(style_src_values)}",
             f"img-src {' '.join(img_src_values)}",
             "object-src 'none'",
             "base-uri 'none'",
-            f"connect-src {' '.join(dict.fromkeys(connect_src_values))}",  # dedupe while preserving order
-            "frame-ancestors 'none'",
         ]
-
+        # Additional connect-src from env (comma-separated), then common Firebase endpoints (frontend may call them)
+        self._csp_connect_tail = [v.strip() for v in os.getenv("CSP_CONNECT_SRC", "").split(",") if v.strip()] + [
+            "https://*.googleapis.com",
+            "https://*.firebaseio.com",
+            "wss://*.firebaseio.com",
+        ]
+        self._csp_tail = ["frame-ancestors 'none'"]
         # Optional reporting endpoint
         report_uri = os.getenv("CSP_REPORT_URI")
         if report_uri:
-            csp_directives.append(f"report-uri {report_uri}")
-
-        csp_header_name = "Content-Security-Policy-Report-Only" if report_only else "Content-Security-Policy"
-        response.headers[csp_header_name] = "; ".join(csp_directives)
-        
-        # X-Frame-Options - Protect against clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
+            self._csp_tail.append(f"report-uri {report_uri}")
+        # Only the backend origin and scheme vary per request, and production sees a
+        # handful of them: build each full header list (and its names) once
+        self._csp_for_origin = lru_cache(maxsize=32)(self._build_csp)
+        self._header_set_for = lru_cache(maxsize=64)(self._build_header_set)
         
-        # X-Content-Type-Options - Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # X-XSS-Protection - legacy header; harmless for older browsers
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Referrer-Policy - Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Strict-Transport-Security - Enforce HTTPS (consider proxy headers)
-        forwarded_proto = None
-        try:
-            forwarded_proto = request.headers.get("x-forwarded-proto", None)
-        except Exception:
-            forwarded_proto = None
-        if request.url.scheme == "https" or (forwarded_proto and forwarded_proto.lower() == "https"):
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-        
-        # Permissions-Policy - Control browser features
+        # Request-independent security headers, encoded once
         permissions_policies = [
             "accelerometer=()",
             "camera=()",
@@ -139,137 +196,231 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "payment=()",
             "usb=()"
         ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions_policies)
+        self._static_headers = [
+            # X-Frame-Options - Protect against clickjacking
+            (b"x-frame-options", b"DENY"),
+            # X-Content-Type-Options - Prevent MIME type sniffing
+            (b"x-content-type-options", b"nosniff"),
+            # X-XSS-Protection - legacy header; harmless for older browsers
+            (b"x-xss-protection", b"1; mode=block"),
+            # Referrer-Policy - Control referrer information
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+            # Permissions-Policy - Control browser features
+            (b"permissions-policy", ", ".join(permissions_policies).encode("latin-1")),
+            # Add custom security header for API identification
+            (b"x-api-version", b"1.0.2"),
+            (b"x-security-headers", b"enabled"),
+        ]
+        
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        await self._dispatch(scope, receive, send, _scan_headers(scope), _is_auth_fast_path(path))
+    
+    async def _dispatch(self, scope: Scope, receive: Receive, send: Send, scanned, is_auth_endpoint: bool) -> None:
+        """HTTPS redirect + header injection, given pre-scanned headers (see _scan_headers)"""
+        # Let CORSMiddleware own all CORS behavior (avoid duplicate/conflicting headers)
+        # Still handle OPTIONS by passing through; CORSMiddleware will reply appropriately
+        host, forwarded_proto, _, _ = scanned
+        path = scope["path"]
+        
+        # Enforce HTTPS in production-like environments (skip localhost and health checks)
+        # Cheap scope/header checks first; the URL is only built for requests being redirected
+        try:
+            if (
+                self._force_https
+                and scope.get("scheme") == "http"
+                and (forwarded_proto or "http") == "http"
+                and path not in ("/health", "/api/health")
+            ):
+                url = Request(scope).url
+                hostname = (url.hostname or (host or "").split(":")[0]).lower()
+                if hostname not in ("localhost", "127.0.0.1"):
+                    https_url = str(url.replace(scheme="https"))
+                    # Bare 308 sent directly; same quoting as RedirectResponse
+                    location = quote(https_url, safe=_REDIRECT_SAFE_CHARS).encode("latin-1")
+                    await send({
+                        "type": "http.response.start",
+                        "status": 308,
+                        "headers": [(b"location", location), (b"content-length", b"0")],
+                    })
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+        except Exception:
+            # Never block requests if redirect computation fails
+            pass
+        
+        is_cacheable = path in _CACHEABLE_GETS and scope["method"] == "GET"
         
-        # Remove server information
-        if "Server" in response.headers:
-            del response.headers["Server"]
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if is_auth_endpoint:
+                    _merge_headers(message, self._minimal_headers, self._minimal_header_names)
+                else:
+                    # Full security headers for other endpoints
+                    _merge_headers(message, *self._header_set(scope, host, forwarded_proto))
+                # Edge-cacheable only on success and when the route set no policy of its own
+                if is_cacheable and message["status"] == 200 and not any(
+                    name.lower() == b"cache-control" for name, _ in message["headers"]
+                ):
+                    message["headers"].append(self._public_cache_header)
+            await send(message)
         
-        # Add custom security header for API identification
-        response.headers["X-API-Version"] = "1.0.2"
-        response.headers["X-Security-Headers"] = "enabled"
+        await self.app(scope, receive, send_wrapper)
+    
+    def _build_csp(self, request_origin: str) -> bytes:
+        """Render the CSP value for one backend origin (memoized per origin in __init__)"""
+        # Build connect-src: always include 'self' and backend origin; allow Firebase endpoints by default
+        connect_src_values = ["'self'"]
+        if request_origin:
+            connect_src_values.append(request_origin)
+        connect_src_values.extend(self._csp_connect_tail)
+        csp_directives = self._csp_head + [
+            f"connect-src {' '.join(dict.fromkeys(connect_src_values))}",  # dedupe while preserving order
+        ] + self._csp_tail
+        return "; ".join(csp_directives).encode("latin-1")
+    
+    def _build_header_set(self, request_origin: str, is_https: bool):
+        """Full header list and replaced names for one (origin, https) pair (memoized in __init__)"""
+        headers = [(self._csp_header_name, self._csp_for_origin(request_origin))]
+        headers.extend(self._static_headers)
+        # Strict-Transport-Security - Enforce HTTPS
+        if is_https:
+            headers.append((b"strict-transport-security", b"max-age=31536000; includeSubDomains; preload"))
+        return headers, _header_names(headers)
+    
+    def _header_set(self, scope: Scope, host: Optional[str], forwarded_proto: Optional[str]):
+        scheme = scope.get("scheme", "http")
+        # Derive backend origin for connect-src (Host header, else the server address)
+        request_origin = f"{scheme}://{host}" if host else f"{scheme}://{Request(scope).url.netloc}"
+        # Consider proxy headers for HSTS
+        is_https = scheme == "https" or bool(forwarded_proto and forwarded_proto.lower() == "https")
+        return self._header_set_for(request_origin, is_https)
+    
+    def security_headers(self, request: Request):
+        """Build the comprehensive security header list for a response"""
+        headers, _ = self._header_set(request.scope, request.headers.get("host"), request.headers.get("x-forwarded-proto"))
+        return list(headers)
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class RequestValidationMiddleware:
     """
     Middleware for request validation and security checks
     """
     
+    # PERFORMANCE OPTIMIZATION: Skip validation for auth endpoints to reduce latency
+    AUTH_ENDPOINT_PATHS = _AUTH_FAST_PATHS
+    
     def __init__(self, app, config=None):
-        super().__init__(app)
+        self.app = app
         self.config = config or {}
         self.max_request_size = self.config.get('max_request_size', 10 * 1024 * 1024)  # 10MB
         
-    async def dispatch(self, request: Request, call_next):
-        # PERFORMANCE OPTIMIZATION: Skip validation for auth endpoints to reduce latency
-        is_auth_endpoint = (
-            request.url.path in ['/api/users/me', '/api/warmup', '/api/health', '/health'] or
-            request.url.path.startswith('/api/leagues/me')
-        )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        is_auth_endpoint = _is_auth_fast_path(scope["path"])
         
         if not is_auth_endpoint:
             # Full validation for non-auth endpoints
-            # Validate request size
-            if hasattr(request, 'headers'):
-                content_length = request.headers.get('content-length')
-                if content_length and int(content_length) > self.max_request_size:
-                    logging.warning(f"Request too large: {content_length} bytes from {request.client}")
-                    return Response(
-                        content="Request too large",
-                        status_code=413,
-                        headers={"Content-Type": "text/plain"}
-                    )
-            
-            # Validate request path for suspicious patterns
-            if self.is_suspicious_path(request.url.path):
-                logging.warning(f"Suspicious request path: {request.url.path} from {request.client}")
-                return Response(
-                    content="Invalid request",
-                    status_code=400,
-                    headers={"Content-Type": "text/plain"}
-                )
-            
-            # Validate user agent (basic bot detection)
-            user_agent = request.headers.get('user-agent', '')
-            if self.is_suspicious_user_agent(user_agent):
-                logging.warning(f"Suspicious user agent: {user_agent} from {request.client}")
-                return Response(
-                    content="Invalid request",
-                    status_code=400,
-                    headers={"Content-Type": "text/plain"}
-                )
+            rejection = self.validate(scope)
+            if rejection is not None:
+                await rejection(scope, receive, send)
+                return
         
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
+    
+    def validate(self, scope: Scope, scanned=None) -> Optional[Response]:
+        """Return an error response for invalid requests, or None to continue"""
+        _, _, user_agent, content_length = scanned or _scan_headers(scope)
+        client = scope.get("client")
+        
+        # Validate request size
+        if content_length and int(content_length) > self.max_request_size:
+            logging.warning(f"Request too large: {content_length} bytes from {client}")
+            return Response(
+                content="Request too large",
+                status_code=413,
+                headers={"Content-Type": "text/plain"}
+            )
+        
+        # Validate request path for suspicious patterns
+        path = scope["path"]
+        if self.is_suspicious_path(path):
+            logging.warning(f"Suspicious request path: {path} from {client}")
+            return Response(
+                content="Invalid request",
+                status_code=400,
+                headers={"Content-Type": "text/plain"}
+            )
+        
+        # Validate user agent (basic bot detection)
+        user_agent = user_agent or ''
+        if self.is_suspicious_user_agent(user_agent):
+            logging.warning(f"Suspicious user agent: {user_agent} from {client}")
+            return Response(
+                content="Invalid request",
+                status_code=400,
+                headers={"Content-Type": "text/plain"}
+            )
+        
+        return None
     
     def is_suspicious_path(self, path: str) -> bool:
         """Check if the request path contains suspicious patterns"""
-        suspicious_patterns = [
-            '../',  # Path traversal
-            '..\\',  # Windows path traversal
-            '/etc/',  # Linux system files
-            '/proc/',  # Linux process files
-            'wp-admin',  # WordPress admin
-            'phpMyAdmin',  # phpMyAdmin
-            '.php',  # PHP files
-            '.asp',  # ASP files
-            '.jsp',  # JSP files
-            'sql-injection',  # SQL injection attempts
-            '<script',  # XSS attempts
-            'javascript:',  # JavaScript injection
-        ]
-        
-        path_lower = path.lower()
-        return any(pattern in path_lower for pattern in suspicious_patterns)
+        return _SUSPICIOUS_PATH_RE.search(path) is not None
     
     def is_suspicious_user_agent(self, user_agent: str) -> bool:
         """Check if the user agent appears suspicious"""
         if not user_agent or len(user_agent) < 10:
             return True
         
-        suspicious_agents = [
-            'bot',
-            'crawler',
-            'spider',
-            'scraper',
-            'scanner',
-            'curl',
-            'wget',
-            'python-requests',
-            'postman'
-        ]
-        
-        # Allow legitimate browsers and our test tools
-        allowed_agents = [
-            'mozilla',
-            'chrome',
-            'safari',
-            'firefox',
-            'edge',
-            'jest',
-            'testing'
-        ]
-        
-        user_agent_lower = user_agent.lower()
-        
         # If it contains allowed agent, it's okay
-        if any(agent in user_agent_lower for agent in allowed_agents):
+        if _ALLOWED_UA_RE.search(user_agent):
             return False
         
         # If it contains suspicious agent, it's suspicious
-        return any(agent in user_agent_lower for agent in suspicious_agents)
+        return _SUSPICIOUS_UA_RE.search(user_agent) is not None
+
+class CombinedSecurityMiddleware(SecurityHeadersMiddleware):
+    """
+    Request validation and security headers in a single middleware frame.
+    Headers are scanned and the auth fast path is decided once for both.
+    """
+    
+    def __init__(self, app, config=None):
+        super().__init__(app, config)
+        self._validator = RequestValidationMiddleware(app, config)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        scanned = _scan_headers(scope)
+        is_auth_endpoint = _is_auth_fast_path(scope["path"])
+        
+        if not is_auth_endpoint:
+            rejection = self._validator.validate(scope, scanned)
+            if rejection is not None:
+                await rejection(scope, receive, send)
+                return
+        
+        await self._dispatch(scope, receive, send, scanned, is_auth_endpoint)
 
 def add_security_middleware(app, config=None):
     """
-    Add security middleware to FastAPI app
+    Add security middleware (request validation + headers, fused) to FastAPI app
     
     Args:
         app: FastAPI application instance
         config: Optional configuration dictionary
     """
-    # Retained for backward compatibility: keep behavior but log deprecation
-    logging.warning("add_security_middleware is deprecated. Use add_security_headers_middleware and add_request_validation_middleware to control ordering.")
-    app.add_middleware(SecurityHeadersMiddleware, config=config)
-    app.add_middleware(RequestValidationMiddleware, config=config)
+    app.add_middleware(CombinedSecurityMiddleware, config=config)
     logging.info("Security middleware (headers + request validation) configured")
 
 def add_security_headers_middleware(app, config=None):
@@ -2,9 +2,45 @@
 # See the approved Firestore schema for collections and document structure.
 
 from pydantic import BaseModel, Field, model_validator
+from pydantic.dataclasses import dataclass
 from typing import Optional, Any, Dict, List
 from datetime import datetime
 
+# Legacy football drill fields mirrored to/from PlayerSchema.scores: (field name, scores key)
+_LEGACY_SCORE_FIELDS = (
+    ("drill_40m_dash", "40m_dash"),
+    ("vertical_jump", "vertical_jump"),
+    ("catching", "catching"),
+    ("throwing", "throwing"),
+    ("agility", "agility"),
+)
+
+_PLAYER_STR_FIELDS = ("id", "name", "age_group", "photo_url", "event_id", "created_at", "external_id")
+_PLAYER_FLOAT_FIELDS = ("drill_40m_dash", "40m_dash", "vertical_jump", "catching", "throwing", "agility", "composite_score")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _has_player_types(data: Dict[str, Any]) -> bool:
+    """Cheap check that a player document already has PlayerSchema's types."""
+    number = data.get("number")
+    if number is not None and (not isinstance(number, int) or isinstance(number, bool)):
+        return False
+    scores = data.get("scores")
+    if scores is not None and (
+        not isinstance(scores, dict) or not all(_is_number(v) for v in scores.values())
+    ):
+        return False
+    if any(data.get(f) is not None and not _is_number(data[f]) for f in _PLAYER_FLOAT_FIELDS):
+        return False
+    return all(data.get(f) is None or isinstance(data[f], str) for f in _PLAYER_STR_FIELDS)
+
+# Fixed-shape read schemas are slotted Pydantic dataclasses: no per-instance
+# __dict__, same validation. Keyword-only, as with BaseModel construction.
+_read_schema = dataclass(slots=True, kw_only=True)
+
 # Pydantic schemas for API responses
 class PlayerSchema(BaseModel):
     id: str  # Firestore document ID
@@ -41,49 +77,42 @@ class PlayerSchema(BaseModel):
         Ensures older clients see fields, and newer logic sees map.
         Updates __dict__ directly to avoid recursion from validate_assignment.
         """
-        # 1. Map Legacy Fields -> Scores Map (if scores is empty/incomplete)
-        legacy_map = {
-            "40m_dash": self.drill_40m_dash,
-            "vertical_jump": self.vertical_jump,
-            "catching": self.catching,
-            "throwing": self.throwing,
-            "agility": self.agility
-        }
-        
-        # Update scores map if needed
-        scores_updated = False
-        for key, value in legacy_map.items():
-            if value is not None and key not in self.scores:
-                self.scores[key] = value
-                scores_updated = True
-        
-        # If we updated scores via self.scores[...] assignment, that's safe because 
-        # 'scores' is a mutable dict, not a field assignment on self (unless we replaced the whole dict)
-        # But to be safe, let's ensure we are working with the dict reference
-        
-        # 2. Map Scores Map -> Legacy Fields (for backward compatibility)
-        # Use direct __dict__ access to bypass validation hooks
-        legacy_keys = {
-            "40m_dash": "drill_40m_dash",
-            "vertical_jump": "vertical_jump",
-            "catching": "catching",
-            "throwing": "throwing",
-            "agility": "agility"
-        }
-        
-        for score_key, field_name in legacy_keys.items():
-            if score_key in self.scores:
-                val = self.scores[score_key]
-                # Only update if different to be idempotent
-                if getattr(self, field_name) != val:
-                    self.__dict__[field_name] = val
-                    # Also update private attributes if Pydantic uses them (V2 uses __dict__ usually)
-                    # Note: In Pydantic V2, model fields are in __dict__. 
-                    # If using private attributes or slots, this might differ, but for BaseModel it's standard.
-        
+        _sync_legacy_scores(self)
         return self
 
-class DrillResultSchema(BaseModel):
+    @classmethod
+    def from_firestore(cls, data: Dict[str, Any]) -> "PlayerSchema":
+        """
+        Build from a Firestore player document, skipping validation when the
+        document already has the declared types (large win on list endpoints).
+        Documents needing coercion, e.g. a legacy string jersey number, go
+        through normal validation.
+        """
+        if not _has_player_types(data):
+            return cls.model_validate(data)
+        if isinstance(data.get("scores"), dict):
+            # The sync below writes into scores; keep the caller's dict intact
+            data = {**data, "scores": dict(data["scores"])}
+        player = cls.model_construct(**data)
+        _sync_legacy_scores(player)
+        return player
+
+
+def _sync_legacy_scores(player: "PlayerSchema") -> None:
+    scores = player.scores
+    fields = player.__dict__
+    # Single pass: legacy value fills a missing score, otherwise the score
+    # (if any) is mirrored onto the legacy field via __dict__ (no validation hooks)
+    for field_name, score_key in _LEGACY_SCORE_FIELDS:
+        if score_key in scores:
+            fields[field_name] = scores[score_key]
+        else:
+            legacy_val = fields.get(field_name)
+            if legacy_val is not None:
+                scores[score_key] = legacy_val
+
+@_read_schema
+class DrillResultSchema:
     id: str
     player_id: str
     type: str
@@ -92,7 +121,8 @@ class DrillResultSchema(BaseModel):
     evaluator_id: Optional[str] = None  # Firebase UID of evaluator
     evaluator_name: Optional[str] = None  # Display name of evaluator
 
-class EvaluatorSchema(BaseModel):
+@_read_schema
+class EvaluatorSchema:
     id: str  # Firebase UID
     name: str
     email: str
@@ -114,7 +144,8 @@ class MultiEvaluatorDrillResult(BaseModel):
     final_score: float  # The score used for rankings (usually average)
     updated_at: str
 
-class EventSchema(BaseModel):
+@_read_schema
+class EventSchema:
     id: str
     name: str
     date: str
@@ -123,15 +154,17 @@ class EventSchema(BaseModel):
     live_entry_active: bool = False  # Controls locking of custom drills
     isLocked: bool = False  # Global combine lock - prevents all edits by non-organizers
     drillTemplate: Optional[str] = "football" # Track which schema this event uses
-    disabled_drills: List[str] = []  # List of built-in drill keys to hide/disable
+    disabled_drills: List[str] = Field(default_factory=list)  # List of built-in drill keys to hide/disable
 
-class LeagueSchema(BaseModel):
+@_read_schema
+class LeagueSchema:
     id: str
     name: str
     created_by_user_id: str
     created_at: str
 
-class UserSchema(BaseModel):
+@_read_schema
+class UserSchema:
     id: str  # Firebase UID
     email: str
     role: Optional[str] = None
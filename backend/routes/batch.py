@@ -5,20 +5,127 @@ Provides optimized batch endpoints to reduce API call overhead
 and improve performance for frontend operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
+from google.cloud.firestore_v1 import FieldFilter
 from ..auth import get_current_user
-from ..middleware.rate_limiting import bulk_rate_limit
-from ..firestore_client import db
-from ..utils.database import execute_with_timeout
-from ..utils.authorization import ensure_event_access, ensure_league_access
+from ..middleware.rate_limiting import BULK_RATE_LIMIT
+from ..firestore_client import db, get_async_firestore_client
+from ..utils.database import execute_with_timeout, await_with_timeout
+from ..utils.authorization import (
+    ensure_events_access_bulk,
+    ensure_league_access,
+    ensure_leagues_access_bulk,
+)
 from ..utils.data_integrity import ensure_league_document
+from ..utils.data_cache import league_info_cache, league_events_cache, league_player_counts_cache
+from ..utils.responses import APIJSONResponse, NDJSON_MEDIA_TYPE, ndjson_line, wants_ndjson
 from ..security.access_matrix import require_permission
+import asyncio
+import hashlib
 import logging
+import time
 
 router = APIRouter()
 MAX_ITEMS_PER_BATCH = 200
+# Cap on in-flight Firestore reads per batch request
+BATCH_CONCURRENCY = 20
+
+
+async def _collect_docs(ref, with_path: bool = False) -> List[Any]:
+    """Stream a collection/query on the AsyncClient into dicts carrying their document id.
+
+    With ``with_path`` each item is a ``(document path, dict)`` pair.
+    """
+    docs = []
+    async for doc in ref.stream():
+        doc_dict = doc.to_dict()
+        doc_dict["id"] = doc.id
+        docs.append((doc.reference.path, doc_dict) if with_path else doc_dict)
+    return docs
+
+
+# Firestore caps `in` filters at 30 values
+_IN_QUERY_CHUNK = 30
+
+
+async def _players_for_events(async_db, event_ids: List[str], semaphore) -> Dict[str, Any]:
+    """
+    Fetch events/{id}/players for many events with one collection-group `in` query
+    per 30 ids instead of one stream per event.
+
+    Players carry an ``event_id`` field; hits are also matched on their document
+    path, since other ``players`` collections (top-level, leagues/*) share the
+    group. Legacy players without ``event_id`` are invisible to the query, so
+    each event's hits are checked against a ``count()`` of its subcollection.
+    Events whose count differs (including ones the query found nothing for),
+    whose count fails, or whose chunk query fails (e.g. the collection-group
+    index is not deployed) fall back to the per-event subcollection stream.
+    Values are player lists, or the exception raised for that event.
+    """
+    wanted = set(event_ids)
+    found: Dict[str, Any] = {}
+    fallback: List[str] = []
+
+    async def _query_chunk(chunk: List[str]) -> None:
+        query = async_db.collection_group("players").where(filter=FieldFilter("event_id", "in", chunk))
+        try:
+            async with semaphore:
+                docs = await await_with_timeout(
+                    _collect_docs(query, with_path=True),
+                    timeout=10,
+                    operation_name="batch players collection-group fetch"
+                )
+        except Exception as e:
+            logging.warning(f"[BATCH] Collection-group players query failed, streaming per event: {e}")
+            fallback.extend(chunk)
+            return
+        for path, player in docs:
+            parts = path.split("/")
+            if len(parts) == 4 and parts[0] == "events" and parts[1] in wanted:
+                found.setdefault(parts[1], []).append(player)
+        fallback.extend(event_id for event_id in chunk if event_id not in found)
+
+    chunks = [event_ids[i:i + _IN_QUERY_CHUNK] for i in range(0, len(event_ids), _IN_QUERY_CHUNK)]
+    await asyncio.gather(*(_query_chunk(chunk) for chunk in chunks))
+
+    async def _check_complete(event_id: str) -> None:
+        players_ref = async_db.collection("events").document(event_id).collection("players")
+        try:
+            async with semaphore:
+                result = await await_with_timeout(
+                    players_ref.count().get(),
+                    timeout=5,
+                    operation_name=f"player count for {event_id}"
+                )
+            complete = int(result[0][0].value) == len(found[event_id])
+        except Exception as e:
+            logging.warning(f"[BATCH] Player count failed for {event_id}, streaming it: {e}")
+            complete = False
+        if not complete:
+            # Some players lack event_id; the subcollection stream has them all
+            fallback.append(event_id)
+
+    await asyncio.gather(*(_check_complete(event_id) for event_id in list(found)))
+
+    async def _stream_one(event_id: str) -> None:
+        try:
+            async with semaphore:
+                players_ref = async_db.collection("events").document(event_id).collection("players")
+                found[event_id] = await await_with_timeout(
+                    _collect_docs(players_ref),
+                    timeout=10,
+                    operation_name=f"players fetch for {event_id}"
+                )
+        except Exception as e:
+            found[event_id] = e
+
+    await asyncio.gather(*(_stream_one(event_id) for event_id in dict.fromkeys(fallback)))
+    return found
+
 
 class BatchPlayerRequest(BaseModel):
     event_ids: List[str]
@@ -30,14 +137,14 @@ class BatchEventsByIdsRequest(BaseModel):
     event_ids: List[str]
 
 @router.post("/batch/players")
-@bulk_rate_limit()
+@BULK_RATE_LIMIT
 @require_permission(
     "batch",
     "players",
     target="event",
     target_getter=lambda kwargs: (kwargs.get("payload").event_ids or [None])[0],
 )
-def get_batch_players(
+async def get_batch_players(
     request: Request,
     payload: BatchPlayerRequest,
     current_user=Depends(get_current_user),
@@ -45,81 +152,100 @@ def get_batch_players(
 ):
     """
     Get players for multiple events in a single request
-    Reduces API call overhead for pages that need data from multiple events
+    Reduces API call overhead for pages that need data from multiple events.
+    With `Accept: application/x-ndjson` the results are streamed one event per line.
     """
     try:
-        MAX_ITEMS_PER_BATCH = 200
         if len(payload.event_ids) > MAX_ITEMS_PER_BATCH:
             raise HTTPException(
                 status_code=400,
                 detail=f"Maximum {MAX_ITEMS_PER_BATCH} items per batch request"
             )
         
-        batch_results = {}
-        summary = {"requested": payload.event_ids[:MAX_ITEMS_PER_BATCH], "validated": [], "missing": []}
+        requested = payload.event_ids[:MAX_ITEMS_PER_BATCH]
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
         
-        for event_id in summary["requested"]:
-            try:
-                ensure_event_access(
-                    current_user["uid"],
-                    str(event_id),
-                    operation_name=f"batch players for {event_id}",
-                )
-                summary["validated"].append(event_id)
-
-                if dry_run:
-                    batch_results[event_id] = {"success": True, "players": [], "count": 0}
-                    continue
-
-                # Get players for this event
-                def get_players_stream():
-                    return list(db.collection("events").document(str(event_id)).collection("players").stream())
-                
-                players_stream = execute_with_timeout(
-                    get_players_stream,
-                    timeout=10,
-                    operation_name=f"players fetch for {event_id}"
-                )
-                
-                players = []
-                for player in players_stream:
-                    player_dict = player.to_dict()
-                    player_dict["id"] = player.id
-                    players.append(player_dict)
-                
-                batch_results[event_id] = {
+        def _error_result(error) -> Dict[str, Any]:
+            return {"success": False, "error": error, "players": [], "count": 0}
+        
+        # One bulk access check for the whole batch instead of one per event
+        _, denied = await run_in_threadpool(
+            ensure_events_access_bulk,
+            current_user["uid"],
+            [str(event_id) for event_id in requested],
+            operation_name="batch players",
+        )
+        
+        outcomes = []
+        for event_id in requested:
+            exc = denied.get(str(event_id))
+            if exc is None:
+                outcomes.append((None, False))
+                continue
+            logging.error(f"Error fetching players for event {event_id}: {exc}")
+            outcomes.append((_error_result(exc.detail), exc.status_code == 404))
+        
+        async_db = get_async_firestore_client()
+        summary = {"requested": requested, "validated": [], "missing": []}
+        
+        async def _iter_results(window: int):
+            """Yield (event_id, result) in request order, fetching players `window` events at a time."""
+            for start in range(0, len(requested), window):
+                chunk = list(zip(requested[start:start + window], outcomes[start:start + window]))
+                validated_ids = [str(event_id) for event_id, (error, _) in chunk if error is None]
+                players_by_event: Dict[str, Any] = {}
+                if validated_ids and not dry_run:
+                    players_by_event = await _players_for_events(async_db, validated_ids, semaphore)
+                for event_id, (error, missing) in chunk:
+                    if error is not None:
+                        if missing:
+                            summary["missing"].append(event_id)
+                        yield event_id, error
+                        continue
+                    summary["validated"].append(event_id)
+                    players = players_by_event.pop(str(event_id), [])
+                    if isinstance(players, Exception):
+                        detail = players.detail if isinstance(players, HTTPException) else str(players)
+                        logging.error(f"Error fetching players for event {event_id}: {players}")
+                        yield event_id, _error_result(detail)
+                    else:
+                        yield event_id, {"success": True, "players": players, "count": len(players)}
+        
+        if wants_ndjson(request):
+            # One line per event, then a summary line; only one query window of
+            # players is held in memory at a time
+            async def _stream():
+                successful = 0
+                try:
+                    async for event_id, result in _iter_results(_IN_QUERY_CHUNK):
+                        successful += result["success"]
+                        yield ndjson_line({"event_id": event_id, **result})
+                except Exception as e:
+                    logging.error(f"Error in streamed batch players request: {e}")
+                    yield ndjson_line({"success": False, "error": "Failed to fetch batch players"})
+                    return
+                yield ndjson_line({
                     "success": True,
-                    "players": players,
-                    "count": len(players)
-                }
-                    
-            except HTTPException as exc:
-                if exc.status_code == 404:
-                    summary["missing"].append(event_id)
-                logging.error(f"Error fetching players for event {event_id}: {exc}")
-                batch_results[event_id] = {
-                    "success": False,
-                    "error": exc.detail if hasattr(exc, "detail") else str(exc),
-                    "players": [],
-                    "count": 0
-                }
-            except Exception as e:
-                logging.error(f"Error fetching players for event {event_id}: {e}")
-                batch_results[event_id] = {
-                    "success": False,
-                    "error": str(e),
-                    "players": [],
-                    "count": 0
-                }
-        
-        return {
+                    "total_events": len(payload.event_ids),
+                    "successful_events": successful,
+                    "dry_run": dry_run,
+                    "summary": summary,
+                })
+            
+            return StreamingResponse(_stream(), media_type=NDJSON_MEDIA_TYPE)
+        
+        batch_results = {}
+        async for event_id, result in _iter_results(len(requested) or 1):
+            batch_results[event_id] = result
+        
+        return APIJSONResponse({
             "success": True,
             "results": batch_results,
             "total_events": len(payload.event_ids),
             "successful_events": sum(1 for r in batch_results.values() if r["success"]),
             "dry_run": dry_run,
             "summary": summary,
-        }
+        })
         
     except HTTPException:
         raise
@@ -128,14 +254,14 @@ def get_batch_players(
         raise HTTPException(status_code=500, detail="Failed to fetch batch players")
 
 @router.post("/batch/events")
-@bulk_rate_limit()
+@BULK_RATE_LIMIT
 @require_permission(
     "batch",
     "events",
     target="league",
     target_getter=lambda kwargs: (kwargs.get("payload").league_ids or [None])[0],
 )
-def get_batch_events(
+async def get_batch_events(
     request: Request,
     payload: BatchEventRequest,
     current_user=Depends(get_current_user),
@@ -146,76 +272,85 @@ def get_batch_events(
     Optimizes dashboard loading and multi-league views
     """
     try:
-        MAX_ITEMS_PER_BATCH = 200
         if len(payload.league_ids) > MAX_ITEMS_PER_BATCH:
             raise HTTPException(
                 status_code=400,
                 detail=f"Maximum {MAX_ITEMS_PER_BATCH} items per batch request"
             )
         
-        batch_results = {}
-        summary = {"requested": payload.league_ids[:MAX_ITEMS_PER_BATCH], "validated": [], "missing": []}
+        requested = payload.league_ids[:MAX_ITEMS_PER_BATCH]
+        async_db = get_async_firestore_client()
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
         
-        for league_id in summary["requested"]:
-            try:
-                ensure_league_access(
-                    current_user["uid"],
-                    str(league_id),
-                    operation_name=f"batch events for {league_id}",
-                )
-                ensure_league_document(str(league_id))
-                summary["validated"].append(league_id)
-
-                if dry_run:
-                    batch_results[league_id] = {"success": True, "events": [], "count": 0}
-                    continue
-                # Get events for this league
-                events_ref = db.collection("leagues").document(str(league_id)).collection("events")
-                events_stream = execute_with_timeout(
-                    lambda: list(events_ref.stream()),
-                    timeout=8,
-                    operation_name=f"events fetch for league {league_id}"
+        def _validate_leagues() -> Dict[str, HTTPException]:
+            """One membership check and one league get_all for the whole batch."""
+            league_ids = [str(league_id) for league_id in requested]
+            denied = ensure_leagues_access_bulk(
+                current_user["uid"],
+                league_ids,
+                operation_name="batch events",
+            )
+            refs = [db.collection("leagues").document(league_id) for league_id in league_ids if league_id not in denied]
+            if refs:
+                league_docs = execute_with_timeout(
+                    lambda: list(db.get_all(refs)),
+                    timeout=6,
+                    operation_name="batch league validation",
                 )
-                
-                events = []
-                for event in events_stream:
-                    event_dict = event.to_dict()
-                    event_dict["id"] = event.id
-                    events.append(event_dict)
-                
-                batch_results[league_id] = {
-                    "success": True,
-                    "events": events,
-                    "count": len(events)
-                }
-                
+                existing = {doc.id for doc in league_docs if doc.exists}
+                for ref in refs:
+                    if ref.id not in existing:
+                        denied[ref.id] = HTTPException(status_code=404, detail="League not found")
+            return denied
+        
+        denied = await run_in_threadpool(_validate_leagues)
+        
+        def _error_result(error) -> Dict[str, Any]:
+            return {"success": False, "error": error, "events": [], "count": 0}
+        
+        async def _fetch_one(league_id):
+            """Returns (result, validated, missing) for one league; never raises."""
+            exc = denied.get(str(league_id))
+            if exc is not None:
+                logging.error(f"Error fetching events for league {league_id}: {exc}")
+                return _error_result(exc.detail), False, exc.status_code == 404
+            if dry_run:
+                return {"success": True, "events": [], "count": 0}, True, False
+            try:
+                async with semaphore:
+                    events_ref = async_db.collection("leagues").document(str(league_id)).collection("events")
+                    events = await await_with_timeout(
+                        _collect_docs(events_ref),
+                        timeout=8,
+                        operation_name=f"events fetch for league {league_id}"
+                    )
+                return {"success": True, "events": events, "count": len(events)}, True, False
             except HTTPException as exc:
-                if exc.status_code == 404:
-                    summary["missing"].append(league_id)
                 logging.error(f"Error fetching events for league {league_id}: {exc}")
-                batch_results[league_id] = {
-                    "success": False,
-                    "error": exc.detail if hasattr(exc, "detail") else str(exc),
-                    "events": [],
-                    "count": 0
-                }
+                return _error_result(exc.detail), True, exc.status_code == 404
             except Exception as e:
                 logging.error(f"Error fetching events for league {league_id}: {e}")
-                batch_results[league_id] = {
-                    "success": False,
-                    "error": str(e),
-                    "events": [],
-                    "count": 0
-                }
-        
-        return {
+                return _error_result(str(e)), True, False
+        
+        outcomes = await asyncio.gather(*(_fetch_one(league_id) for league_id in requested))
+        
+        batch_results = {}
+        summary = {"requested": requested, "validated": [], "missing": []}
+        for league_id, (result, validated, missing) in zip(requested, outcomes):
+            batch_results[league_id] = result
+            if validated:
+                summary["validated"].append(league_id)
+            if missing:
+                summary["missing"].append(league_id)
+        
+        return APIJSONResponse({
             "success": True,
             "results": batch_results,
             "total_leagues": len(payload.league_ids),
             "successful_leagues": sum(1 for r in batch_results.values() if r["success"]),
             "dry_run": dry_run,
             "summary": summary,
-        }
+        })
         
     except HTTPException:
         raise
@@ -224,7 +359,7 @@ def get_batch_events(
         raise HTTPException(status_code=500, detail="Failed to fetch batch events")
 
 @router.post("/batch/events-by-ids")
-@bulk_rate_limit()
+@BULK_RATE_LIMIT
 @require_permission(
     "batch",
     "events_by_ids",
@@ -247,45 +382,64 @@ def get_batch_events_by_ids(
                 detail=f"Maximum {MAX_ITEMS_PER_BATCH} items per batch request"
             )
 
-        results: Dict[str, Any] = {}
-        refs = [db.collection("events").document(eid) for eid in payload.event_ids]
-        docs = execute_with_timeout(
-            lambda: db.get_all(refs),
-            timeout=8,
-            operation_name="batch events-by-ids fetch",
+        # The bulk check reads the event docs it authorizes, so they double as the result
+        allowed, denied = ensure_events_access_bulk(
+            current_user["uid"],
+            payload.event_ids,
+            operation_name="batch events-by-ids",
         )
 
-        doc_map = {doc.id: doc for doc in docs if doc.exists}
-
+        results: Dict[str, Any] = {}
         for event_id in payload.event_ids:
-            try:
-                ensure_event_access(
-                    current_user["uid"],
-                    event_id,
-                    operation_name=f"batch events-by-ids {event_id}",
-                )
-                doc = doc_map.get(event_id)
-                if doc:
-                    data = doc.to_dict()
-                    data["id"] = doc.id
-                    results[event_id] = {"success": True, "event": data}
-                else:
-                    results[event_id] = {"success": False, "error": "Not found"}
-            except Exception as ex:
-                logging.error(f"Error fetching event {event_id}: {ex}")
-                results[event_id] = {"success": False, "error": str(ex)}
-
-        return {"success": True, "results": results, "total_events": len(payload.event_ids)}
+            if event_id in allowed:
+                results[event_id] = {"success": True, "event": allowed[event_id]}
+                continue
+            exc = denied[event_id]
+            logging.error(f"Error fetching event {event_id}: {exc}")
+            results[event_id] = {"success": False, "error": str(exc)}
+
+        return APIJSONResponse({"success": True, "results": results, "total_events": len(payload.event_ids)})
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Error in events-by-ids batch request: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch events by ids")
 
+DASHBOARD_CACHE_CONTROL = "private, max-age=10"
+# Player adds don't touch event docs, so the validator also rolls over this often
+# to bound how long revalidation can keep serving old player counts
+DASHBOARD_COUNTS_MAX_AGE = 60
+# Event fields the dashboard summary shows; notes, drill config and schemas stay server-side
+DASHBOARD_EVENT_FIELDS = [
+    "name", "date", "location", "league_id", "drillTemplate", "live_entry_active",
+    "isLocked", "created_at", "updated_at", "lock_updated_at", "deleted_at", "status",
+]
+# Document fields that change whenever a league or event edit would change the dashboard
+_DASHBOARD_VERSION_FIELDS = ("created_at", "updated_at", "lock_updated_at", "deleted_at", "status")
+
+
+def _dashboard_etag(league: Dict[str, Any], events: List[Dict[str, Any]]) -> str:
+    """Validator from document versions, available before any player count is read."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(str(int(time.time() // DASHBOARD_COUNTS_MAX_AGE)).encode())
+    for doc in (league, *events):
+        digest.update(b"\x1e" + str(doc.get("id")).encode())
+        for field in _DASHBOARD_VERSION_FIELDS:
+            digest.update(b"\x1f" + str(doc.get(field, "")).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
 @router.get("/batch/dashboard-data/{league_id}")
-@bulk_rate_limit()
+@BULK_RATE_LIMIT
 @require_permission("batch", "dashboard", target="league", target_param="league_id")
-def get_dashboard_data(
+async def get_dashboard_data(
     request: Request,
     league_id: str,
     current_user=Depends(get_current_user)
@@ -295,12 +449,15 @@ def get_dashboard_data(
     Includes league info, events, and player counts
     """
     try:
-        ensure_league_access(
-            current_user["uid"],
-            league_id,
-            operation_name="dashboard data",
-        )
-        ensure_league_document(league_id)
+        def _validate_league():
+            ensure_league_access(
+                current_user["uid"],
+                league_id,
+                operation_name="dashboard data",
+            )
+            ensure_league_document(league_id)
+        
+        await run_in_threadpool(_validate_league)
         dashboard_data = {
             "league": None,
             "events": [],
@@ -308,46 +465,80 @@ def get_dashboard_data(
             "recent_activity": []
         }
         
-        # Get league info
-        league_doc = execute_with_timeout(
-            db.collection("leagues").document(str(league_id)).get,
-            timeout=5,
-            operation_name="league info fetch"
+        async_db = get_async_firestore_client()
+        league_ref = async_db.collection("leagues").document(str(league_id))
+        
+        # League info and the event list change rarely; reuse recent reads and
+        # fetch whatever is missing together
+        cached_league = league_info_cache.get(league_id)
+        cached_events = league_events_cache.get(league_id)
+        
+        async def _fetch_league():
+            league_doc = await await_with_timeout(league_ref.get(), timeout=5, operation_name="league info fetch")
+            if not league_doc.exists:
+                return None
+            return {**league_doc.to_dict(), "id": league_doc.id}
+        
+        async def _fetch_events():
+            return await await_with_timeout(
+                _collect_docs(league_ref.collection("events").select(DASHBOARD_EVENT_FIELDS)),
+                timeout=8,
+                operation_name="dashboard events fetch"
+            )
+        
+        league_info, fetched_events = await asyncio.gather(
+            _fetch_league() if cached_league is None else asyncio.sleep(0, cached_league),
+            _fetch_events() if cached_events is None else asyncio.sleep(0, cached_events),
         )
         
-        if league_doc.exists:
-            dashboard_data["league"] = {
-                **league_doc.to_dict(),
-                "id": league_doc.id
-            }
-        else:
+        if league_info is None:
             raise HTTPException(status_code=404, detail="League not found")
+        if cached_league is None:
+            league_info_cache.set(league_id, league_info)
+        if cached_events is None:
+            league_events_cache.set(league_id, fetched_events)
         
-        # Get events for this league
-        events_ref = db.collection("leagues").document(str(league_id)).collection("events")
-        events_stream = execute_with_timeout(
-            lambda: list(events_ref.stream()),
-            timeout=8,
-            operation_name="dashboard events fetch"
-        )
+        # Answer revalidations before fanning out the per-event count reads
+        etag = _dashboard_etag(league_info, fetched_events)
+        cache_headers = {"ETag": etag, "Cache-Control": DASHBOARD_CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
         
-        events = []
-        for event in events_stream:
-            event_dict = event.to_dict()
-            event_dict["id"] = event.id
-            
-            # Get player count for each event
+        dashboard_data["league"] = dict(league_info)
+        # Copies: player counts are added per request below
+        events = [dict(event) for event in fetched_events]
+        
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def _player_count(event_id: str) -> Optional[int]:
             try:
-                players_count = execute_with_timeout(
-                    lambda: len(list(db.collection("events").document(event.id).collection("players").stream())),
-                    timeout=3,
-                    operation_name=f"player count for event {event.id}"
-                )
-                event_dict["player_count"] = players_count
-            except:
-                event_dict["player_count"] = 0
-            
-            events.append(event_dict)
+                async with semaphore:
+                    # Server-side aggregation: one small response instead of every player doc
+                    players_ref = async_db.collection("events").document(event_id).collection("players")
+                    result = await await_with_timeout(
+                        players_ref.count().get(),
+                        timeout=3,
+                        operation_name=f"player count for event {event_id}"
+                    )
+                return int(result[0][0].value)
+            except Exception as e:
+                logging.warning(f"[DASHBOARD] Player count failed for event {event_id}: {e}")
+                return None
+        
+        # Get player count for each event concurrently, unless counts for this
+        # exact event list were taken moments ago
+        counts_by_event = league_player_counts_cache.get(league_id)
+        if counts_by_event is None or any(event["id"] not in counts_by_event for event in events):
+            counts = await asyncio.gather(*(_player_count(event["id"]) for event in events))
+            counts_by_event = {event["id"]: count for event, count in zip(events, counts)}
+            if None in counts:
+                # A failed read is shown as 0 but never cached or validated
+                cache_headers = {"Cache-Control": "no-store"}
+            else:
+                league_player_counts_cache.set(league_id, counts_by_event)
+        
+        for event_dict in events:
+            event_dict["player_count"] = counts_by_event[event_dict["id"]] or 0
             
         dashboard_data["events"] = events
         
@@ -359,10 +550,10 @@ def get_dashboard_data(
             "avg_players_per_event": round(total_players / len(events), 1) if events else 0
         }
         
-        return dashboard_data
+        return APIJSONResponse(dashboard_data, headers=cache_headers)
         
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Error fetching dashboard data for league {league_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch dashboard data")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch dashboard data")
@@ -4,18 +4,36 @@ Handles draft creation, management, picks, and real-time state.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from ..auth import get_current_user
 from ..firestore_client import get_firestore_client
+from ..utils.responses import APIJSONResponse
+from google.api_core.exceptions import AlreadyExists
+from google.cloud import firestore
 from google.cloud.firestore_v1 import FieldFilter
-import uuid
+import asyncio
+import secrets
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/drafts", tags=["drafts"])
 
+# Firestore caps a WriteBatch at 500 writes
+FIRESTORE_BATCH_LIMIT = 500
+
+# Team fields copied onto each pick so roster creation needs no teams query
+PICK_TEAM_FIELDS = ("team_name", "coach_user_id", "coach_name")
+
+# Summary fields returned by list_drafts; GET /drafts/{id} has the full document
+DRAFT_LIST_FIELDS = [
+    "id", "name", "status", "event_id", "league_id", "age_group", "draft_type",
+    "num_teams", "current_round", "num_rounds", "created_at", "started_at", "completed_at",
+]
+
 # ============================================================================
 # Pydantic Models
 # ============================================================================
@@ -69,34 +87,138 @@ class PreSlotCreate(BaseModel):
 # Helper Functions
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def _collection(name: str):
+    """Shared CollectionReference; the Firestore client is a process-wide singleton."""
+    return get_firestore_client().collection(name)
+
+def _teams_for_draft(draft_id: str):
+    return _collection("draft_teams").where(filter=FieldFilter("draft_id", "==", draft_id))
+
+def _picks_for_draft(draft_id: str):
+    return _collection("draft_picks").where(filter=FieldFilter("draft_id", "==", draft_id))
+
+def _coach_ranking(draft_id: str, coach_user_id: str):
+    """The coach's rankings doc snapshot for this draft, or None."""
+    ranking_query = _collection("coach_rankings").where(
+        filter=FieldFilter("draft_id", "==", draft_id)
+    ).where(
+        filter=FieldFilter("coach_user_id", "==", coach_user_id)
+    ).limit(1).stream()
+    return next(ranking_query, None)
+
+def _players_for_draft(draft_data: dict):
+    """Players in the draft's pool (event and, if set, age group)."""
+    query = _collection("players").where(filter=FieldFilter("event_id", "==", draft_data.get("event_id")))
+    if draft_data.get("age_group"):
+        query = query.where(filter=FieldFilter("age_group", "==", draft_data["age_group"]))
+    return query
+
+def _keyed_pick_id(draft_id: str, draft_data: dict, player_id: str) -> Optional[str]:
+    """Pick doc id derived from the player, for drafts started with keyed pick ids.
+
+    One doc per (draft, player) turns "already drafted" into a create()
+    precondition instead of a query. Drafts started earlier return None.
+    """
+    if not draft_data.get("keyed_pick_ids"):
+        return None
+    return f"{draft_id}__{player_id}"
+
+def _pick_advancement(draft_data: dict, overall_pick: int, picked_at: str) -> dict:
+    """Draft fields to update once the pick at overall_pick is made."""
+    num_teams = draft_data.get("num_teams", 1)
+    next_pick = overall_pick + 1
+    total_picks = draft_data.get("num_rounds", 1) * num_teams
+    
+    if next_pick > total_picks:
+        return {
+            "status": "completed",
+            "completed_at": picked_at,
+            "current_pick": overall_pick,
+            "pick_deadline": None
+        }
+    
+    pick_deadline = None
+    if draft_data.get("pick_timer_seconds", 0) > 0:
+        pick_deadline = (datetime.now(timezone.utc) + timedelta(seconds=draft_data["pick_timer_seconds"])).isoformat()
+    
+    return {
+        "current_round": ((next_pick - 1) // num_teams) + 1,
+        "current_pick": next_pick,
+        "current_team_id": get_pick_team(draft_data, next_pick),
+        "pick_deadline": pick_deadline
+    }
+
+def _drafted_player_ids(draft_id: str, draft_data: dict) -> set:
+    """Player ids already drafted, from the draft doc when it tracks them.
+    
+    Drafts started before drafted_player_ids existed fall back to a picks scan.
+    """
+    if "drafted_player_ids" in draft_data:
+        return set(draft_data["drafted_player_ids"])
+    return {p.to_dict().get("player_id") for p in _picks_for_draft(draft_id).select(["player_id"]).stream()}
+
+def _commit_pick(draft_id: str, pick_data: dict, keyed: bool) -> dict:
+    """Write a pick and advance the draft in one transaction.
+    
+    The draft is re-read inside the transaction, so a concurrent pick for the
+    same slot makes it retry and then fail the current_pick check instead of
+    double-advancing. Keyed picks are created, so a drafted player fails the
+    commit. Returns the draft data the advancement was computed from.
+    """
+    db = get_firestore_client()
+    draft_ref = _collection("drafts").document(draft_id)
+    pick_ref = _collection("draft_picks").document(pick_data["id"])
+    
+    @firestore.transactional
+    def _commit(transaction):
+        draft_doc = draft_ref.get(transaction=transaction)
+        if not draft_doc.exists:
+            raise HTTPException(status_code=404, detail="Draft not found")
+        
+        draft_data = draft_doc.to_dict()
+        if draft_data.get("status") != "active":
+            raise HTTPException(status_code=400, detail="Draft is not active")
+        if (draft_data.get("current_pick", 1) != pick_data["pick_number"]
+                or draft_data.get("current_team_id") != pick_data["team_id"]):
+            raise HTTPException(status_code=409, detail="Pick was already made, refresh the draft")
+        
+        if keyed:
+            transaction.create(pick_ref, pick_data)
+        else:
+            transaction.set(pick_ref, pick_data)
+        updates = _pick_advancement(draft_data, pick_data["pick_number"], pick_data["created_at"])
+        if "drafted_player_ids" in draft_data:
+            updates["drafted_player_ids"] = firestore.ArrayUnion([pick_data["player_id"]])
+        transaction.update(draft_ref, updates)
+        return draft_data
+    
+    try:
+        return _commit(db.transaction())
+    except AlreadyExists:
+        raise HTTPException(status_code=400, detail="Player already drafted")
+
 def generate_id(prefix: str = "") -> str:
-    return f"{prefix}{uuid.uuid4().hex[:12]}"
+    # 48 random bits as 12 hex chars, same shape as the former uuid4().hex[:12]
+    return f"{prefix}{secrets.token_hex(6)}"
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def calculate_snake_order(team_order: List[str], round_num: int) -> List[str]:
-    """Returns team order for a given round in snake draft."""
-    if round_num % 2 == 1:
-        return team_order
-    else:
-        return list(reversed(team_order))
-
 def get_pick_team(draft: dict, overall_pick: int) -> str:
     """Determine which team picks at a given overall pick number."""
-    num_teams = len(draft.get("team_order", []))
+    team_order = draft.get("team_order", [])
+    num_teams = len(team_order)
     if num_teams == 0:
         return None
     
-    round_num = ((overall_pick - 1) // num_teams) + 1
-    pick_in_round = ((overall_pick - 1) % num_teams)
+    round_index, pick_in_round = divmod(overall_pick - 1, num_teams)
     
-    if draft.get("draft_type") == "snake":
-        order = calculate_snake_order(draft["team_order"], round_num)
-    else:
-        order = draft["team_order"]
+    # Snake drafts run every second round backwards
+    if draft.get("draft_type") == "snake" and round_index & 1:
+        pick_in_round = num_teams - 1 - pick_in_round
     
-    return order[pick_in_round]
+    return team_order[pick_in_round]
 
 # ============================================================================
 # Draft CRUD
@@ -105,10 +227,8 @@ def get_pick_team(draft: dict, overall_pick: int) -> str:
 @router.post("")
 async def create_draft(draft_in: DraftCreate, user: dict = Depends(get_current_user)):
     """Create a new draft for an event."""
-    db = get_firestore_client()
-    
     # Verify event exists and user has access
-    event_ref = db.collection("events").document(draft_in.event_id)
+    event_ref = _collection("events").document(draft_in.event_id)
     event_doc = event_ref.get()
     if not event_doc.exists:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -147,7 +267,7 @@ async def create_draft(draft_in: DraftCreate, user: dict = Depends(get_current_u
         "created_by": user["uid"]
     }
     
-    db.collection("drafts").document(draft_id).set(draft_data)
+    _collection("drafts").document(draft_id).set(draft_data)
     logger.info(f"Draft created: {draft_id} for event {draft_in.event_id}")
     
     return draft_data
@@ -155,9 +275,7 @@ async def create_draft(draft_in: DraftCreate, user: dict = Depends(get_current_u
 @router.get("/{draft_id}")
 async def get_draft(draft_id: str, user: dict = Depends(get_current_user)):
     """Get draft details."""
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -168,9 +286,7 @@ async def get_draft(draft_id: str, user: dict = Depends(get_current_user)):
 @router.patch("/{draft_id}")
 async def update_draft(draft_id: str, draft_in: DraftUpdate, user: dict = Depends(get_current_user)):
     """Update draft settings. Only allowed in 'setup' status."""
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -181,7 +297,7 @@ async def update_draft(draft_id: str, draft_in: DraftUpdate, user: dict = Depend
     if draft_data.get("status") != "setup":
         raise HTTPException(status_code=400, detail="Cannot modify draft after it has started")
     
-    updates = {k: v for k, v in draft_in.dict().items() if v is not None}
+    updates = draft_in.model_dump(exclude_unset=True, exclude_none=True)
     updates["updated_at"] = now_iso()
     
     draft_ref.update(updates)
@@ -193,7 +309,7 @@ async def delete_draft(draft_id: str, user: dict = Depends(get_current_user)):
     """Delete a draft. Only allowed in 'setup' status."""
     db = get_firestore_client()
     
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -204,12 +320,14 @@ async def delete_draft(draft_id: str, user: dict = Depends(get_current_user)):
     if draft_data.get("status") != "setup":
         raise HTTPException(status_code=400, detail="Cannot delete draft after it has started")
     
-    # Delete associated teams and picks
-    teams = db.collection("draft_teams").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
-    for team in teams:
-        team.reference.delete()
-    
-    draft_ref.delete()
+    # Delete associated teams and the draft in as few batched commits as possible
+    teams = _teams_for_draft(draft_id).stream()
+    refs = [team.reference for team in teams] + [draft_ref]
+    for start in range(0, len(refs), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for ref in refs[start:start + FIRESTORE_BATCH_LIMIT]:
+            batch.delete(ref)
+        batch.commit()
     
     return {"status": "deleted", "draft_id": draft_id}
 
@@ -217,23 +335,24 @@ async def delete_draft(draft_id: str, user: dict = Depends(get_current_user)):
 async def list_drafts(
     event_id: Optional[str] = Query(None),
     league_id: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
     user: dict = Depends(get_current_user)
 ):
-    """List drafts, optionally filtered by event or league."""
-    db = get_firestore_client()
-    
-    query = db.collection("drafts")
+    """List drafts, newest first, optionally filtered by event and/or league."""
+    query = _collection("drafts")
     
+    # Filters combine; see docs/INDEXES.md for the composite indexes they need
     if event_id:
         query = query.where(filter=FieldFilter("event_id", "==", event_id))
-    elif league_id:
+    if league_id:
         query = query.where(filter=FieldFilter("league_id", "==", league_id))
+    query = query.order_by("created_at", direction="DESCENDING").limit(limit)
     
     drafts = []
-    for doc in query.stream():
+    for doc in query.select(DRAFT_LIST_FIELDS).stream():
         drafts.append(doc.to_dict())
     
-    return drafts
+    return APIJSONResponse(drafts)
 
 # ============================================================================
 # Draft Control
@@ -244,67 +363,73 @@ async def start_draft(draft_id: str, user: dict = Depends(get_current_user)):
     """Start the draft. Requires at least 2 teams."""
     db = get_firestore_client()
     
-    draft_ref = db.collection("drafts").document(draft_id)
-    draft_doc = draft_ref.get()
+    draft_ref = _collection("drafts").document(draft_id)
     
-    if not draft_doc.exists:
-        raise HTTPException(status_code=404, detail="Draft not found")
-    
-    draft_data = draft_doc.to_dict()
-    
-    if draft_data.get("status") != "setup":
-        raise HTTPException(status_code=400, detail="Draft already started or completed")
-    
-    # Get teams
-    teams_query = db.collection("draft_teams").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
-    teams = [t.to_dict() for t in teams_query]
-    
-    if len(teams) < 2:
-        raise HTTPException(status_code=400, detail="Need at least 2 teams to start draft")
-    
-    # Sort by pick_order
-    teams.sort(key=lambda t: t.get("pick_order", 999))
-    team_order = [t["id"] for t in teams]
-    
-    # Calculate rounds if not set
-    num_rounds = draft_data.get("num_rounds")
-    if not num_rounds:
-        # Get player count for age group
-        players_query = db.collection("players").where(filter=FieldFilter("event_id", "==", draft_data["event_id"]))
-        if draft_data.get("age_group"):
-            players_query = players_query.where(filter=FieldFilter("age_group", "==", draft_data["age_group"]))
-        player_count = len(list(players_query.stream()))
-        num_rounds = max(1, player_count // len(teams))
-    
-    # Set pick deadline if timer enabled
-    pick_deadline = None
-    if draft_data.get("pick_timer_seconds", 0) > 0:
-        pick_deadline = (datetime.now(timezone.utc) + timedelta(seconds=draft_data["pick_timer_seconds"])).isoformat()
-    
-    updates = {
-        "status": "active",
-        "team_order": team_order,
-        "num_teams": len(teams),
-        "num_rounds": num_rounds,
-        "current_round": 1,
-        "current_pick": 1,
-        "current_team_id": team_order[0],
-        "pick_deadline": pick_deadline,
-        "started_at": now_iso()
-    }
+    # Read, validate and update in one transaction so two concurrent starts
+    # cannot both pass the "setup" check
+    @firestore.transactional
+    def _start(transaction):
+        draft_doc = draft_ref.get(transaction=transaction)
+        
+        if not draft_doc.exists:
+            raise HTTPException(status_code=404, detail="Draft not found")
+        
+        draft_data = draft_doc.to_dict()
+        
+        if draft_data.get("status") != "setup":
+            raise HTTPException(status_code=400, detail="Draft already started or completed")
+        
+        # Get teams
+        teams_query = _teams_for_draft(draft_id)
+        teams = [t.to_dict() for t in transaction.get(teams_query)]
+        
+        if len(teams) < 2:
+            raise HTTPException(status_code=400, detail="Need at least 2 teams to start draft")
+        
+        # Sort by pick_order
+        teams.sort(key=lambda t: t.get("pick_order", 999))
+        team_order = [t["id"] for t in teams]
+        
+        # Calculate rounds if not set
+        num_rounds = draft_data.get("num_rounds")
+        if not num_rounds:
+            # Count players for the age group server-side
+            player_count = int(_players_for_draft(draft_data).count().get()[0][0].value)
+            num_rounds = max(1, player_count // len(teams))
+        
+        # Set pick deadline if timer enabled
+        pick_deadline = None
+        if draft_data.get("pick_timer_seconds", 0) > 0:
+            pick_deadline = (datetime.now(timezone.utc) + timedelta(seconds=draft_data["pick_timer_seconds"])).isoformat()
+        
+        updates = {
+            "status": "active",
+            "team_order": team_order,
+            "num_teams": len(teams),
+            "num_rounds": num_rounds,
+            "current_round": 1,
+            "current_pick": 1,
+            "current_team_id": team_order[0],
+            "pick_deadline": pick_deadline,
+            "started_at": now_iso(),
+            "keyed_pick_ids": True,
+            # Maintained by _commit_pick and undo so availability needs no picks scan
+            "drafted_player_ids": []
+        }
+        
+        transaction.update(draft_ref, updates)
+        return draft_data, updates
     
-    draft_ref.update(updates)
+    draft_data, updates = _start(db.transaction())
     
-    logger.info(f"Draft started: {draft_id} with {len(teams)} teams, {num_rounds} rounds")
+    logger.info(f"Draft started: {draft_id} with {updates['num_teams']} teams, {updates['num_rounds']} rounds")
     
     return {**draft_data, **updates}
 
 @router.post("/{draft_id}/pause")
 async def pause_draft(draft_id: str, user: dict = Depends(get_current_user)):
     """Pause an active draft."""
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -325,9 +450,7 @@ async def pause_draft(draft_id: str, user: dict = Depends(get_current_user)):
 @router.post("/{draft_id}/resume")
 async def resume_draft(draft_id: str, user: dict = Depends(get_current_user)):
     """Resume a paused draft."""
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -359,93 +482,108 @@ async def add_team(draft_id: str, team_in: TeamCreate, user: dict = Depends(get_
     """Add a team to the draft."""
     db = get_firestore_client()
     
-    draft_ref = db.collection("drafts").document(draft_id)
-    draft_doc = draft_ref.get()
-    
-    if not draft_doc.exists:
-        raise HTTPException(status_code=404, detail="Draft not found")
-    
-    draft_data = draft_doc.to_dict()
-    
-    if draft_data.get("status") != "setup":
-        raise HTTPException(status_code=400, detail="Cannot add teams after draft has started")
-    
-    # Get current team count for pick order
-    teams_query = db.collection("draft_teams").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
-    current_count = len(list(teams_query))
-    
+    draft_ref = _collection("drafts").document(draft_id)
     team_id = generate_id("dteam_")
-    team_data = {
-        "id": team_id,
-        "draft_id": draft_id,
-        "team_name": team_in.team_name,
-        "coach_user_id": team_in.coach_user_id,
-        "coach_name": team_in.coach_name,
-        "pick_order": current_count + 1,
-        "pre_slotted_player_ids": [],
-        "created_at": now_iso()
-    }
+    team_ref = _collection("draft_teams").document(team_id)
     
-    db.collection("draft_teams").document(team_id).set(team_data)
+    # The draft's num_teams is the pick-order counter; reading and bumping it in
+    # one transaction keeps concurrent additions from sharing a pick_order
+    @firestore.transactional
+    def _add(transaction):
+        draft_doc = draft_ref.get(transaction=transaction)
+        
+        if not draft_doc.exists:
+            raise HTTPException(status_code=404, detail="Draft not found")
+        
+        draft_data = draft_doc.to_dict()
+        
+        if draft_data.get("status") != "setup":
+            raise HTTPException(status_code=400, detail="Cannot add teams after draft has started")
+        
+        current_count = draft_data.get("num_teams") or 0
+        team_data = {
+            "id": team_id,
+            "draft_id": draft_id,
+            "team_name": team_in.team_name,
+            "coach_user_id": team_in.coach_user_id,
+            "coach_name": team_in.coach_name,
+            "pick_order": current_count + 1,
+            "pre_slotted_player_ids": [],
+            "created_at": now_iso()
+        }
+        
+        transaction.set(team_ref, team_data)
+        transaction.update(draft_ref, {"num_teams": current_count + 1})
+        return team_data
     
-    # Update draft team count
-    draft_ref.update({"num_teams": current_count + 1})
+    team_data = _add(db.transaction())
     
     return team_data
 
 @router.get("/{draft_id}/teams")
 async def list_teams(draft_id: str, user: dict = Depends(get_current_user)):
     """List all teams in a draft."""
-    db = get_firestore_client()
-    
-    teams_query = db.collection("draft_teams").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
+    teams_query = _teams_for_draft(draft_id).stream()
     teams = [t.to_dict() for t in teams_query]
     teams.sort(key=lambda t: t.get("pick_order", 999))
     
-    return teams
+    return APIJSONResponse(teams)
 
 @router.patch("/{draft_id}/teams/{team_id}")
 async def update_team(draft_id: str, team_id: str, team_in: TeamUpdate, user: dict = Depends(get_current_user)):
     """Update a team."""
-    db = get_firestore_client()
-    
-    team_ref = db.collection("draft_teams").document(team_id)
+    team_ref = _collection("draft_teams").document(team_id)
     team_doc = team_ref.get()
     
     if not team_doc.exists:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    updates = {k: v for k, v in team_in.dict().items() if v is not None}
+    team_data = team_doc.to_dict()
+    updates = team_in.model_dump(exclude_unset=True, exclude_none=True)
     updates["updated_at"] = now_iso()
     
-    team_ref.update(updates)
-    
-    return {**team_doc.to_dict(), **updates}
+    # Picks carry a copy of the team's details; stamping the draft tells roster
+    # creation when those copies may be out of date
+    db = get_firestore_client()
+    batch = db.batch()
+    batch.update(team_ref, updates)
+    batch.update(
+        _collection("drafts").document(team_data.get("draft_id") or draft_id),
+        {"teams_updated_at": updates["updated_at"]}
+    )
+    batch.commit()
+    
+    return {**team_data, **updates}
 
 @router.delete("/{draft_id}/teams/{team_id}")
 async def remove_team(draft_id: str, team_id: str, user: dict = Depends(get_current_user)):
     """Remove a team from the draft."""
     db = get_firestore_client()
     
-    draft_ref = db.collection("drafts").document(draft_id)
-    draft_doc = draft_ref.get()
+    draft_ref = _collection("drafts").document(draft_id)
+    team_ref = _collection("draft_teams").document(team_id)
     
-    if not draft_doc.exists:
-        raise HTTPException(status_code=404, detail="Draft not found")
-    
-    if draft_doc.to_dict().get("status") != "setup":
-        raise HTTPException(status_code=400, detail="Cannot remove teams after draft has started")
-    
-    team_ref = db.collection("draft_teams").document(team_id)
-    if not team_ref.get().exists:
-        raise HTTPException(status_code=404, detail="Team not found")
-    
-    team_ref.delete()
+    # Validate, delete and recount in one transaction; setting num_teams from
+    # the teams actually left also repairs a counter that has drifted
+    @firestore.transactional
+    def _remove(transaction):
+        draft_doc = draft_ref.get(transaction=transaction)
+        
+        if not draft_doc.exists:
+            raise HTTPException(status_code=404, detail="Draft not found")
+        
+        if draft_doc.to_dict().get("status") != "setup":
+            raise HTTPException(status_code=400, detail="Cannot remove teams after draft has started")
+        
+        team_ids = [t.id for t in transaction.get(_teams_for_draft(draft_id).select([]))]
+        if team_id not in team_ids:
+            # Missing, or belongs to another draft
+            raise HTTPException(status_code=404, detail="Team not found")
+        
+        transaction.delete(team_ref)
+        transaction.update(draft_ref, {"num_teams": len(team_ids) - 1})
     
-    # Update team count
-    teams_query = db.collection("draft_teams").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
-    new_count = len(list(teams_query))
-    draft_ref.update({"num_teams": new_count})
+    _remove(db.transaction())
     
     return {"status": "deleted", "team_id": team_id}
 
@@ -454,7 +592,7 @@ async def reorder_teams(draft_id: str, team_ids: List[str], user: dict = Depends
     """Reorder teams for the draft."""
     db = get_firestore_client()
     
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -463,9 +601,12 @@ async def reorder_teams(draft_id: str, team_ids: List[str], user: dict = Depends
     if draft_doc.to_dict().get("status") != "setup":
         raise HTTPException(status_code=400, detail="Cannot reorder teams after draft has started")
     
-    # Update pick_order for each team
-    for i, team_id in enumerate(team_ids):
-        db.collection("draft_teams").document(team_id).update({"pick_order": i + 1})
+    # Update pick_order for each team, one commit per FIRESTORE_BATCH_LIMIT teams
+    for start in range(0, len(team_ids), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for i, team_id in enumerate(team_ids[start:start + FIRESTORE_BATCH_LIMIT], start=start):
+            batch.update(_collection("draft_teams").document(team_id), {"pick_order": i + 1})
+        batch.commit()
     
     return {"status": "reordered", "order": team_ids}
 
@@ -476,9 +617,7 @@ async def reorder_teams(draft_id: str, team_ids: List[str], user: dict = Depends
 @router.post("/{draft_id}/picks")
 async def make_pick(draft_id: str, pick_in: PickCreate, user: dict = Depends(get_current_user)):
     """Make a draft pick."""
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -492,7 +631,7 @@ async def make_pick(draft_id: str, pick_in: PickCreate, user: dict = Depends(get
     current_team_id = draft_data.get("current_team_id")
     
     # Verify it's user's turn (or user is admin)
-    team_doc = db.collection("draft_teams").document(current_team_id).get()
+    team_doc = _collection("draft_teams").document(current_team_id).get()
     if not team_doc.exists:
         raise HTTPException(status_code=500, detail="Current team not found")
     
@@ -503,15 +642,16 @@ async def make_pick(draft_id: str, pick_in: PickCreate, user: dict = Depends(get
     if not is_admin and not is_coach:
         raise HTTPException(status_code=403, detail="Not your turn to pick")
     
-    # Check player isn't already drafted
-    existing_pick = db.collection("draft_picks").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).where(
-        filter=FieldFilter("player_id", "==", pick_in.player_id)
-    ).limit(1).stream()
-    
-    if len(list(existing_pick)) > 0:
-        raise HTTPException(status_code=400, detail="Player already drafted")
+    # Check player isn't already drafted; keyed pick ids check on create instead
+    keyed_pick_id = _keyed_pick_id(draft_id, draft_data, pick_in.player_id)
+    if keyed_pick_id is None:
+        # count() bills one read and returns no document data
+        existing_picks = _picks_for_draft(draft_id).where(
+            filter=FieldFilter("player_id", "==", pick_in.player_id)
+        ).limit(1).count().get()[0][0].value
+        
+        if existing_picks > 0:
+            raise HTTPException(status_code=400, detail="Player already drafted")
     
     # Calculate overall pick number
     current_round = draft_data.get("current_round", 1)
@@ -520,7 +660,9 @@ async def make_pick(draft_id: str, pick_in: PickCreate, user: dict = Depends(get
     overall_pick = draft_data.get("current_pick", 1)
     
     # Record the pick
-    pick_id = generate_id("pick_")
+    # One timestamp for the pick and, on the last pick, the draft completion
+    picked_at = now_iso()
+    pick_id = keyed_pick_id or generate_id("pick_")
     pick_data = {
         "id": pick_id,
         "draft_id": draft_id,
@@ -529,45 +671,20 @@ async def make_pick(draft_id: str, pick_in: PickCreate, user: dict = Depends(get
         "pick_in_round": pick_in_round,
         "team_id": current_team_id,
         "player_id": pick_in.player_id,
+        **{field: team_data.get(field) for field in PICK_TEAM_FIELDS},
         "picked_by": user["uid"],
         "pick_type": "manual",
-        "created_at": now_iso()
+        "created_at": picked_at
     }
     
-    db.collection("draft_picks").document(pick_id).set(pick_data)
-    
-    # Advance draft state
-    next_pick = overall_pick + 1
-    total_picks = draft_data.get("num_rounds", 1) * num_teams
+    # Record the pick and advance draft state together
+    draft_data = _commit_pick(draft_id, pick_data, keyed=keyed_pick_id is not None)
     
-    if next_pick > total_picks:
-        # Draft complete
-        draft_ref.update({
-            "status": "completed",
-            "completed_at": now_iso(),
-            "current_pick": overall_pick,
-            "pick_deadline": None
-        })
-        
-        # Create team rosters
-        await _create_team_rosters(db, draft_id, draft_data)
+    if overall_pick >= draft_data.get("num_rounds", 1) * num_teams:
+        # Draft complete, create team rosters
+        await _create_team_rosters(draft_id, draft_data)
         
         logger.info(f"Draft completed: {draft_id}")
-    else:
-        # Advance to next pick
-        next_round = ((next_pick - 1) // num_teams) + 1
-        next_team_id = get_pick_team(draft_data, next_pick)
-        
-        pick_deadline = None
-        if draft_data.get("pick_timer_seconds", 0) > 0:
-            pick_deadline = (datetime.now(timezone.utc) + timedelta(seconds=draft_data["pick_timer_seconds"])).isoformat()
-        
-        draft_ref.update({
-            "current_round": next_round,
-            "current_pick": next_pick,
-            "current_team_id": next_team_id,
-            "pick_deadline": pick_deadline
-        })
     
     logger.info(f"Pick made: {pick_id} - Player {pick_in.player_id} to team {current_team_id}")
     
@@ -576,14 +693,10 @@ async def make_pick(draft_id: str, pick_in: PickCreate, user: dict = Depends(get
 @router.get("/{draft_id}/picks")
 async def list_picks(draft_id: str, user: dict = Depends(get_current_user)):
     """Get all picks for a draft."""
-    db = get_firestore_client()
-    
-    picks_query = db.collection("draft_picks").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).order_by("pick_number").stream()
+    picks_query = _picks_for_draft(draft_id).order_by("pick_number").stream()
     
     picks = [p.to_dict() for p in picks_query]
-    return picks
+    return APIJSONResponse(picks)
 
 @router.post("/{draft_id}/picks/auto")
 async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
@@ -592,9 +705,7 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
     Uses coach's rankings if available, otherwise uses composite score.
     Can be called by anyone (timer validation happens server-side).
     """
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -617,40 +728,32 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
     
     current_team_id = draft_data.get("current_team_id")
     
-    # Get coach's rankings for this team
-    team_doc = db.collection("draft_teams").document(current_team_id).get()
-    if not team_doc.exists:
-        raise HTTPException(status_code=500, detail="Current team not found")
-    
-    team_data = team_doc.to_dict()
-    coach_user_id = team_data.get("coach_user_id")
-    
-    # Try to get coach rankings
-    ranked_player_ids = []
-    if coach_user_id:
-        ranking_query = db.collection("coach_rankings").where(
-            filter=FieldFilter("draft_id", "==", draft_id)
-        ).where(
-            filter=FieldFilter("coach_user_id", "==", coach_user_id)
-        ).limit(1).stream()
+    def _load_team():
+        # Get the current team and its coach's rankings
+        team_doc = _collection("draft_teams").document(current_team_id).get()
+        if not team_doc.exists:
+            raise HTTPException(status_code=500, detail="Current team not found")
         
-        rankings = list(ranking_query)
-        if rankings:
-            ranked_player_ids = rankings[0].to_dict().get("ranked_player_ids", [])
-    
-    # Get available players
-    event_id = draft_data.get("event_id")
-    age_group = draft_data.get("age_group")
-    
-    players_query = db.collection("players").where(filter=FieldFilter("event_id", "==", event_id))
-    if age_group:
-        players_query = players_query.where(filter=FieldFilter("age_group", "==", age_group))
-    
-    all_players = {p.id: p.to_dict() for p in players_query.stream()}
-    
-    # Get already drafted players
-    picks_query = db.collection("draft_picks").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
-    drafted_ids = {p.to_dict().get("player_id") for p in picks_query}
+        team_data = team_doc.to_dict()
+        coach_user_id = team_data.get("coach_user_id")
+        if not coach_user_id:
+            return team_data, []
+        
+        ranking = _coach_ranking(draft_id, coach_user_id)
+        return team_data, (ranking.to_dict().get("ranked_player_ids", []) if ranking else [])
+    
+    def _load_players():
+        # Get available players
+        players_query = _players_for_draft(draft_data)
+        return {p.id: p.to_dict() for p in players_query.stream()}
+    
+    # The team/rankings chain, the players scan and the drafted ids are
+    # independent; run them concurrently instead of back to back
+    (team_data, ranked_player_ids), all_players, drafted_ids = await asyncio.gather(
+        run_in_threadpool(_load_team),
+        run_in_threadpool(_load_players),
+        run_in_threadpool(_drafted_player_ids, draft_id, draft_data),
+    )
     
     # Filter to available players
     available_ids = [pid for pid in all_players.keys() if pid not in drafted_ids]
@@ -681,7 +784,10 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
     overall_pick = draft_data.get("current_pick", 1)
     num_teams = draft_data.get("num_teams", 1)
     
-    pick_id = generate_id("pick_")
+    # One timestamp for the pick and, on the last pick, the draft completion
+    picked_at = now_iso()
+    keyed_pick_id = _keyed_pick_id(draft_id, draft_data, selected_player_id)
+    pick_id = keyed_pick_id or generate_id("pick_")
     pick_data = {
         "id": pick_id,
         "draft_id": draft_id,
@@ -689,42 +795,18 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
         "pick_number": overall_pick,
         "team_id": current_team_id,
         "player_id": selected_player_id,
+        **{field: team_data.get(field) for field in PICK_TEAM_FIELDS},
         "picked_by": "system",
         "pick_type": "auto",
-        "created_at": now_iso()
+        "created_at": picked_at
     }
     
-    db.collection("draft_picks").document(pick_id).set(pick_data)
-    
-    # Advance draft state
-    next_pick = overall_pick + 1
-    total_picks = draft_data.get("num_rounds", 1) * num_teams
+    # Record the pick and advance draft state together
+    draft_data = _commit_pick(draft_id, pick_data, keyed=keyed_pick_id is not None)
     
-    if next_pick > total_picks:
-        # Draft complete
-        draft_ref.update({
-            "status": "completed",
-            "completed_at": now_iso(),
-            "current_pick": overall_pick,
-            "pick_deadline": None
-        })
-        await _create_team_rosters(db, draft_id, draft_data)
+    if overall_pick >= draft_data.get("num_rounds", 1) * num_teams:
+        await _create_team_rosters(draft_id, draft_data)
         logger.info(f"Draft completed via auto-pick: {draft_id}")
-    else:
-        # Advance to next pick
-        next_round = ((next_pick - 1) // num_teams) + 1
-        next_team_id = get_pick_team(draft_data, next_pick)
-        
-        pick_deadline = None
-        if draft_data.get("pick_timer_seconds", 0) > 0:
-            pick_deadline = (datetime.now(timezone.utc) + timedelta(seconds=draft_data["pick_timer_seconds"])).isoformat()
-        
-        draft_ref.update({
-            "current_round": next_round,
-            "current_pick": next_pick,
-            "current_team_id": next_team_id,
-            "pick_deadline": pick_deadline
-        })
     
     logger.info(f"Auto-pick made: {pick_id} - Player {selected_player_id} to team {current_team_id}")
     
@@ -736,9 +818,7 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
 @router.post("/{draft_id}/picks/undo")
 async def undo_last_pick(draft_id: str, user: dict = Depends(get_current_user)):
     """Undo the last pick. Admin only."""
-    db = get_firestore_client()
-    
-    draft_ref = db.collection("drafts").document(draft_id)
+    draft_ref = _collection("drafts").document(draft_id)
     draft_doc = draft_ref.get()
     
     if not draft_doc.exists:
@@ -754,15 +834,12 @@ async def undo_last_pick(draft_id: str, user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="Cannot undo picks in current draft state")
     
     # Get last pick
-    picks_query = db.collection("draft_picks").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).order_by("pick_number", direction="DESCENDING").limit(1).stream()
+    picks_query = _picks_for_draft(draft_id).order_by("pick_number", direction="DESCENDING").limit(1).stream()
     
-    picks = list(picks_query)
-    if len(picks) == 0:
+    last_pick = next(picks_query, None)
+    if last_pick is None:
         raise HTTPException(status_code=400, detail="No picks to undo")
     
-    last_pick = picks[0]
     last_pick_data = last_pick.to_dict()
     
     # Delete the pick
@@ -774,12 +851,15 @@ async def undo_last_pick(draft_id: str, user: dict = Depends(get_current_user)):
     reverted_round = ((reverted_pick - 1) // num_teams) + 1
     reverted_team_id = last_pick_data.get("team_id")
     
-    draft_ref.update({
+    updates = {
         "current_round": reverted_round,
         "current_pick": reverted_pick,
         "current_team_id": reverted_team_id,
         "status": "active" if draft_data.get("status") == "completed" else draft_data.get("status")
-    })
+    }
+    if "drafted_player_ids" in draft_data:
+        updates["drafted_player_ids"] = firestore.ArrayRemove([last_pick_data.get("player_id")])
+    draft_ref.update(updates)
     
     logger.info(f"Pick undone: {last_pick_data.get('id')} from draft {draft_id}")
     
@@ -792,49 +872,34 @@ async def undo_last_pick(draft_id: str, user: dict = Depends(get_current_user)):
 @router.get("/{draft_id}/rankings")
 async def get_my_rankings(draft_id: str, user: dict = Depends(get_current_user)):
     """Get the current user's player rankings for this draft."""
-    db = get_firestore_client()
-    
-    ranking_query = db.collection("coach_rankings").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).where(
-        filter=FieldFilter("coach_user_id", "==", user["uid"])
-    ).limit(1).stream()
-    
-    rankings = list(ranking_query)
-    if len(rankings) == 0:
+    ranking = _coach_ranking(draft_id, user["uid"])
+    if ranking is None:
         return {"draft_id": draft_id, "ranked_player_ids": []}
     
-    return rankings[0].to_dict()
+    return ranking.to_dict()
 
 @router.put("/{draft_id}/rankings")
 async def save_rankings(draft_id: str, rankings_in: RankingsUpdate, user: dict = Depends(get_current_user)):
     """Save the current user's player rankings."""
-    db = get_firestore_client()
-    
     # Check if ranking exists
-    ranking_query = db.collection("coach_rankings").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).where(
-        filter=FieldFilter("coach_user_id", "==", user["uid"])
-    ).limit(1).stream()
-    
-    rankings = list(ranking_query)
+    ranking = _coach_ranking(draft_id, user["uid"])
     
+    saved_at = now_iso()
     ranking_data = {
         "draft_id": draft_id,
         "coach_user_id": user["uid"],
         "ranked_player_ids": rankings_in.ranked_player_ids,
-        "updated_at": now_iso()
+        "updated_at": saved_at
     }
     
-    if len(rankings) > 0:
-        rankings[0].reference.update(ranking_data)
-        ranking_data["id"] = rankings[0].id
+    if ranking is not None:
+        ranking.reference.update(ranking_data)
+        ranking_data["id"] = ranking.id
     else:
         ranking_id = generate_id("ranking_")
         ranking_data["id"] = ranking_id
-        ranking_data["created_at"] = now_iso()
-        db.collection("coach_rankings").document(ranking_id).set(ranking_data)
+        ranking_data["created_at"] = saved_at
+        _collection("coach_rankings").document(ranking_id).set(ranking_data)
     
     return ranking_data
 
@@ -845,55 +910,47 @@ async def save_rankings(draft_id: str, rankings_in: RankingsUpdate, user: dict =
 @router.get("/{draft_id}/players")
 async def get_available_players(draft_id: str, user: dict = Depends(get_current_user)):
     """Get available (undrafted) players for this draft."""
-    db = get_firestore_client()
-    
-    draft_doc = db.collection("drafts").document(draft_id).get()
+    draft_doc = _collection("drafts").document(draft_id).get()
     if not draft_doc.exists:
         raise HTTPException(status_code=404, detail="Draft not found")
     
     draft_data = draft_doc.to_dict()
-    event_id = draft_data.get("event_id")
-    age_group = draft_data.get("age_group")
-    
-    # Get all players for event
-    players_query = db.collection("players").where(filter=FieldFilter("event_id", "==", event_id))
-    if age_group:
-        players_query = players_query.where(filter=FieldFilter("age_group", "==", age_group))
-    
-    all_players = {p.id: p.to_dict() for p in players_query.stream()}
     
     # Get drafted player IDs
-    picks_query = db.collection("draft_picks").where(filter=FieldFilter("draft_id", "==", draft_id)).stream()
-    drafted_ids = {p.to_dict().get("player_id") for p in picks_query}
+    drafted_ids = _drafted_player_ids(draft_id, draft_data)
     
-    # Filter to available players
-    available = [p for pid, p in all_players.items() if pid not in drafted_ids and p.get("id") not in drafted_ids]
+    # Filter to available players while streaming; pick player_ids are doc ids
+    available = [p.to_dict() for p in _players_for_draft(draft_data).stream() if p.id not in drafted_ids]
     
-    return available
+    return APIJSONResponse(available)
 
 @router.get("/{draft_id}/players/drafted")
 async def get_drafted_players(draft_id: str, user: dict = Depends(get_current_user)):
     """Get all drafted players with their team assignments."""
-    db = get_firestore_client()
-    
-    picks_query = db.collection("draft_picks").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).order_by("pick_number").stream()
     
-    picks = [p.to_dict() for p in picks_query]
-    
-    # Enrich with player data
-    player_ids = [p.get("player_id") for p in picks]
-    players = {}
-    for pid in player_ids:
-        player_doc = db.collection("players").document(pid).get()
-        if player_doc.exists:
-            players[pid] = player_doc.to_dict()
+    def _load():
+        # Both reads block on the sync client; keep them off the event loop
+        picks_query = _picks_for_draft(draft_id).order_by("pick_number").stream()
+        
+        picks = [p.to_dict() for p in picks_query]
+        
+        # Enrich with player data in one batched read instead of one get per pick
+        player_ids = list(dict.fromkeys(p.get("player_id") for p in picks if p.get("player_id")))
+        players_col = _collection("players")
+        player_refs = [players_col.document(pid) for pid in player_ids]
+        players = {
+            doc.id: doc.to_dict()
+            for doc in (get_firestore_client().get_all(player_refs) if player_refs else [])
+            if doc.exists
+        }
+        
+        for pick in picks:
+            pick["player"] = players.get(pick.get("player_id"), {})
+        return picks
     
-    for pick in picks:
-        pick["player"] = players.get(pick.get("player_id"), {})
+    picks = await run_in_threadpool(_load)
     
-    return picks
+    return APIJSONResponse(picks)
 
 # ============================================================================
 # Pre-Slotted Players
@@ -902,16 +959,14 @@ async def get_drafted_players(draft_id: str, user: dict = Depends(get_current_us
 @router.post("/{draft_id}/pre-slots")
 async def add_pre_slot(draft_id: str, slot_in: PreSlotCreate, user: dict = Depends(get_current_user)):
     """Pre-assign a player to a team (e.g., coach's child)."""
-    db = get_firestore_client()
-    
-    draft_doc = db.collection("drafts").document(draft_id).get()
+    draft_doc = _collection("drafts").document(draft_id).get()
     if not draft_doc.exists:
         raise HTTPException(status_code=404, detail="Draft not found")
     
     if draft_doc.to_dict().get("status") != "setup":
         raise HTTPException(status_code=400, detail="Cannot add pre-slots after draft has started")
     
-    team_ref = db.collection("draft_teams").document(slot_in.team_id)
+    team_ref = _collection("draft_teams").document(slot_in.team_id)
     team_doc = team_ref.get()
     if not team_doc.exists:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -928,16 +983,14 @@ async def add_pre_slot(draft_id: str, slot_in: PreSlotCreate, user: dict = Depen
 @router.delete("/{draft_id}/pre-slots/{team_id}/{player_id}")
 async def remove_pre_slot(draft_id: str, team_id: str, player_id: str, user: dict = Depends(get_current_user)):
     """Remove a pre-slotted player."""
-    db = get_firestore_client()
-    
-    draft_doc = db.collection("drafts").document(draft_id).get()
+    draft_doc = _collection("drafts").document(draft_id).get()
     if not draft_doc.exists:
         raise HTTPException(status_code=404, detail="Draft not found")
     
     if draft_doc.to_dict().get("status") != "setup":
         raise HTTPException(status_code=400, detail="Cannot modify pre-slots after draft has started")
     
-    team_ref = db.collection("draft_teams").document(team_id)
+    team_ref = _collection("draft_teams").document(team_id)
     team_doc = team_ref.get()
     if not team_doc.exists:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -955,15 +1008,15 @@ async def remove_pre_slot(draft_id: str, team_id: str, player_id: str, user: dic
 # Helper: Create Team Rosters on Draft Completion
 # ============================================================================
 
-async def _create_team_rosters(db, draft_id: str, draft_data: dict):
+async def _create_team_rosters(draft_id: str, draft_data: dict):
     """Create team roster records when draft completes."""
     
     # Get all picks grouped by team
-    picks_query = db.collection("draft_picks").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).stream()
+    picks_query = _picks_for_draft(draft_id).stream()
     
     team_players: Dict[str, List[str]] = {}
+    teams: Dict[str, dict] = {}
+    latest_pick: Dict[str, int] = {}
     for pick_doc in picks_query:
         pick = pick_doc.to_dict()
         team_id = pick.get("team_id")
@@ -971,15 +1024,22 @@ async def _create_team_rosters(db, draft_id: str, draft_data: dict):
         if team_id not in team_players:
             team_players[team_id] = []
         team_players[team_id].append(player_id)
-    
-    # Get team details
-    teams_query = db.collection("draft_teams").where(
-        filter=FieldFilter("draft_id", "==", draft_id)
-    ).stream()
-    
-    teams = {t.id: t.to_dict() for t in teams_query}
-    
-    # Create roster records
+        
+        # Team details ride along on each pick; keep the most recent copy
+        if "team_name" in pick and pick.get("pick_number", 0) >= latest_pick.get(team_id, 0):
+            latest_pick[team_id] = pick.get("pick_number", 0)
+            teams[team_id] = {field: pick.get(field) for field in PICK_TEAM_FIELDS}
+    
+    # Picks made before team details were copied onto them, or teams edited
+    # after the draft started, need the live teams
+    teams_edited = (draft_data.get("teams_updated_at") or "") > (draft_data.get("started_at") or "")
+    if teams_edited or len(teams) < len(team_players):
+        teams = {t.id: t.to_dict() for t in _teams_for_draft(draft_id).stream()}
+    
+    # Create roster records, all stamped with the same creation time and
+    # written in batches rather than one commit per team
+    created_at = now_iso()
+    rosters = []
     for team_id, player_ids in team_players.items():
         team_data = teams.get(team_id, {})
         
@@ -993,10 +1053,17 @@ async def _create_team_rosters(db, draft_id: str, draft_data: dict):
             "coach_user_id": team_data.get("coach_user_id"),
             "coach_name": team_data.get("coach_name"),
             "player_ids": player_ids,
-            "created_at": now_iso(),
+            "created_at": created_at,
             "created_from": "draft"
         }
         
-        db.collection("team_rosters").document(roster_id).set(roster_data)
+        rosters.append(roster_data)
+    
+    db = get_firestore_client()
+    for start in range(0, len(rosters), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for roster_data in rosters[start:start + FIRESTORE_BATCH_LIMIT]:
+            batch.set(_collection("team_rosters").document(roster_data["id"]), roster_data)
+        batch.commit()
     
     logger.info(f"Created {len(team_players)} team rosters from draft {draft_id}")
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from ..auth import get_current_user
-from ..middleware.rate_limiting import read_rate_limit, write_rate_limit
+from ..middleware.rate_limiting import read_rate_limit
 from ..firestore_client import db
 from ..services.schema_registry import SchemaRegistry
 import logging
@@ -30,6 +30,39 @@ class DrillTemplate(BaseModel):
     drills: List[DrillDefinition]
 
 
+def _drill_dict(d) -> Dict[str, Any]:
+    return {
+        "key": d.key,
+        "label": d.label,
+        "unit": d.unit,
+        "min_value": d.min_value,
+        "max_value": d.max_value,
+        "lower_is_better": d.lower_is_better,
+        "default_weight": d.default_weight
+    }
+
+
+# Schemas are static, so the drill and template payloads are built once at
+# import instead of on every request
+_DRILLS_BY_SCHEMA: Dict[str, List[Dict[str, Any]]] = {
+    schema.id: [_drill_dict(d) for d in schema.drills]
+    for schema in SchemaRegistry.get_all_schemas()
+}
+_DRILL_BY_KEY: Dict[str, Dict[str, Dict[str, Any]]] = {
+    schema_id: {drill["key"]: drill for drill in drills}
+    for schema_id, drills in _DRILLS_BY_SCHEMA.items()
+}
+_TEMPLATES: List[Dict[str, Any]] = [
+    {
+        "id": schema.id,
+        "name": schema.name,
+        "sport": schema.id,
+        "drill_count": len(schema.drills)
+    }
+    for schema in SchemaRegistry.get_all_schemas()
+]
+
+
 @router.get("/drills", dependencies=[Depends(read_rate_limit)])
 async def list_drills(sport: str = "football", user=Depends(get_current_user)):
     """List all available drills for a sport."""
@@ -40,18 +73,7 @@ async def list_drills(sport: str = "football", user=Depends(get_current_user)):
         
         return {
             "sport": sport,
-            "drills": [
-                {
-                    "key": d.key,
-                    "label": d.label,
-                    "unit": d.unit,
-                    "min_value": d.min_value,
-                    "max_value": d.max_value,
-                    "lower_is_better": d.lower_is_better,
-                    "default_weight": d.default_weight
-                }
-                for d in schema.drills
-            ]
+            "drills": _DRILLS_BY_SCHEMA[schema.id]
         }
     except HTTPException:
         raise
@@ -63,21 +85,7 @@ async def list_drills(sport: str = "football", user=Depends(get_current_user)):
 @router.get("/drills/templates", dependencies=[Depends(read_rate_limit)])
 async def list_templates(user=Depends(get_current_user)):
     """List all available drill templates/sports."""
-    try:
-        templates = []
-        for sport_key in SchemaRegistry.list_sports():
-            schema = SchemaRegistry.get_schema(sport_key)
-            if schema:
-                templates.append({
-                    "id": sport_key,
-                    "name": schema.sport_name,
-                    "sport": sport_key,
-                    "drill_count": len(schema.drills)
-                })
-        return templates
-    except Exception as e:
-        logging.error(f"Error listing templates: {e}")
-        raise HTTPException(status_code=500, detail="Failed to list templates")
+    return _TEMPLATES
 
 
 @router.get("/drills/{drill_key}", dependencies=[Depends(read_rate_limit)])
@@ -88,17 +96,9 @@ async def get_drill(drill_key: str, sport: str = "football", user=Depends(get_cu
         if not schema:
             raise HTTPException(status_code=404, detail=f"No schema found for sport: {sport}")
         
-        for drill in schema.drills:
-            if drill.key == drill_key:
-                return {
-                    "key": drill.key,
-                    "label": drill.label,
-                    "unit": drill.unit,
-                    "min_value": drill.min_value,
-                    "max_value": drill.max_value,
-                    "lower_is_better": drill.lower_is_better,
-                    "default_weight": drill.default_weight
-                }
+        drill = _DRILL_BY_KEY[schema.id].get(drill_key)
+        if drill is not None:
+            return drill
         
         raise HTTPException(status_code=404, detail=f"Drill not found: {drill_key}")
     except HTTPException:
@@ -3,10 +3,11 @@ from google.cloud import firestore
 from typing import Optional, List
 from ..firestore_client import db
 from ..auth import get_current_user, require_role
-from ..middleware.rate_limiting import read_rate_limit, write_rate_limit
+from ..middleware.rate_limiting import READ_RATE_LIMIT, WRITE_RATE_LIMIT
 from datetime import datetime, timezone
 import logging
 from ..utils.database import execute_with_timeout
+from ..utils.data_cache import invalidate_league_cache
 from ..utils.data_integrity import (
     ensure_league_document,
     enforce_event_league_relationship,
@@ -28,7 +29,7 @@ router = APIRouter()
 
 
 @router.get('/leagues/{league_id}/events')
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("events", "list", target="league", target_param="league_id")
 def list_events(
     request: Request,
@@ -77,7 +78,7 @@ class EventCreateRequest(BaseModel):
     disabledDrills: List[str] = []
 
 @router.post('/leagues/{league_id}/events')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "create", target="league", target_param="league_id")
 def create_event(
     request: Request,
@@ -157,6 +158,7 @@ def create_event(
             timeout=10,
             operation_name="atomic event creation"
         )
+        invalidate_league_cache(league_id)
         
         logging.info(f"Created event {event_ref.id} in league {league_id}")
         # Return complete event object to prevent frontend data inconsistency
@@ -174,7 +176,7 @@ def create_event(
         raise HTTPException(status_code=500, detail="Failed to create event")
 
 @router.get('/leagues/{league_id}/events/{event_id}')
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("events", "read", target="league", target_param="league_id")
 def get_event(
     request: Request,
@@ -251,7 +253,7 @@ class EventDeleteRequest(BaseModel):
     confirmation_name: str  # Must match event name exactly
 
 @router.put('/leagues/{league_id}/events/{event_id}')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "update", target="league", target_param="league_id")
 def update_event(
     request: Request,
@@ -313,6 +315,7 @@ def update_event(
             timeout=10,
             operation_name="event update in global collection"
         )
+        invalidate_league_cache(league_id)
         
         logging.info(f"Updated event {event_id} in league {league_id}")
         return {"message": "Event updated successfully"}
@@ -323,7 +326,7 @@ def update_event(
         raise HTTPException(status_code=500, detail="Failed to update event")
 
 @router.get('/leagues/{league_id}/events/{event_id}/stats')
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("events", "read", target="league", target_param="league_id")
 def get_event_stats(
     request: Request,
@@ -392,7 +395,7 @@ def get_event_stats(
         raise HTTPException(status_code=500, detail="Failed to get event stats")
 
 @router.post('/leagues/{league_id}/events/{event_id}/delete-intent-token')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "delete", target="league", target_param="league_id")
 def issue_delete_intent_token(
     request: Request,
@@ -462,7 +465,7 @@ def delete_event_preflight(
     return Response(status_code=200)
 
 @router.delete('/leagues/{league_id}/events/{event_id}')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "delete", target="league", target_param="league_id")
 def delete_event(
     request: Request,
@@ -624,6 +627,7 @@ def delete_event(
             timeout=10,
             operation_name="soft delete in global collection"
         )
+        invalidate_league_cache(league_id)
         
         # AUDIT LOG: Deletion completed successfully
         logging.warning(f"[AUDIT] Event deletion completed - Event: {event_id} ({event_data.get('name')}), League: {league_id}, User: {current_user['uid']}, Timestamp: {deletion_timestamp}")
@@ -651,7 +655,7 @@ class LockCombineRequest(BaseModel):
     reason: Optional[str] = None  # Optional reason for audit log
 
 @router.patch('/leagues/{league_id}/events/{event_id}/lock')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "update", target="league", target_param="league_id")
 def set_combine_lock_status(
     request: Request,
@@ -724,6 +728,7 @@ def set_combine_lock_status(
             timeout=10,
             operation_name="update combine lock in global collection"
         )
+        invalidate_league_cache(league_id)
         
         # Verify the update by reading back
         verify_doc = execute_with_timeout(
@@ -789,7 +794,7 @@ def check_event_unlocked(event_id: str):
         raise HTTPException(status_code=409, detail="Cannot modify drill configuration after Live Entry has started")
 
 @router.post('/leagues/{league_id}/events/{event_id}/custom-drills')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "update", target="league", target_param="league_id")
 def create_custom_drill(
     request: Request,
@@ -817,7 +822,7 @@ def create_custom_drill(
                 raise HTTPException(status_code=400, detail="A drill with this name already exists in this event")
         
         new_drill_ref = drills_ref.document()
-        drill_data = req.dict()
+        drill_data = req.model_dump()
         drill_data.update({
             "id": new_drill_ref.id,
             "event_id": event_id,
@@ -841,7 +846,7 @@ def create_custom_drill(
         raise HTTPException(status_code=500, detail="Failed to create custom drill")
 
 @router.get('/leagues/{league_id}/events/{event_id}/custom-drills')
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("events", "read", target="league", target_param="league_id")
 def list_custom_drills(
     request: Request,
@@ -882,7 +887,7 @@ def list_custom_drills(
         raise HTTPException(status_code=500, detail="Failed to list custom drills")
 
 @router.put('/leagues/{league_id}/events/{event_id}/custom-drills/{drill_id}')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "update", target="league", target_param="league_id")
 def update_custom_drill(
     request: Request,
@@ -930,7 +935,7 @@ def update_custom_drill(
         raise HTTPException(status_code=500, detail="Failed to update custom drill")
 
 @router.delete('/leagues/{league_id}/events/{event_id}/custom-drills/{drill_id}')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("events", "update", target="league", target_param="league_id")
 def delete_custom_drill(
     request: Request,
@@ -990,7 +995,7 @@ def delete_custom_drill(
         raise HTTPException(status_code=500, detail="Failed to delete custom drill")
 
 @router.get('/leagues/{league_id}/events/{event_id}/schema')
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("events", "read", target="league", target_param="league_id")
 def get_league_event_schema_endpoint(
     request: Request,
@@ -1050,7 +1055,7 @@ def get_league_event_schema_endpoint(
         raise HTTPException(status_code=500, detail="Failed to get event schema")
 
 @router.get('/events/{event_id}/schema')
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("events", "read", target="event", target_param="event_id")
 def get_event_schema_endpoint(
     request: Request,
@@ -3,7 +3,7 @@ from typing import List, Dict, Any, Optional
 from collections import defaultdict
 from pydantic import BaseModel
 from ..auth import get_current_user, require_role
-from ..middleware.rate_limiting import read_rate_limit, write_rate_limit, bulk_rate_limit
+from ..middleware.rate_limiting import READ_RATE_LIMIT, WRITE_RATE_LIMIT, BULK_RATE_LIMIT
 import logging
 from ..firestore_client import db
 from datetime import datetime
@@ -11,6 +11,7 @@ from ..models import PlayerSchema
 from ..schemas import SportSchema
 from ..services.schema_registry import SchemaRegistry
 from ..utils.database import execute_with_timeout
+from ..utils.responses import APIJSONResponse
 from ..utils.event_schema import get_event_schema
 from ..utils.data_integrity import (
     enforce_event_league_relationship,
@@ -98,7 +99,7 @@ def calculate_composite_score(player_data: Dict[str, Any], weights: Optional[Dic
     return 0.0
 
 @router.get("/players", response_model=List[PlayerSchema])
-@read_rate_limit()
+@READ_RATE_LIMIT
 @require_permission("players", "read", target="event", target_param="event_id")
 def get_players(
     request: Request,
@@ -144,8 +145,10 @@ def get_players(
             
             # Pass schema to scoring engine
             player_dict["composite_score"] = calculate_composite_score(player_dict, schema=schema)
-            result.append(player_dict)
-        return result
+            result.append(PlayerSchema.from_firestore(player_dict).model_dump(mode="json", by_alias=True))
+        # Documents are trusted; returning a Response skips re-validating every
+        # player against response_model (which stays declared for the OpenAPI schema)
+        return APIJSONResponse(result)
     except HTTPException:
         raise
     except Exception as e:
@@ -159,7 +162,7 @@ class PlayerCreate(BaseModel):
     photo_url: Optional[str] = None
 
 @router.post("/players")
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("players", "create", target="event", target_param="event_id")
 def create_player(
     request: Request,
@@ -215,7 +218,7 @@ def create_player(
         raise HTTPException(status_code=500, detail=f"Failed to create player: {str(e)}")
 
 @router.put("/players/{player_id}")
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("players", "update", target="event", target_param="event_id")
 def update_player(
     request: Request,
@@ -282,7 +285,7 @@ class UploadRequest(BaseModel):
     mode: Optional[str] = "create_or_update"  # Options: "create_or_update", "scores_only"
 
 @router.post("/players/upload")
-@bulk_rate_limit()
+@BULK_RATE_LIMIT
 @require_permission(
     "players",
     "upload",
@@ -809,7 +812,7 @@ class RevertRequest(BaseModel):
     undo_log: List[Dict[str, Any]]
 
 @router.post("/players/revert-import")
-@bulk_rate_limit()
+@BULK_RATE_LIMIT
 @require_permission(
     "players",
     "upload", # Using 'upload' permission for revert as it's part of the import flow
@@ -1038,7 +1041,7 @@ def list_players(
         raise HTTPException(status_code=500, detail="Failed to list players")
 
 @router.post('/leagues/{league_id}/players')
-@write_rate_limit()
+@WRITE_RATE_LIMIT
 @require_permission("league_players", "create", target="league", target_param="league_id")
 def add_player(request: Request, league_id: str, req: dict, current_user=Depends(require_role("organizer", "coach"))):
     try:
@@ -2,12 +2,12 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List
 from ..schemas import SportSchema
 from ..services.schema_registry import SchemaRegistry
-from ..middleware.rate_limiting import read_rate_limit
+from ..middleware.rate_limiting import READ_RATE_LIMIT
 
 router = APIRouter()
 
 @router.get("/sports/{sport_id}/schema", response_model=SportSchema)
-@read_rate_limit()
+@READ_RATE_LIMIT
 def get_sport_schema(request: Request, sport_id: str):
     """
     Get the authoritative schema for a specific sport.
@@ -19,7 +19,7 @@ def get_sport_schema(request: Request, sport_id: str):
     return schema
 
 @router.get("/schemas", response_model=List[SportSchema])
-@read_rate_limit()
+@READ_RATE_LIMIT
 def list_all_schemas(request: Request):
     """List all available sport schemas"""
     return SchemaRegistry.get_all_schemas()
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Path
 from fastapi.responses import StreamingResponse
 from ..auth import require_role
-from ..middleware.rate_limiting import read_rate_limit
+from ..middleware.rate_limiting import READ_RATE_LIMIT
 from ..utils.data_integrity import enforce_event_league_relationship
 from ..utils.stats import calculate_event_stats
 from ..utils.pdf_generator import generate_event_pdf
@@ -11,7 +11,7 @@ import logging
 router = APIRouter()
 
 @router.get("/events/{event_id}/stats")
-@read_rate_limit()
+@READ_RATE_LIMIT
 def get_event_stats_endpoint(
     request: Request,
     event_id: str = Path(..., regex=r"^.{1,50}$"),
@@ -33,7 +33,7 @@ def get_event_stats_endpoint(
         raise HTTPException(status_code=500, detail="Failed to calculate stats")
 
 @router.get("/events/{event_id}/export-pdf")
-@read_rate_limit()
+@READ_RATE_LIMIT
 def export_event_pdf(
     request: Request,
     event_id: str = Path(..., regex=r"^.{1,50}$"),
@@ -6,8 +6,8 @@ from datetime import datetime, timezone
 from functools import lru_cache
 import time
 from firebase_admin import auth
-from ..auth import get_current_user, get_current_user_for_role_setting
-from ..middleware.rate_limiting import auth_rate_limit, user_rate_limit
+from ..auth import get_current_user, get_current_user_for_role_setting, invalidate_user_profile
+from ..middleware.rate_limiting import AUTH_RATE_LIMIT, USER_RATE_LIMIT
 from ..firestore_client import get_firestore_client
 from ..utils.database import execute_with_timeout
 import os
@@ -42,7 +42,7 @@ def _get_cached_user_profile(uid: str, cache_time: int):
         return None
 
 @router.get("/me", summary="Get current user profile")
-@user_rate_limit()
+@USER_RATE_LIMIT
 async def get_current_user_profile(request: Request, current_user: dict = Depends(get_current_user)):
     """Get the current user's profile information with caching"""
     try:
@@ -77,7 +77,7 @@ async def get_current_user_profile(request: Request, current_user: dict = Depend
         raise HTTPException(status_code=500, detail="Failed to get user profile")
 
 @router.post("/role", summary="Set user role")
-@auth_rate_limit()
+@AUTH_RATE_LIMIT
 async def set_user_role(
     role_data: SetRoleRequest,
     request: Request,
@@ -157,6 +157,7 @@ async def set_user_role(
                 raise HTTPException(status_code=500, detail="Failed to save role to database")
             
             # PERFORMANCE: Clear cache after role update to ensure fresh data
+            invalidate_user_profile(uid)
             try:
                 _get_cached_user_profile.cache_clear()
             except Exception as cache_error:
@@ -184,7 +185,7 @@ async def set_user_role(
         raise HTTPException(status_code=500, detail="Failed to set user role")
 
 @router.post("/pending-invite", summary="Store pending invite for user")
-@auth_rate_limit()
+@AUTH_RATE_LIMIT
 async def store_pending_invite(
     invite_data: PendingInviteRequest,
     request: Request,
@@ -218,6 +219,7 @@ async def store_pending_invite(
         user_doc_ref.set(user_data, merge=True)
         
         # Clear cache so subsequent GET /me calls see the invite
+        invalidate_user_profile(uid)
         _get_cached_user_profile.cache_clear()
         
         return {"status": "success", "message": "Pending invite stored"}
@@ -228,7 +230,7 @@ async def store_pending_invite(
 
 # Debug endpoints should be disabled in production
 @router.post("/debug-role", summary="Debug role setting with simplified auth")
-@auth_rate_limit()
+@AUTH_RATE_LIMIT
 async def debug_set_user_role(
     role_data: SetRoleRequest,
     request: Request,
@@ -298,7 +300,7 @@ async def debug_set_user_role(
 
 # Extremely permissive endpoint – guard with env flag and disable by default
 @router.post("/role-simple", summary="Simple role setting for onboarding issues")
-@auth_rate_limit()
+@AUTH_RATE_LIMIT
 async def set_user_role_simple(
     role_data: SetRoleRequest,
     request: Request
@@ -374,6 +376,7 @@ async def set_user_role_simple(
             
             user_doc_ref = db.collection("users").document(uid)
             user_doc_ref.set(user_data, merge=True)  # Use merge to avoid overwriting
+            invalidate_user_profile(uid)
             
             logging.info(f"[SIMPLE-ROLE] ✅ Role set successfully for {uid}: {role}")
             
@@ -6,6 +6,7 @@ from functools import wraps
 from typing import Any, Awaitable, Callable, Dict, Iterable, Literal, Optional, Set, Tuple
 
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from ..utils.authorization import ensure_event_access, ensure_league_access
 
@@ -117,7 +118,9 @@ def require_permission(
             if not target_id:
                 raise HTTPException(status_code=400, detail="Target identifier is required")
 
-            _ensure_target_access(
+            # Membership lookups use the sync Firestore client; keep them off the event loop
+            await run_in_threadpool(
+                _ensure_target_access,
                 user_id=current_user["uid"],
                 target=target,
                 target_id=str(target_id),
@@ -108,8 +108,22 @@ def test_role_enforced_on_write(monkeypatch):
     def fake_get_client():
         return FakeDoc()
 
+    class FakeAsyncDoc(FakeDoc):
+        async def get(self):
+            return self
+
+        async def set(self, *_args, **_kwargs):
+            return None
+
+        async def create(self, *_args, **_kwargs):
+            return None
+
+    def fake_get_async_client():
+        return FakeAsyncDoc()
+
     monkeypatch.setattr(fsc, "get_firestore_client", fake_get_client)
-    monkeypatch.setattr(auth_mod, "get_firestore_client", fake_get_client)
+    monkeypatch.setattr(fsc, "get_async_firestore_client", fake_get_async_client)
+    monkeypatch.setattr(auth_mod, "get_async_firestore_client", fake_get_async_client)
 
     from starlette.testclient import TestClient
 
@@ -135,3 +149,26 @@ def test_role_enforced_on_write(monkeypatch):
 
 
 
+
+
+def test_token_cache_honors_exp_and_invalidation():
+    import time
+    from backend.auth import TokenCache
+
+    cache = TokenCache(maxsize=2, ttl=60)
+    cache.put("tok-a", {"uid": "a", "exp": time.time() + 30})
+    assert cache.get("tok-a")["uid"] == "a"
+
+    # Already-expired tokens are never cached
+    cache.put("tok-b", {"uid": "b", "exp": time.time() - 1})
+    assert cache.get("tok-b") is None
+
+    # LRU bound evicts the oldest entry
+    cache.put("tok-c", {"uid": "c"})
+    cache.put("tok-d", {"uid": "d"})
+    assert cache.get("tok-a") is None
+
+    cache.invalidate("tok-d")
+    assert cache.get("tok-d") is None
+    assert cache.get("tok-c")["uid"] == "c"
+
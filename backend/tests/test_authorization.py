@@ -6,10 +6,11 @@ from backend.security.access_matrix import ACCESS_MATRIX, REGISTERED_PERMISSIONS
 
 
 class FakeSnapshot:
-    def __init__(self, data=None, exists=True, doc_id=None):
+    def __init__(self, data=None, exists=True, doc_id=None, reference=None):
         self._data = data or {}
         self.exists = exists
         self.id = doc_id
+        self.reference = reference
 
     def to_dict(self):
         return self._data
@@ -19,13 +20,14 @@ class FakeDocument:
     def __init__(self, store, path):
         self._store = store
         self._path = path
+        self.path = path
 
     def get(self):
         data = self._store.get(self._path)
         doc_id = self._path.split("/")[-1]
         if data is None:
-            return FakeSnapshot({}, False, doc_id)
-        return FakeSnapshot(data, True, doc_id)
+            return FakeSnapshot({}, False, doc_id, self)
+        return FakeSnapshot(data, True, doc_id, self)
 
     def collection(self, name):
         return FakeCollection(self._store, f"{self._path}/{name}")
@@ -47,11 +49,16 @@ class FakeFirestore:
     def collection(self, name):
         return FakeCollection(self._store, name)
 
+    def get_all(self, refs):
+        self.get_all_calls = getattr(self, "get_all_calls", 0) + 1
+        return [ref.get() for ref in refs]
+
 
 def _install_fakes(monkeypatch, store):
     fake_db = FakeFirestore(store)
     monkeypatch.setattr(authz, "db", fake_db)
     monkeypatch.setattr(authz, "execute_with_timeout", lambda func, **kwargs: func())
+    return fake_db
 
 
 def test_ensure_league_access_allows_member(monkeypatch):
@@ -112,6 +119,27 @@ def test_ensure_event_access_blocks_other_leagues(monkeypatch):
     assert exc.value.status_code == 403
 
 
+def test_ensure_events_access_bulk_splits_allowed_and_denied(monkeypatch):
+    store = {
+        "user_memberships/user-4": {"leagues": {"league-a": {"role": "coach"}}},
+        "leagues/league-b/members/user-4": {"role": "viewer"},
+        "events/event-1": {"league_id": "league-a"},
+        "events/event-2": {"league_id": "league-b"},
+        "events/event-3": {"league_id": "league-c"},
+    }
+    fake_db = _install_fakes(monkeypatch, store)
+
+    allowed, denied = authz.ensure_events_access_bulk(
+        "user-4",
+        ["event-1", "event-2", "event-3", "event-missing"],
+    )
+    assert sorted(allowed) == ["event-1", "event-2"]
+    assert denied["event-3"].status_code == 403
+    assert denied["event-missing"].status_code == 404
+    # One read for the events and one for the legacy memberships
+    assert fake_db.get_all_calls == 2
+
+
 def test_permission_registry_matches_matrix():
     assert REGISTERED_PERMISSIONS, "No endpoints registered with RBAC decorator"
     for record in REGISTERED_PERMISSIONS:
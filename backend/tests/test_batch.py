@@ -0,0 +1,82 @@
+import asyncio
+
+from backend.routes import batch
+
+
+class FakeDoc:
+    def __init__(self, path, data):
+        self.id = path.split("/")[-1]
+        self.reference = type("Ref", (), {"path": path})()
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeQuery:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def where(self, filter):
+        wanted = set(filter.value) if filter.op_string == "in" else {filter.value}
+        return FakeQuery([d for d in self._docs if d.to_dict().get(filter.field_path) in wanted])
+
+    async def _iter(self):
+        for doc in self._docs:
+            yield doc
+
+    def stream(self):
+        return self._iter()
+
+    def count(self):
+        total = len(self._docs)
+
+        class _Count:
+            async def get(self):
+                return [[type("Agg", (), {"value": total})()]]
+
+        return _Count()
+
+
+class FakeAsyncFirestore:
+    def __init__(self, store):
+        self._store = store
+
+    def collection_group(self, name):
+        return FakeQuery([FakeDoc(p, d) for p, d in self._store.items() if p.split("/")[-2] == name])
+
+    def collection(self, name):
+        db = self
+
+        class _Path:
+            def __init__(self, path):
+                self.path = path
+
+            def document(self, doc_id):
+                return _Path(f"{self.path}/{doc_id}")
+
+            def collection(self, sub):
+                prefix = f"{self.path}/{sub}/"
+                return FakeQuery([
+                    FakeDoc(p, d) for p, d in db._store.items()
+                    if p.startswith(prefix) and "/" not in p[len(prefix):]
+                ])
+
+        return _Path(name)
+
+
+def test_players_for_events_streams_events_with_untagged_players():
+    store = {
+        # Fully tagged: served by the collection-group query
+        "events/e1/players/a": {"name": "A", "event_id": "e1"},
+        # Mixed: one legacy player without event_id must not be dropped
+        "events/e2/players/b": {"name": "B", "event_id": "e2"},
+        "events/e2/players/c": {"name": "C"},
+        # Another players collection in the group is ignored
+        "leagues/l1/players/d": {"name": "D", "event_id": "e1"},
+    }
+    result = asyncio.run(
+        batch._players_for_events(FakeAsyncFirestore(store), ["e1", "e2"], asyncio.Semaphore(4))
+    )
+    assert sorted(p["id"] for p in result["e1"]) == ["a"]
+    assert sorted(p["id"] for p in result["e2"]) == ["b", "c"]
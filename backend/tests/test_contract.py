@@ -27,3 +27,31 @@ def test_meta():
     assert "version" in data
 
 
+
+
+def test_player_from_firestore_matches_validated_response():
+    from backend.models import PlayerSchema
+
+    doc = {
+        "id": "p1",
+        "name": "Sam",
+        "scores": {"catching": 7, "agility": 3.1},
+        "vertical_jump": 30,
+        "agility": 9.9,
+        "first_name": "Sam",
+    }
+    trusted = PlayerSchema.from_firestore(dict(doc, scores=dict(doc["scores"])))
+    validated = PlayerSchema.model_validate(dict(doc, scores=dict(doc["scores"])))
+    assert trusted.model_dump(mode="json", by_alias=True) == validated.model_dump(mode="json", by_alias=True)
+
+
+def test_player_from_firestore_coerces_legacy_types():
+    from backend.models import PlayerSchema
+
+    scores = {"catching": 7}
+    player = PlayerSchema.from_firestore({"id": "p2", "name": "Ann", "number": "12", "scores": scores})
+    assert player.model_dump(mode="json", by_alias=True)["number"] == 12
+    assert scores == {"catching": 7}
+
+    PlayerSchema.from_firestore({"id": "p3", "name": "Bo", "scores": scores, "agility": 4.2})
+    assert scores == {"catching": 7}
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.routes import drills
+from backend.services.schema_registry import SchemaRegistry
+
+
+def test_list_templates_covers_every_schema():
+    templates = asyncio.run(drills.list_templates(user=None))
+    assert [t["id"] for t in templates] == [s.id for s in SchemaRegistry.get_all_schemas()]
+    football = next(t for t in templates if t["id"] == "football")
+    assert football["name"] == "Football Combine"
+    assert football["drill_count"] == len(SchemaRegistry.get_schema("football").drills)
+
+
+def test_get_drill_uses_precomputed_payload():
+    drill = asyncio.run(drills.get_drill("40m_dash", sport="Football", user=None))
+    assert drill["label"] == "40-Yard Dash"
+    assert drill["lower_is_better"] is True
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(drills.get_drill("missing", sport="football", user=None))
+    assert exc.value.status_code == 404
@@ -48,6 +48,25 @@ def test_cors_preflight(monkeypatch):
     assert r.headers.get("Access-Control-Allow-Origin") == "http://localhost:5173"
 
 
+
+def test_cors_preflight_on_authenticated_route(monkeypatch):
+    from starlette.testclient import TestClient
+
+    # Preflight is answered by CORSMiddleware before routing, so no auth dependency runs
+    monkeypatch.setenv("ALLOWED_ORIGINS", "http://localhost:5173")
+    app = import_app()
+    client = TestClient(app)
+    r = client.options(
+        "/api/users/me",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "Authorization",
+        },
+    )
+    assert r.status_code in (200, 204)
+    assert r.headers.get("Access-Control-Allow-Origin") == "http://localhost:5173"
+
 def test_health_rate_limit_enforced(monkeypatch):
     from starlette.testclient import TestClient
 
@@ -63,3 +82,172 @@ def test_health_rate_limit_enforced(monkeypatch):
         assert r2.json().get("category") == "rate_limit"
 
 
+def test_local_lease_limiter_batches_hot_keys():
+    import backend.middleware.rate_limiting as rl
+    from limits import parse
+
+    class FakeStrategy:
+        def __init__(self, capacity):
+            self.remaining = capacity
+            self.calls = 0
+
+        def hit(self, item, *identifiers, cost=1):
+            self.calls += 1
+            if self.remaining < cost:
+                return False
+            self.remaining -= cost
+            return True
+
+        def test(self, item, *identifiers, cost=1):
+            self.calls += 1
+            return self.remaining >= cost
+
+    inner = FakeStrategy(capacity=25)
+    lease = rl._LocalLeaseLimiter(inner, batch=10, lease_secs=60)
+    item = parse("25/minute")
+
+    allowed = [lease.hit(item, "client", "scope") for _ in range(30)]
+    # Never admits more than the shared capacity
+    assert sum(allowed) <= 25
+    assert allowed[-1] is False
+    # Hot key is served from leases, so far fewer remote round trips than requests
+    assert inner.calls < 30
+
+
+def test_local_lease_limiter_charges_only_spent_units(monkeypatch):
+    import types
+    import backend.middleware.rate_limiting as rl
+    from limits import parse
+
+    clock = {"now": 0.0}
+    monkeypatch.setattr(rl, "time", types.SimpleNamespace(monotonic=lambda: clock["now"]))
+
+    class FixedWindow:
+        """300 units per 60s window on the fake clock."""
+
+        def __init__(self):
+            self.window = None
+            self.used = 0
+            self.charged = 0
+            self.calls = 0
+
+        def _roll(self):
+            window = int(clock["now"] // 60)
+            if window != self.window:
+                self.window, self.used = window, 0
+
+        def hit(self, item, *identifiers, cost=1):
+            self.calls += 1
+            self._roll()
+            self.charged += cost
+            if self.used + cost > 300:
+                return False
+            self.used += cost
+            return True
+
+        def test(self, item, *identifiers, cost=1):
+            self.calls += 1
+            self._roll()
+            return self.used + cost <= 300
+
+    item = parse("300/minute")
+    for per_minute in (120, 180):
+        inner = FixedWindow()
+        lease = rl._LocalLeaseLimiter(inner, batch=10, lease_secs=1)
+        requests = per_minute * 3
+        denied = 0
+        for i in range(requests):
+            clock["now"] = 1000 + i * 60 / per_minute
+            denied += not lease.hit(item, "client", "scope")
+        # Steady traffic below the limit is never refused across many lease expiries
+        assert denied == 0
+        # Only what was admitted is charged (the last lease may still be unflushed)
+        assert requests - 10 <= inner.charged <= requests
+        assert inner.calls < requests
+
+
+def test_response_cache_hits_invalidates_and_serves_stale():
+    from fastapi import HTTPException
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+    from backend.middleware.response_cache import ResponseCacheMiddleware, _MemoryStore
+
+    state = {"calls": 0, "fail": False}
+    revoked = set()
+
+    async def players(request):
+        state["calls"] += 1
+        if request.headers.get("authorization", "").encode() in revoked:
+            return JSONResponse({"detail": "revoked"}, status_code=401)
+        if state["fail"]:
+            return JSONResponse({"detail": "down"}, status_code=503)
+        if state.get("no_store"):
+            return JSONResponse([{"id": "p1", "calls": state["calls"]}], headers={"Cache-Control": "no-store"})
+        return JSONResponse([{"id": "p1", "calls": state["calls"]}], headers={"ETag": '"v1"'})
+
+    async def authenticate(authorization):
+        if authorization in revoked:
+            raise HTTPException(status_code=401, detail="Token revoked")
+
+    async def create(request):
+        return JSONResponse({"ok": True})
+
+    async def batch_read(request):
+        return JSONResponse({"results": {}})
+
+    store = _MemoryStore(16)
+    app = ResponseCacheMiddleware(
+        Starlette(routes=[Route("/api/players", players), Route("/api/players", create, methods=["POST"]),
+                          Route("/api/batch/players", batch_read, methods=["POST"])]),
+        store=store,
+        authenticate=authenticate,
+    )
+    client = TestClient(app)
+    auth = {"Authorization": "Bearer a"}
+
+    r1 = client.get("/api/players?event_id=e1", headers=auth)
+    r2 = client.get("/api/players?event_id=e1", headers=auth)
+    assert r1.headers["x-cache"] == "MISS" and r2.headers["x-cache"] == "HIT"
+    assert r2.json() == r1.json() and state["calls"] == 1
+
+    # Handler headers are replayed, and a matching If-None-Match gets a 304
+    assert r2.headers["etag"] == '"v1"'
+    r304 = client.get("/api/players?event_id=e1", headers={**auth, "If-None-Match": '"v1"'})
+    assert r304.status_code == 304 and state["calls"] == 1
+
+    # Another credential never sees the first caller's entry
+    assert client.get("/api/players?event_id=e1", headers={"Authorization": "Bearer b"}).headers["x-cache"] == "MISS"
+
+    # Read-only POSTs leave cached reads in place
+    client.post("/api/batch/players", headers=auth)
+    assert client.get("/api/players?event_id=e1", headers=auth).headers["x-cache"] == "HIT"
+
+    # A successful write invalidates every cached read
+    client.post("/api/players", headers=auth)
+    assert client.get("/api/players?event_id=e1", headers=auth).headers["x-cache"] == "MISS"
+
+    # Past freshness, a failing handler falls back to the stale body
+    for entry, _ in store._entries.values():
+        entry["generated_at"] -= 3600
+    state["fail"] = True
+    r = client.get("/api/players?event_id=e1", headers=auth)
+    assert r.status_code == 200 and r.headers["x-cache"] == "STALE"
+
+    # no-store responses are passed through but never cached
+    state["fail"] = False
+    state["no_store"] = True
+    r_ns = client.get("/api/players?event_id=e2", headers=auth)
+    assert "x-cache" not in r_ns.headers
+    assert client.get("/api/players?event_id=e2", headers=auth).headers.get("x-cache") is None
+    state["no_store"] = False
+    state["fail"] = True
+
+    # A credential that no longer authenticates gets neither hits nor stale bodies
+    revoked.add(b"Bearer a")
+    assert client.get("/api/players?event_id=e1", headers=auth).status_code == 401
+    state["fail"] = False
+    client.get("/api/players?event_id=e1", headers={"Authorization": "Bearer c"})
+    revoked.add(b"Bearer c")
+    assert client.get("/api/players?event_id=e1", headers={"Authorization": "Bearer c"}).status_code == 401
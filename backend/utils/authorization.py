@@ -8,7 +8,7 @@ from fastapi import HTTPException
 import logging
 import time
 from collections import defaultdict
-from typing import Dict, Iterable, Optional, Set
+from typing import Dict, Iterable, Optional, Set, Tuple
 
 from ..firestore_client import db
 from .database import execute_with_timeout
@@ -35,6 +35,52 @@ def _normalize_allowed_roles(allowed_roles: Optional[Iterable[str]]) -> Optional
     return {role.strip().lower() for role in allowed_roles if isinstance(role, str)}
 
 
+def _check_membership(
+    user_id: str,
+    league_id: str,
+    membership: Optional[dict],
+    normalized_roles: Optional[Set[str]],
+    operation_name: str,
+) -> None:
+    """Raise 403 unless the membership exists, is enabled and has an allowed role."""
+    if not membership:
+        logging.warning(
+            "[AUTHZ] User %s attempted %s on league %s without membership",
+            user_id,
+            operation_name,
+            league_id,
+        )
+        _register_denial(f"league:{league_id}")
+        raise HTTPException(status_code=403, detail="You do not have access to this league")
+
+    # Check for disabled access (Kill Switch)
+    if membership.get("disabled") is True:
+        logging.warning(
+            "[AUTHZ] Disabled user %s attempted %s on league %s",
+            user_id,
+            operation_name,
+            league_id,
+        )
+        _register_denial(f"league:{league_id}:disabled")
+        raise HTTPException(
+            status_code=403, 
+            detail="You no longer have access to this league. Please contact the organizer."
+        )
+
+    role = (membership.get("role") or "").lower()
+    if normalized_roles and role not in normalized_roles:
+        logging.warning(
+            "[AUTHZ] User %s has role %s but attempted %s requiring %s on league %s",
+            user_id,
+            role,
+            operation_name,
+            ",".join(sorted(normalized_roles)),
+            league_id,
+        )
+        _register_denial(f"league:{league_id}:{operation_name}")
+        raise HTTPException(status_code=403, detail="Insufficient league permissions")
+
+
 def ensure_league_access(
     user_id: str,
     league_id: str,
@@ -78,43 +124,7 @@ def ensure_league_access(
             if member_doc.exists:
                 membership = member_doc.to_dict() or {}
 
-        if not membership:
-            logging.warning(
-                "[AUTHZ] User %s attempted %s on league %s without membership",
-                user_id,
-                operation_name,
-                league_id,
-            )
-            _register_denial(f"league:{league_id}")
-            raise HTTPException(status_code=403, detail="You do not have access to this league")
-
-        # Check for disabled access (Kill Switch)
-        if membership.get("disabled") is True:
-            logging.warning(
-                "[AUTHZ] Disabled user %s attempted %s on league %s",
-                user_id,
-                operation_name,
-                league_id,
-            )
-            _register_denial(f"league:{league_id}:disabled")
-            raise HTTPException(
-                status_code=403, 
-                detail="You no longer have access to this league. Please contact the organizer."
-            )
-
-        role = (membership.get("role") or "").lower()
-        if normalized_roles and role not in normalized_roles:
-            logging.warning(
-                "[AUTHZ] User %s has role %s but attempted %s requiring %s on league %s",
-                user_id,
-                role,
-                operation_name,
-                ",".join(sorted(normalized_roles)),
-                league_id,
-            )
-            _register_denial(f"league:{league_id}:{operation_name}")
-            raise HTTPException(status_code=403, detail="Insufficient league permissions")
-
+        _check_membership(user_id, league_id, membership, normalized_roles, operation_name)
         return membership
     except HTTPException:
         raise
@@ -180,3 +190,131 @@ def ensure_event_access(
         )
         raise HTTPException(status_code=500, detail="Failed to validate event permissions")
 
+
+
+def ensure_leagues_access_bulk(
+    user_id: str,
+    league_ids: Iterable[str],
+    *,
+    allowed_roles: Optional[Iterable[str]] = None,
+    operation_name: str = "league access",
+) -> Dict[str, HTTPException]:
+    """
+    ensure_league_access for many leagues at once: one user_memberships read plus
+    one get_all over the legacy members docs of leagues missing from it. Returns
+    the denial for each league the user may not access; absent ids are allowed.
+    """
+    normalized_roles = _normalize_allowed_roles(allowed_roles)
+    wanted = list(dict.fromkeys(str(league_id) for league_id in league_ids))
+    if not wanted:
+        return {}
+
+    try:
+        memberships_ref = db.collection("user_memberships").document(user_id)
+        memberships_doc = execute_with_timeout(
+            lambda: memberships_ref.get(),
+            timeout=6,
+            operation_name=f"{operation_name} membership lookup",
+        )
+        leagues_data = memberships_doc.to_dict().get("leagues", {}) if memberships_doc.exists else {}
+        memberships = {league_id: leagues_data.get(league_id) for league_id in wanted}
+
+        legacy_refs = {}
+        for league_id, membership in memberships.items():
+            if not membership:
+                member_ref = db.collection("leagues").document(league_id).collection("members").document(user_id)
+                legacy_refs[member_ref.path] = (league_id, member_ref)
+        if legacy_refs:
+            legacy_docs = execute_with_timeout(
+                lambda: list(db.get_all([ref for _, ref in legacy_refs.values()])),
+                timeout=6,
+                operation_name=f"{operation_name} legacy membership lookup",
+            )
+            for member_doc in legacy_docs:
+                if member_doc.exists:
+                    league_id = legacy_refs[member_doc.reference.path][0]
+                    memberships[league_id] = member_doc.to_dict() or {}
+    except Exception as exc:
+        logging.error(
+            "[AUTHZ] Failed bulk membership check for user %s on %s leagues: %s",
+            user_id,
+            len(wanted),
+            exc,
+        )
+        raise HTTPException(status_code=500, detail="Failed to validate league permissions")
+
+    denied: Dict[str, HTTPException] = {}
+    for league_id in wanted:
+        try:
+            _check_membership(user_id, league_id, memberships[league_id], normalized_roles, operation_name)
+        except HTTPException as exc:
+            denied[league_id] = exc
+    return denied
+
+
+def ensure_events_access_bulk(
+    user_id: str,
+    event_ids: Iterable[str],
+    *,
+    allowed_roles: Optional[Iterable[str]] = None,
+    operation_name: str = "event access",
+) -> Tuple[Dict[str, dict], Dict[str, HTTPException]]:
+    """
+    ensure_event_access for many events at once: one get_all over the events and
+    one bulk membership check over their leagues. Returns ``(allowed, denied)``,
+    event data by id for accessible events and the HTTPException for the rest.
+    """
+    wanted = list(dict.fromkeys(str(event_id) for event_id in event_ids))
+    allowed: Dict[str, dict] = {}
+    denied: Dict[str, HTTPException] = {}
+    if not wanted:
+        return allowed, denied
+
+    try:
+        refs = [db.collection("events").document(event_id) for event_id in wanted]
+        event_docs = execute_with_timeout(
+            lambda: list(db.get_all(refs)),
+            timeout=8,
+            operation_name=f"{operation_name} event lookup",
+        )
+    except Exception as exc:
+        logging.error(
+            "[AUTHZ] Failed bulk event access check for user %s on %s events: %s",
+            user_id,
+            len(wanted),
+            exc,
+        )
+        raise HTTPException(status_code=500, detail="Failed to validate event permissions")
+
+    events = {doc.id: doc for doc in event_docs if doc.exists}
+    league_for_event: Dict[str, str] = {}
+    for event_id in wanted:
+        event_doc = events.get(event_id)
+        if event_doc is None:
+            denied[event_id] = HTTPException(status_code=404, detail="Event not found")
+            continue
+        event_data = event_doc.to_dict() or {}
+        league_id = event_data.get("league_id")
+        if not league_id:
+            logging.error(
+                "[AUTHZ] Event %s missing league_id during %s", event_id, operation_name
+            )
+            denied[event_id] = HTTPException(
+                status_code=500, detail="Event is missing league association"
+            )
+            continue
+        event_data["id"] = event_doc.id
+        allowed[event_id] = event_data
+        league_for_event[event_id] = str(league_id)
+
+    league_denials = ensure_leagues_access_bulk(
+        user_id,
+        league_for_event.values(),
+        allowed_roles=allowed_roles,
+        operation_name=operation_name,
+    )
+    for event_id, league_id in league_for_event.items():
+        if league_id in league_denials:
+            denied[event_id] = league_denials[league_id]
+            del allowed[event_id]
+    return allowed, denied
@@ -1,5 +1,8 @@
+import threading
 import time
+from collections import OrderedDict
 from functools import lru_cache
+from typing import Any
 from ..middleware.observability import add_cache_deltas
 
 
@@ -35,3 +38,60 @@ def cache_with_metrics(maxsize: int = 256):
     return decorator
 
 
+
+
+class TTLCache:
+    """Small thread-safe LRU whose entries expire ``ttl`` seconds after being set.
+
+    Lookups record a hit or miss on the current request like cache_with_metrics.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                add_cache_deltas(hits_delta=1)
+                return item[1]
+            if item is not None:
+                del self._entries[key]
+        add_cache_deltas(misses_delta=1)
+        return default
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._entries.pop(key, None)
+        return item[1] if item is not None else default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# League documents and event lists served by the batch dashboard. Entries are
+# per process; write endpoints on this worker drop them via invalidate_league_cache
+# and the TTLs bound staleness for writes landing on other workers.
+league_info_cache = TTLCache(maxsize=1024, ttl=30)
+league_events_cache = TTLCache(maxsize=1024, ttl=10)
+# Per-event player counts for the same dashboard; player writes do not touch the
+# league or event docs, so only the TTL bounds how stale these get
+league_player_counts_cache = TTLCache(maxsize=1024, ttl=10)
+
+
+def invalidate_league_cache(league_id: str) -> None:
+    league_info_cache.pop(str(league_id))
+    league_events_cache.pop(str(league_id))
+    league_player_counts_cache.pop(str(league_id))
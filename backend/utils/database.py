@@ -1,8 +1,10 @@
+import asyncio
 import logging
 import concurrent.futures
 import time
 from fastapi import HTTPException
 
+from ..firestore_client import async_firestore_slots
 from ..middleware.observability import record_firestore_call
 
 def execute_with_timeout(func, timeout=5, operation_name="database operation", *args, **kwargs):
@@ -38,4 +40,36 @@ def execute_with_timeout(func, timeout=5, operation_name="database operation", *
         raise
     except Exception as e:
         logging.error(f"{operation_name} failed: {getattr(func, '__name__', 'callable')} - {str(e)}")
-        raise HTTPException(status_code=500, detail=f"{operation_name} failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"{operation_name} failed: {str(e)}")
+
+async def await_with_timeout(awaitable, timeout=5, operation_name="database operation"):
+    """
+    Async counterpart of execute_with_timeout for AsyncClient calls: awaits with a
+    hard timeout, records the Firestore timing, and maps failures to the same
+    HTTPException 504/500 responses. The call holds one of the process-wide
+    async Firestore slots while it runs; waiting for a slot counts toward the
+    timeout.
+    """
+    async def _gated():
+        try:
+            async with async_firestore_slots():
+                return await awaitable
+        except asyncio.CancelledError:
+            # Timed out while queued for a slot: the call never started
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(_gated(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logging.warning(f"{operation_name} timed out after {timeout}s")
+        raise HTTPException(status_code=504, detail=f"{operation_name} timed out")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"{operation_name} failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"{operation_name} failed: {str(e)}")
+    record_firestore_call((time.perf_counter() - start) * 1000.0)
+    return result
@@ -1,9 +1,8 @@
-import os
-import json
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from google.cloud import vision
 from google.oauth2 import service_account
+from .._creds import CREDS_DICT
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +14,12 @@ def get_vision_client():
         return _vision_client
 
     try:
-        # Try to load from env var JSON similar to firestore_client
-        creds_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
-        if creds_json:
-            try:
-                cred_dict = json.loads(creds_json)
-                credentials = service_account.Credentials.from_service_account_info(cred_dict)
-                _vision_client = vision.ImageAnnotatorClient(credentials=credentials)
-                logger.info("[OCR] Initialized Vision client with JSON credentials")
-                return _vision_client
-            except json.JSONDecodeError:
-                logger.warning("[OCR] Invalid JSON in GOOGLE_APPLICATION_CREDENTIALS_JSON")
+        # Reuse the env var JSON already parsed for firestore_client
+        if CREDS_DICT is not None:
+            credentials = service_account.Credentials.from_service_account_info(CREDS_DICT)
+            _vision_client = vision.ImageAnnotatorClient(credentials=credentials)
+            logger.info("[OCR] Initialized Vision client with JSON credentials")
+            return _vision_client
 
         # Fallback to default environment (GOOGLE_APPLICATION_CREDENTIALS file path or GCE metadata)
         _vision_client = vision.ImageAnnotatorClient()
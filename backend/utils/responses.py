@@ -0,0 +1,62 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+
+def _json_default(value: Any) -> Any:
+    # Firestore timestamps and other leftovers, rendered like jsonable_encoder would
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+# orjson encodes large lists of players/scores several times faster than the
+# stdlib json used by JSONResponse. It is optional: without it responses fall
+# back to the stdlib encoder.
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+
+    class APIJSONResponse(ORJSONResponse):
+        """ORJSONResponse that also accepts raw Firestore documents.
+
+        Routes returning large lists of documents can return this directly
+        and skip FastAPI's jsonable_encoder pass over every field.
+        """
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(
+                content,
+                default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+    class APIJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return json.dumps(
+                content,
+                default=_json_default,
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_line(obj: Any) -> bytes:
+    """Encode one newline-delimited JSON record."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, default=_json_default, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def wants_ndjson(request) -> bool:
+    """True when the client asked for a streamed NDJSON body via Accept."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+__all__ = ["APIJSONResponse", "NDJSON_MEDIA_TYPE", "ndjson_line", "wants_ndjson"]
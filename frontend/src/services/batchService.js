@@ -8,6 +8,25 @@
 import api from '../lib/api';
 import { withCache } from '../utils/dataCache';
 
+/**
+ * Rebuild the batch players object from its NDJSON stream
+ * @param {string} body - Response text
+ * @returns {Object} Same shape as the JSON response: { success, results, ... }
+ */
+const parseBatchPlayersNdjson = (body) => {
+  const batch = { success: false, results: {} };
+  for (const line of String(body || '').split('\n')) {
+    if (!line.trim()) continue;
+    const { event_id: eventId, ...record } = JSON.parse(line);
+    if (eventId !== undefined) {
+      batch.results[eventId] = record;
+    } else {
+      Object.assign(batch, record);
+    }
+  }
+  return batch;
+};
+
 /**
  * Fetch players for multiple events in a single request
  * @param {string[]} eventIds - Array of event IDs
@@ -15,10 +34,15 @@ import { withCache } from '../utils/dataCache';
  */
 export const fetchBatchPlayers = withCache(
   async (eventIds) => {
+    // Streamed as NDJSON (one event per line, then a summary line) so the
+    // server never buffers every event's players at once
     const response = await api.post('/batch/players', {
       event_ids: eventIds
+    }, {
+      headers: { Accept: 'application/x-ndjson' },
+      responseType: 'text'
     });
-    return response.data;
+    return parseBatchPlayersNdjson(response.data);
   },
   'batch-players',
   2 * 60 * 1000 // 2 minute cache